@@ -0,0 +1,556 @@
+import asyncio
+import contextlib
+import getpass
+import itertools
+import time
+import mysql.connector.aio
+import connector
+import database
+import sql
+import util
+from collections.abc import AsyncIterator, Iterable
+
+class AsyncDatabase(sql.SqlBuilder):
+    """
+    En asynkron udgave af Database, hvis metoder kan awaites fra en asyncio-eventloop.
+
+    Objektet har en pool af forbindelser til databasen, så mange læsninger og indlæsninger
+    kan køre samtidig i samme eventloop uden at bruge en tråd for hvert query.
+    Forbindelserne oprettes først med ``await .login()`` eller ``async with``.
+
+    :param username: Brugernavnet, der skal bruges til at logge ind med.
+        *Påkrævet*. Standardværdi: ``''``
+    :type username: str
+    :param database: Navnet på databasen, der skal forbindes til.
+        *Påkrævet*. Standardværdi: ``''``
+    :type database: str
+    :param pool_size: Antallet af forbindelser til databasen i puljen.
+        *Upåkrævet*. Standardværdi: ``5``
+    :type pool_size: int
+    :param preview: Bestemmer, om queries skal forhåndsvises inden eksekvering.
+        *Upåkrævet*. Standardværdi: ``False``
+    :type preview: bool
+    """
+
+    # Previewet spørger brugeren i terminalen og køres derfor i en anden tråd (se ._preview())
+    _preview_sync = database.Database._preview
+
+    def __init__(self,
+        username: str = '',
+        database: str = '',
+        pool_size: int = 5,
+        preview: bool = False
+    ) -> None:
+        """
+        Konstruktøren af det asynkrone database-objekt.
+
+        Hvis info ikke gives som input i oprettelsen af objektet, kan brugeren selv indtaste det i terminalen.
+        Adgangskoden oplyses først ved ``.login()``, så den ikke skal gemmes.
+        """
+        self.username = username if username else input("Indtast brugernavn: ")
+        self.database = database if database else input("Indtast databasenavn: ")
+        self.pool_size = max(pool_size, 1)
+        self.preview = preview
+        # Cache over tabellernes opbygning, som i Database
+        self._schema: dict[str, list[tuple]] = {}
+        self._pool: asyncio.Queue | None = None
+        # Hvornår hver forbindelse i puljen sidst blev givet tilbage, så kun ubrugte forbindelser tjekkes med ping
+        self._last_used: dict[int, float] = {}
+        self._direct_connection = None
+        self._direct_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AsyncDatabase":
+        if self._pool is None:
+            await self.login()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.logout()
+
+    async def login(self, password: str = '') -> bool:
+        """
+        Opretter den direkte forbindelse til serveren og puljen af forbindelser til databasen.
+
+        :param password: Adgangskoden, der bruges til at logge ind med.
+            Er den tom, kan brugeren indtaste den i terminalen.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type password: str
+
+        :return: Om forbindelserne kunne oprettes.
+        :rtype: bool
+        """
+        if not password:
+            password = await asyncio.to_thread(getpass.getpass, "Indtast adgangskode: ")
+        login_params = {
+            "user": self.username,
+            "password": password,
+            "host": "localhost"
+        }
+
+        try:
+            self._direct_connection = await mysql.connector.aio.connect(**login_params)
+            print("SUCCES: Forbundet til serveren.")
+            # Puljens forbindelser oprettes samtidig
+            connections = await asyncio.gather(*[
+                mysql.connector.aio.connect(**login_params, database=self.database) for _ in range(self.pool_size)
+            ])
+        except Exception as err:
+            print("FEJL: Kunne ikke oprette forbindelsen. Følgende fejl opstod:\n    ", err)
+            return False
+
+        self._pool = asyncio.Queue()
+        for connection in connections:
+            self._pool.put_nowait(connection)
+            self._last_used[id(connection)] = time.monotonic()
+        print(f"SUCCES: Forbundet til databasen '{self.database}' med {self.pool_size} forbindelser.")
+        return True
+
+    async def logout(self) -> None:
+        """
+        Lukker forbindelserne til database og server.
+
+        Forbindelser, der er lånt ud, lukkes ikke.
+        """
+        if self._pool is not None:
+            while not self._pool.empty():
+                await self._pool.get_nowait().close()
+            self._pool = None
+            self._last_used.clear()
+            print(f"SUCCES: Lukkede forbindelserne til databasen '{self.database}'.")
+        if self._direct_connection is not None:
+            await self._direct_connection.close()
+            self._direct_connection = None
+            print("SUCCES: Lukkede forbindelsen til serveren.")
+
+    @contextlib.asynccontextmanager
+    async def _checkout(self, db: bool = True) -> AsyncIterator:
+        """
+        Låner en forbindelse, så længe with-blokken varer.
+
+        Er alle forbindelser i brug, ventes der, uden at blokere eventloopet, til en bliver ledig.
+        En forbindelse, der har ligget ubrugt i mere end ``connector.POOL_PING_AFTER`` sekunder, tjekkes først med ping.
+        Fejler with-blokken, rulles forbindelsens ændringer tilbage, inden den gives tilbage.
+
+        :param db: Bestemmer, om det er en forbindelse til databasen eller den direkte forbindelse.
+            *Upåkrævet*. Standardværdi: ``True``
+        :type db: bool
+
+        :return: Forbindelsen, der kan bruges i with-blokken.
+        :rtype: AsyncIterator[mysql.connector.aio.MySQLConnection]
+        """
+        if not db:
+            # Der er kun én direkte forbindelse, så den bruges af én ad gangen
+            async with self._direct_lock:
+                try:
+                    yield self._direct_connection
+                except Exception:
+                    await self._rollback(self._direct_connection)
+                    raise
+            return
+
+        connection = await self._pool.get()
+        try:
+            # Sundhedstjek: genopretter forbindelsen, hvis serveren har lukket den, mens den lå ubrugt
+            if time.monotonic() - self._last_used.get(id(connection), 0) > connector.POOL_PING_AFTER:
+                await connection.ping(reconnect=True, attempts=1)
+            yield connection
+        except Exception:
+            # Forbindelsen må ikke gives videre med en halvt udført transaktion
+            await self._rollback(connection)
+            raise
+        finally:
+            self._last_used[id(connection)] = time.monotonic()
+            self._pool.put_nowait(connection)
+
+    async def _rollback(self, connection) -> None:
+        """
+        Ruller ændringer, der endnu ikke er committet, tilbage på forbindelsen. Fejl ignoreres,
+        da forbindelsen i så fald er lukket, og ændringerne dermed alligevel er rullet tilbage.
+        """
+        with contextlib.suppress(Exception):
+            await connection.rollback()
+
+    async def _execute(self,
+        query: str,
+        params: dict[str] | list[dict[str]] = {},
+        db: bool = True,
+        read: bool = False
+    ) -> bool | list[tuple]:
+        """
+        Eksekverer et SQL-query. Se ``Database._execute()``.
+
+        :return: ``True``, ``False`` eller den læste data, som i ``Database._execute()``.
+        :rtype: bool | list[tuple]
+        """
+        try:
+            async with self._checkout(db) as connection:
+                async with await connection.cursor(buffered=True if read else False) as cursor:
+                    # Hvis 'params' er en liste, køres queriet for hver gruppe 'params'
+                    if isinstance(params, list):
+                        await cursor.executemany(query, params)
+                    else:
+                        await cursor.execute(query, params)
+                    result = await cursor.fetchall() if read else True
+                await connection.commit()
+                return result
+        except Exception as err:
+            print(f"FEJL: Kunne ikke udføre handlingen. Følgende fejl opstod:\n    ", err)
+            return False
+
+    async def _preview(self, query: str) -> None:
+        """
+        Viser et preview af queriet, der skal til at køres. Se ``Database._preview()``.
+
+        Venter på brugerens input i en anden tråd, så eventloopet ikke blokeres.
+        """
+        if self.preview:
+            await asyncio.to_thread(self._preview_sync, query)
+
+    async def _confirm(self, force: bool = False) -> bool:
+        """
+        Beder brugeren om at bekræfte en sletning, uden at blokere eventloopet.
+
+        :param force: Bestemmer om bekræftelse af operation skal springes over.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type force: bool
+
+        :return: Om operationen er bekræftet.
+        :rtype: bool
+        """
+        if force:
+            return True
+        # Det er altid godt at bekræfte ved DELETE-operationer
+        confirmation = f"Er du sikker på, at du gerne vil slette data fra databasen '{self.database}'? (j/N) "
+        answer = await asyncio.to_thread(input, confirmation)
+        return answer.lower() in ['j', 'y']
+
+    # CREATE-operationer
+    async def create_database(self, database_name: str) -> bool:
+        """
+        Opretter en database med det angivne navn.
+
+        :param database_name: Navnet på databasen, der ønskes oprettet.
+            *Påkrævet*.
+        :type database_name: str
+
+        :return: Om databasen blev oprettet.
+        :rtype: bool
+        """
+        database_query = f"CREATE DATABASE `{database_name}`"
+
+        await self._preview(database_query)
+
+        if await self._execute(database_query, db=False):
+            print(f"SUCCES: Databasen '{database_name}' blev oprettet.")
+            return True
+        return False
+
+    async def create(self,
+        columns: str,
+        table_name: str = "table",
+        primary_key: str = '',
+        types: dict[str] = {}
+    ) -> None:
+        """
+        Opretter en ny tabel ud fra de angivne oplysninger. Se ``Database.create()``.
+
+        :param columns: En kommasepareret tekststreng indeholdende kolonnenavne.
+            *Påkrævet*.
+        :type columns: str
+        :param table_name: Navnet på tabellen, der ønskes oprettet.
+            *Upåkrævet*. Standardværdi: ``"table"``
+        :type table_name: str
+        :param primary_key: Kolonnen, der skal være tabellens primary key.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type primary_key: str
+        :param types: Datatypen for hver kolonne. Se ``Database.create()``.
+            *Upåkrævet*. Standardværdi: ``{}``
+        :type types: dict[str]
+        """
+        create_query = self._create_query(columns, table_name, types)
+
+        await self._preview(create_query)
+
+        self._invalidate(table_name)
+        if await self._execute(create_query):
+            print(f"SUCCES: Oprettede tabellen '{table_name}'.")
+
+        if primary_key:
+            await self.primary_key(table_name, primary_key)
+
+    async def primary_key(self, table_name: str, column_name: str) -> None:
+        """
+        Tilføjer en primary key til en tabel.
+
+        :param table_name: Navnet på tabellen.
+            *Påkrævet*.
+        :type table_name: str
+        :param column_name: Kolonnen, der skal være tabellens primary key.
+            *Påkrævet*.
+        :type column_name: str
+        """
+        alter_query = f"ALTER TABLE `{table_name}` ADD PRIMARY KEY (`{column_name}`)"
+
+        await self._preview(alter_query)
+        self._invalidate(table_name)
+        if await self._execute(alter_query):
+            print(f"SUCCES: Tilføjede kolonnen '{column_name}' som primary key for tabellen '{table_name}'")
+
+    async def insert(self,
+        data: list[str] | Iterable[list[str]],
+        table_name: str,
+        header: bool = True,
+        batch_size: int = 1000,
+        mode: str = "error",
+        update_columns: list[str] = []
+    ) -> None:
+        """
+        Indsætter en eller flere rækker data i en tabel. Se ``Database.insert()``.
+
+        Alle bidder indsættes på samme forbindelse, og der committes efter hver bid.
+
+        :param data: Dataene, der ønskes indsat i tabellen. Kan være en liste af rækker eller en strøm af batches.
+            *Påkrævet*.
+        :type data: list[str] | Iterable[list[str]]
+        :param table_name: Navnet på tabellen, som dataen skal indsættes i.
+            *Påkrævet*.
+        :type table_name: str
+        :param header: Angiver, om datasættet indeholder en header med kolonnenavne, som skal springes over.
+            *Upåkrævet*. Standardværdi: ``True``
+        :type header: bool
+        :param batch_size: Antallet af rækker, der sendes til serveren i hvert INSERT-query.
+            *Upåkrævet*. Standardværdi: ``1000``
+        :type batch_size: int
+        :param mode: ``"error"``, ``"ignore"`` eller ``"upsert"``. Se ``Database.insert()``.
+            *Upåkrævet*. Standardværdi: ``"error"``
+        :type mode: str
+        :param update_columns: Kolonnerne, der opdateres ved ``"upsert"``. Se ``Database.insert()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type update_columns: list[str]
+        """
+        mode = mode.lower()
+        if mode not in sql.INSERT_MODES:
+            print(f"FEJL: Ukendt mode '{mode}'. Brug en af {', '.join(sql.INSERT_MODES)}.")
+            return
+
+        table_info = await self.info(table_name)
+        if not table_info:
+            return
+
+        table_columns = [column[0] for column in table_info]
+        for column in update_columns:
+            if column not in table_columns:
+                print(f"FEJL: Kolonnen '{column}' findes ikke i tabellen '{table_name}'.")
+                return
+
+        insert_query = self._insert_query(table_name, table_info, mode, update_columns)
+
+        await self._preview(insert_query)
+
+        rows = self._rows(data, header)
+        inserted = 0
+        # Kommer dataene fra en fil, læses hver bid i en anden tråd, så filen ikke blokerer eventloopet
+        try:
+            async with self._checkout() as connection:
+                async with await connection.cursor() as cursor:
+                    while chunk := await asyncio.to_thread(list, itertools.islice(rows, max(batch_size, 1))):
+                        if not all(len(row) == len(table_info) for row in chunk):
+                            print("FEJL: En eller flere rækker data er uforenelig med tabellens format.")
+                            break
+                        insert_params = [{column[0]: row[index] for index, column in enumerate(table_info)} for row in chunk]
+                        try:
+                            await cursor.executemany(insert_query, insert_params)
+                            await connection.commit()
+                        except Exception:
+                            await connection.rollback()
+                            raise
+                        inserted += len(insert_params)
+        except Exception as err:
+            print(f"FEJL: Kunne ikke udføre handlingen. Følgende fejl opstod:\n    ", err)
+
+        if inserted:
+            print(f"SUCCES: {inserted} rækker data indsat i tabellen '{table_name}'.")
+
+    async def new_table(self,
+        data: list[str] | Iterable[list[str]],
+        table_name: str = "table",
+        header: str = '',
+        batch_size: int = 1000
+    ) -> None:
+        """
+        Opretter en ny tabel og indsætter data i den. Se ``Database.new_table()``.
+        """
+        batches = self._batches(data)
+        first_batch = await asyncio.to_thread(next, batches, [])
+        if not header:
+            if not first_batch:
+                print(f"FEJL: Der er ingen data at oprette tabellen '{table_name}' ud fra.")
+                return
+            header, *first_batch = first_batch
+        # Datatyperne udledes fra den første batch
+        types = await asyncio.to_thread(util.infer_types, self._rows(first_batch), header.strip('\n').split(',')) if first_batch else {}
+        batches = itertools.chain([first_batch], batches)
+        await self.create(header, table_name, types=types)
+        await self.insert(batches, table_name, header=False, batch_size=batch_size)
+
+    async def load(self, *tables: str, batch_size: int = 1000) -> None:
+        """
+        Indlæser data fra de(n) angivne fil(er) og opretter en tabel i databasen for hver af dem.
+
+        Uafhængige filer indlæses samtidig, og tabeller, som andre tabeller refererer til, indlæses først.
+        Se ``Database.load()``.
+
+        :param tables: En eller flere filer, der skal laves en tabel af.
+        :type tables: str
+        :param batch_size: Antallet af rækker, der læses og indsættes ad gangen.
+            *Upåkrævet*. Standardværdi: ``1000``
+        :type batch_size: int
+        """
+        # Rækkefølgen findes ud fra filernes headers, som læses i en anden tråd
+        for wave in await asyncio.to_thread(self._load_order, tables):
+            await asyncio.gather(*[
+                self.new_table(util.read_csv_batches(table, batch_size), util.get_name(table), batch_size=batch_size)
+                for table in wave
+            ])
+
+    # READ-operationer
+    async def read(self,
+        table_name: str,
+        *column_name: str,
+        joins: list[dict[str]] = [],
+        order: int | str = 0,
+        direction: str = 'a',
+        limit: int = 0,
+        offset: int = 0
+    ) -> list[tuple] | None:
+        """
+        Læser data fra en tabel. Se ``Database.read()`` for parametrene.
+
+        :return: En liste med rækker indeholdende data fra de(n) valgte kolonne(r).
+        :rtype: list[tuple]
+        :return: Hvis READ-operationen ikke kunne gennemføres.
+        :rtype: None
+        """
+        # Joins tjekkes mod tabellernes info, som derfor hentes på forhånd
+        if joins:
+            await self.info()
+            await asyncio.gather(*[self.info(table) for table in self._tables(table_name, joins)])
+
+        select_query, select_params = self._select(table_name, column_name, joins, order, direction, limit, offset)
+
+        await self._preview(select_query)
+
+        result = await self._execute(select_query, select_params, read=True)
+        if result:
+            print(f"SUCCES: Dataene blev læst fra '{table_name}' problemfrit.")
+            return result
+
+    def _join(self,
+        left: str,
+        right: str,
+        on_left: str,
+        on_right: str,
+        join_type: str = 'i',
+    ) -> str:
+        """
+        Konstruerer JOIN-delen af et query. Se ``Database._join()``.
+
+        Tabellernes info slås op i cachen, som ``.read()`` har fyldt på forhånd.
+        """
+        tables = [table[0] for table in self._schema.get('', [])]
+        for table in [left, right]:
+            if table not in tables:
+                print(f"Tabellen '{table}' findes ikke i databasen.")
+                return ''
+        left_columns = [column[0] for column in self._schema.get(left, [])]
+        right_columns = [column[0] for column in self._schema.get(right, [])]
+        if on_left not in left_columns or on_right not in right_columns:
+            return ''
+
+        return self._join_clause(left, right, on_left, on_right, join_type)
+
+    async def info(self, table_name: str = '') -> list[tuple] | None:
+        """
+        Henter info om databasens eller en tabels opbygning. Se ``Database.info()``.
+
+        :return: En liste med info om hver kolonne i tabellen eller hver tabel i databasen.
+        :rtype: list[tuple]
+        :return: Hvis READ-operationen ikke kunne gennemføres.
+        :rtype: None
+        """
+        if table_name in self._schema:
+            return self._schema[table_name]
+
+        describe_query = f"DESCRIBE `{table_name}`" if table_name else "SHOW TABLES"
+
+        await self._preview(describe_query)
+
+        table_info = await self._execute(describe_query, read=True)
+        if table_info:
+            if table_name:
+                print(f"SUCCES: Hentede info om tabellen '{table_name}'.")
+            else:
+                print(f"SUCCES: Hentede info om databasen '{self.database}'.")
+            self._schema[table_name] = table_info
+            return table_info
+
+    def _invalidate(self, table_name: str = '') -> None:
+        """
+        Fjerner info om en tabel fra cachen. Se ``Database._invalidate()``.
+        """
+        if not table_name:
+            self._schema.clear()
+            return
+        self._schema.pop(table_name, None)
+        self._schema.pop('', None)
+
+    # DELETE-operationer
+    async def drop(self, table_name: str, force: bool = False) -> None:
+        """
+        Fjerner en tabel helt fra databasen.
+
+        :param table_name: Navnet på tabellen, der ønskes fjernet.
+            *Påkrævet*.
+        :type table_name: str
+        :param force: Bestemmer om bekræftelse af operation skal springes over.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type force: bool
+        """
+        drop_query = f"DROP TABLE `{table_name}`"
+
+        await self._preview(drop_query)
+
+        if await self._confirm(force):
+            self._invalidate(table_name)
+            if await self._execute(drop_query):
+                print(f"SUCCES: Tabellen '{table_name}' blev fjernet.")
+
+    async def reset(self, force: bool = False) -> None:
+        """
+        Nulstiller databasen.
+
+        Sletter nuværende database og gendanner derefter en tom database med samme navn.
+        Puljens forbindelser vælger bagefter den nye database igen.
+
+        :param force: Bestemmer om bekræftelse af operation skal springes over.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type force: bool
+        """
+        drop_query = f"DROP DATABASE `{self.database}`"
+
+        await self._preview(drop_query)
+
+        if await self._confirm(force):
+            self._invalidate()
+            if await self._execute(drop_query, db=False) and await self.create_database(self.database):
+                # Forbindelserne mister deres database, når den slettes.
+                # Køen giver forbindelserne i rækkefølge, så hver forbindelse lånes én gang
+                for _ in range(self.pool_size):
+                    await self._execute(f"USE `{self.database}`")
+                print(f"Databasen '{self.database}' blev nulstillet.")
+
+async def main() -> None:
+    pass
+
+if __name__ == "__main__":
+    asyncio.run(main())
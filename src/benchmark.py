@@ -0,0 +1,289 @@
+import argparse
+import datetime
+import getpass
+import json
+import os.path
+import platform
+import random
+import statistics
+import subprocess
+import time
+import database
+import util
+from collections.abc import Callable
+
+# Standardmappen til de genererede datasæt
+benchmark_dir = os.path.join(util.data_dir, "benchmark")
+# Forholdet mellem antal ordrer og antal kunder og produkter, som i datasættene i data-mappen
+CUSTOMERS_PER_ORDER = 0.3
+PRODUCTS_PER_ORDER = 0.01
+# Grænsen for, hvor meget langsommere en operation må være end i en tidligere kørsel, før den markeres
+REGRESSION_THRESHOLD = 0.10
+
+def generate(orders: int, directory: str = benchmark_dir, seed: int = 0) -> dict[str, str]:
+    """
+    Genererer et datasæt med kunder, produkter og ordrer i samme format som filerne i data-mappen.
+
+    Antallet af kunder og produkter skaleres med antallet af ordrer,
+    og hver ordre refererer til en eksisterende kunde og et eksisterende produkt.
+    Navnene dannes ud fra navnene i de oprindelige datasæt. Filerne skrives løbende,
+    så selv meget store datasæt ikke skal holdes i hukommelsen. Findes filerne allerede, genbruges de.
+
+    :param orders: Antallet af ordrer.
+        *Påkrævet*.
+    :type orders: int
+    :param directory: Mappen, som datasættet gemmes i. Der oprettes en undermappe for hvert antal ordrer.
+        *Upåkrævet*. Standardværdi: ``benchmark_dir``
+    :type directory: str
+    :param seed: Startværdien for tilfældighedsgeneratoren, så samme datasæt kan genskabes.
+        *Upåkrævet*. Standardværdi: ``0``
+    :type seed: int
+
+    :return: En dict med tabelnavnene som nøgler og de absolutte stier til filerne som værdier.
+    :rtype: dict[str, str]
+    """
+    directory = os.path.abspath(os.path.join(directory, str(orders)))
+    files = {table: os.path.join(directory, f"{table}.csv") for table in ["customers", "products", "orders"]}
+    if all(os.path.exists(file) for file in files.values()):
+        print(f"SUCCES: Genbruger datasættet med {orders} ordrer i '{directory}'.")
+        return files
+    os.makedirs(directory, exist_ok=True)
+
+    rng = random.Random(seed)
+    customer_count = max(int(orders * CUSTOMERS_PER_ORDER), 1)
+    product_count = max(int(orders * PRODUCTS_PER_ORDER), 1)
+
+    # Navnene fra de oprindelige datasæt bruges som byggesten
+    names = [line.strip('\n').split(',')[1] for line in util.read_csv("customers.csv")[1:]]
+    first_names = sorted({name.split()[0] for name in names})
+    last_names = sorted({name.split()[-1] for name in names})
+    domains = sorted({line.strip('\n').split('@')[-1] for line in util.read_csv("customers.csv")[1:]})
+    product_names = [line.strip('\n').split(',')[1] for line in util.read_csv("products.csv")[1:]]
+
+    with open(files["customers"], 'w', encoding="utf-8", newline='\n') as file:
+        file.write("id,name,email\n")
+        for id in range(customer_count):
+            first, last = rng.choice(first_names), rng.choice(last_names)
+            file.write(f"{id},{first} {last},{first.lower()}.{last.lower()}{id}@{rng.choice(domains)}\n")
+
+    with open(files["products"], 'w', encoding="utf-8", newline='\n') as file:
+        file.write("id,name,price\n")
+        for id in range(product_count):
+            file.write(f"{id},{product_names[id % len(product_names)]} {id // len(product_names) + 1},{rng.uniform(5, 1000):.5f}\n")
+
+    start = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=1)))
+    with open(files["orders"], 'w', encoding="utf-8", newline='\n') as file:
+        file.write("id,date_time,customer,product\n")
+        for id in range(orders):
+            date_time = start + datetime.timedelta(seconds=rng.randrange(365 * 24 * 60 * 60))
+            file.write(f"{id},{date_time.isoformat()},{rng.randrange(customer_count)},{rng.randrange(product_count)}\n")
+
+    print(f"SUCCES: Genererede {orders} ordrer, {customer_count} kunder og {product_count} produkter i '{directory}'.")
+    return files
+
+def measure(operation: Callable[[], object], repeat: int = 3, setup: Callable[[], object] | None = None) -> list[float]:
+    """
+    Måler, hvor lang tid en operation tager.
+
+    :param operation: Funktionen, der skal måles.
+        *Påkrævet*.
+    :type operation: Callable[[], object]
+    :param repeat: Antallet af gange, operationen køres.
+        *Upåkrævet*. Standardværdi: ``3``
+    :type repeat: int
+    :param setup: En funktion, der køres (uden at blive målt) inden hver kørsel, f.eks. for at fjerne tabeller.
+        *Upåkrævet*. Standardværdi: ``None``
+    :type setup: Callable[[], object] | None
+
+    :return: En liste med antal sekunder for hver kørsel.
+    :rtype: list[float]
+    """
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        operation()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+def run(db: database.Database, files: dict[str, str], repeat: int = 3, bulk: bool = False) -> list[dict]:
+    """
+    Kører benchmarks for indlæsning, indsættelse, læsning og info på ét datasæt.
+
+    :param db: Databasen, som benchmarks køres mod. Eksisterende tabeller med datasættets navne fjernes.
+        *Påkrævet*.
+    :type db: database.Database
+    :param files: Datasættets filer, som givet af ``generate()``.
+        *Påkrævet*.
+    :type files: dict[str, str]
+    :param repeat: Antallet af gange, hver operation køres.
+        *Upåkrævet*. Standardværdi: ``3``
+    :type repeat: int
+    :param bulk: Bestemmer, om filerne indlæses med ``LOAD DATA LOCAL INFILE``. Se ``Database.load()``.
+        *Upåkrævet*. Standardværdi: ``False``
+    :type bulk: bool
+
+    :return: En liste med en dict for hver operation, med dens navn og tider.
+    :rtype: list[dict]
+    """
+    results = []
+    with open(files["orders"], 'r', encoding="utf-8") as file:
+        orders = sum(1 for _ in file) - 1
+
+    def record(name: str, runs: list[float], rows: int) -> None:
+        results.append({
+            "orders": orders,
+            "operation": name,
+            "rows": rows,
+            "runs": runs,
+            "min": min(runs),
+            "median": statistics.median(runs)
+        })
+        print(f"SUCCES: {name} ({orders} ordrer): {min(runs):.4f} s (median {statistics.median(runs):.4f} s)")
+
+    def drop_tables(*tables: str) -> None:
+        # Listen over databasens tabeller hentes på ny, da den kan være ændret siden sidst
+        existing = {row[0].decode() if isinstance(row[0], bytes) else row[0] for row in db.refresh() or []}
+        # Ordrerne refererer til kunderne og produkterne og fjernes derfor først
+        for table in tables or ["orders_insert", "orders", "customers", "products"]:
+            if table in existing:
+                db.drop(table, force=True)
+
+    # Indlæsning af alle tre filer, inkl. keys
+    def load() -> None:
+        db.load(files["orders"], files["customers"], files["products"], bulk=bulk)
+        for table in ["customers", "products", "orders"]:
+            db.primary_key(table, "id")
+        db.foreign_key("orders", { "customer": "customers.id", "product": "products.id" })
+    record("load", measure(load, repeat, drop_tables), orders)
+
+    # Indsættelse i en tabel, der allerede er oprettet
+    def drop_insert_table() -> None:
+        drop_tables("orders_insert")
+        db.create("id,date_time,customer,product", "orders_insert", types={
+            column[0]: column[1].decode() if isinstance(column[1], bytes) else column[1]
+            for column in db.info("orders")
+        })
+    record("insert", measure(
+        lambda: db.insert(util.read_csv_batches(files["orders"]), "orders_insert", header=True),
+        repeat, drop_insert_table
+    ), orders)
+
+    joins = [
+        { "right": "customers", "on_left": "customer", "on_right": "id", "join_type": 'i' },
+        { "right": "products", "on_left": "product", "on_right": "id", "join_type": 'i' }
+    ]
+    reads = {
+        "read": lambda: db.read("orders"),
+        "read_order_limit": lambda: db.read("orders", order="date_time", direction='d', limit=100),
+        "read_join": lambda: db.read("orders", "orders.id", "customers.name", "products.name", joins=joins),
+        "read_join_order_limit": lambda: db.read(
+            "orders", "orders.id", "customers.name", "products.price",
+            joins=joins, order="products.price", direction='d', limit=100
+        )
+    }
+    for name, read in reads.items():
+        rows = len(read() or [])
+        record(name, measure(read, repeat), rows)
+
+    # .refresh() tvinger et nyt DESCRIBE, mens .info() bruger cachen
+    record("info", measure(lambda: [db.refresh(table) for table in ["orders", "customers", "products"]], repeat), 3)
+    record("info_cached", measure(lambda: [db.info(table) for table in ["orders", "customers", "products"]], repeat), 3)
+
+    drop_tables()
+    return results
+
+def version() -> str:
+    """
+    Finder den aktuelle version af koden ud fra git, så resultater fra forskellige versioner kan sammenlignes.
+
+    :return: Commit-hashen, evt. med ``-dirty``, hvis der er ændringer, der ikke er committet.
+    :rtype: str
+    :return: Hvis git ikke er tilgængeligt.
+    :rtype: str: ``''``
+    """
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return ''
+
+def compare(results: list[dict], baseline: list[dict], threshold: float = REGRESSION_THRESHOLD) -> list[dict]:
+    """
+    Sammenligner resultaterne med en tidligere kørsel og finder de operationer, der er blevet langsommere.
+
+    Sammenligningen bruger den hurtigste kørsel af hver operation, da den er mindst påvirket af støj.
+
+    :param results: Resultaterne fra denne kørsel.
+        *Påkrævet*.
+    :type results: list[dict]
+    :param baseline: Resultaterne fra den tidligere kørsel.
+        *Påkrævet*.
+    :type baseline: list[dict]
+    :param threshold: Den relative forøgelse af tiden, der regnes som en regression.
+        *Upåkrævet*. Standardværdi: ``REGRESSION_THRESHOLD``
+    :type threshold: float
+
+    :return: En liste med en dict for hver regression, med operationen, antal ordrer og de to tider.
+    :rtype: list[dict]
+    """
+    previous = {(result["orders"], result["operation"]): result["min"] for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result["orders"], result["operation"]))
+        if before and result["min"] > before * (1 + threshold):
+            regressions.append({
+                "orders": result["orders"],
+                "operation": result["operation"],
+                "before": before,
+                "after": result["min"]
+            })
+            print(
+                f"FEJL: {result['operation']} ({result['orders']} ordrer) er blevet langsommere: "
+                f"{before:.4f} s -> {result['min']:.4f} s (+{(result['min'] / before - 1) * 100:.0f} %)"
+            )
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Måler Database-klassens ydeevne på genererede datasæt af forskellig størrelse.")
+    parser.add_argument("--orders", type=int, nargs='+', default=[10_000, 100_000], help="Antal ordrer i hvert datasæt.")
+    parser.add_argument("--repeat", type=int, default=3, help="Antal kørsler af hver operation.")
+    parser.add_argument("--username", default='', help="Brugernavnet til MySQL.")
+    parser.add_argument("--database", default="spac_benchmark", help="Databasen, som benchmarks køres i. Oprettes, hvis den ikke findes.")
+    parser.add_argument("--data-dir", default=benchmark_dir, help="Mappen, som datasættene gemmes i.")
+    parser.add_argument("--bulk", action="store_true", help="Indlæser filerne med LOAD DATA LOCAL INFILE.")
+    parser.add_argument("--output", default="benchmark.json", help="Filen, som resultaterne gemmes i (JSON).")
+    parser.add_argument("--compare", default='', help="En tidligere resultatfil, som resultaterne sammenlignes med.")
+    args = parser.parse_args()
+
+    username = args.username if args.username else input("Indtast brugernavn: ")
+    password = getpass.getpass("Indtast adgangskode: ")
+
+    # Findes databasen ikke, spørger Database, om den skal oprettes
+    db = database.Database(username, password, args.database, preview=False, local_infile=args.bulk)
+
+    results = []
+    for orders in args.orders:
+        results += run(db, generate(orders, args.data_dir), args.repeat, args.bulk)
+    db.logout()
+
+    output = {
+        "version": version(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": { "repeat": args.repeat, "bulk": args.bulk },
+        "results": results
+    }
+    if args.compare:
+        with open(args.compare, 'r', encoding="utf-8") as file:
+            output["regressions"] = compare(results, json.load(file)["results"])
+    with open(args.output, 'w', encoding="utf-8") as file:
+        json.dump(output, file, indent=2)
+    print(f"SUCCES: Gemte resultaterne i '{args.output}'.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import collections
+import sys
+import threading
+import time
+
+class ResultCache:
+    """
+    En cache over resultaterne af læste queries, som holder sig inden for et fast hukommelsesbudget.
+
+    Hvert resultat gemmes sammen med de tabeller, det er læst fra,
+    så alle resultater, der afhænger af en tabel, kan fjernes, når tabellen ændres.
+    Når budgettet er opbrugt, fjernes de mindst nyligt brugte resultater (LRU),
+    og resultater, der er ældre end ``ttl`` sekunder, bruges ikke.
+
+    :param max_bytes: Det omtrentlige antal bytes, som de gemte resultater højst må fylde.
+        *Påkrævet*.
+    :type max_bytes: int
+    :param ttl: Antal sekunder, et resultat må gemmes, før det skal læses igen.
+        *Upåkrævet*. Standardværdi: ``60``
+    :type ttl: float
+    """
+
+    def __init__(self, max_bytes: int, ttl: float = 60) -> None:
+        """
+        Konstruktøren af cachen.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Nøgle -> (resultat, tabeller, størrelse, udløbstidspunkt), i rækkefølge efter seneste brug
+        self._entries: collections.OrderedDict[tuple, tuple[list[tuple], frozenset[str], int, float]] = collections.OrderedDict()
+        # Objektet kan deles mellem flere tråde, når databasen bruger en pool
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> list[tuple] | None:
+        """
+        Henter et gemt resultat.
+
+        :param key: Nøglen, som resultatet er gemt under, dvs. queriet og dets parametre.
+            *Påkrævet*.
+        :type key: tuple
+
+        :return: En kopi af det gemte resultat.
+        :rtype: list[tuple]
+        :return: Hvis resultatet ikke er gemt, eller hvis det er udløbet.
+        :rtype: None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            result, _, size, expires = entry
+            if time.monotonic() >= expires:
+                del self._entries[key]
+                self.size -= size
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Kopien sikrer, at kalderen ikke kan ændre i det gemte resultat
+            return list(result)
+
+    def put(self, key: tuple, result: list[tuple], tables: set[str]) -> None:
+        """
+        Gemmer et resultat og fjerner de mindst nyligt brugte resultater, hvis budgettet overskrides.
+
+        Resultater, der alene er større end budgettet, gemmes ikke.
+
+        :param key: Nøglen, som resultatet skal gemmes under.
+            *Påkrævet*.
+        :type key: tuple
+        :param result: Resultatet, der skal gemmes.
+            *Påkrævet*.
+        :type result: list[tuple]
+        :param tables: Tabellerne, som resultatet er læst fra.
+            *Påkrævet*.
+        :type tables: set[str]
+        """
+        size = self._sizeof(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[2]
+            self._entries[key] = (list(result), frozenset(tables), size, time.monotonic() + self.ttl)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, _, old_size, _) = self._entries.popitem(last=False)
+                self.size -= old_size
+                self.evictions += 1
+
+    def invalidate(self, table_name: str = '') -> None:
+        """
+        Fjerner alle gemte resultater, der afhænger af en tabel.
+
+        :param table_name: Navnet på tabellen, der er blevet ændret.
+            Hvis navnet er tomt, ryddes hele cachen.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type table_name: str
+        """
+        with self._lock:
+            if not table_name:
+                self._entries.clear()
+                self.size = 0
+                return
+            for key in [key for key, entry in self._entries.items() if table_name in entry[1]]:
+                self.size -= self._entries.pop(key)[2]
+
+    def info(self) -> dict[str, int]:
+        """
+        Viser statistik for cachen.
+
+        :return: En dict med antal hits, misses, fjernede resultater, gemte resultater og brugte bytes.
+        :rtype: dict[str, int]
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.size
+        }
+
+    def _sizeof(self, result: list[tuple]) -> int:
+        """
+        Anslår, hvor mange bytes et resultat fylder i hukommelsen.
+
+        Medregner listen, rækkerne og hver enkelt værdi, men ikke værdier, der deles mellem rækker.
+
+        :param result: Resultatet, der skal måles.
+            *Påkrævet*.
+        :type result: list[tuple]
+
+        :return: Det omtrentlige antal bytes.
+        :rtype: int
+        """
+        size = sys.getsizeof(result)
+        for row in result:
+            size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+        return size
@@ -0,0 +1,433 @@
+import array
+import datetime
+import decimal
+import json
+import struct
+import sys
+import zlib
+from collections.abc import Iterator, Sequence
+from typing import BinaryIO
+
+# NumPy er valgfrit. Uden NumPy gemmes kolonnerne i array.array fra standardbiblioteket
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Heltalstyperne fra MySQL og deres typekoder til hhv. array.array og NumPy (signed, unsigned)
+INTEGER_CODES = {
+    "tinyint": (('b', "int8"), ('B', "uint8")),
+    "smallint": (('h', "int16"), ('H', "uint16")),
+    "mediumint": (('i', "int32"), ('I', "uint32")),
+    "int": (('i', "int32"), ('I', "uint32")),
+    "integer": (('i', "int32"), ('I', "uint32")),
+    "bigint": (('q', "int64"), ('Q', "uint64")),
+    "year": (('h', "int16"), ('h', "int16"))
+}
+FLOAT_TYPES = ("decimal", "numeric", "float", "double", "real")
+STRING_TYPES = ("char", "varchar", "tinytext", "text", "mediumtext", "longtext", "enum", "set")
+EPOCH = datetime.datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+MICROSECOND = datetime.timedelta(microseconds=1)
+# Starten af en kolonnefil fra ColumnWriter, efterfulgt af formatets version
+MAGIC = b"UGE4COLS"
+VERSION = 2
+# NumPy's dtypes (little-endian) for typekoderne til array.array
+ARRAY_DTYPES = {
+    'b': "<i1", 'B': "<u1", 'h': "<i2", 'H': "<u2", 'i': "<i4", 'I': "<u4", 'q': "<i8", 'Q': "<u8", 'd': "<f8"
+}
+# En DECIMAL med højst så mange cifre gemmes som et 64-bit heltal ganget med 10^scale, ellers som tekst
+DECIMAL_INT_DIGITS = 18
+
+class StringColumn:
+    """
+    En kompakt kolonne af tekst, hvor alle værdier ligger i én samlet bytearray.
+
+    I stedet for et Python-objekt for hver værdi gemmes teksten som UTF-8 efter hinanden,
+    og en array af offsets angiver, hvor hver værdi starter og slutter.
+    Værdierne laves først om til *str*, når de hentes med indeks eller iteration.
+
+    :param values: Værdierne, der skal gemmes i kolonnen.
+        *Påkrævet*.
+    :type values: Sequence[str]
+    """
+
+    def __init__(self, values: Sequence[str]) -> None:
+        """
+        Konstruktøren af kolonnen.
+        """
+        self.data = bytearray()
+        self.offsets = array.array('Q', [0])
+        for value in values:
+            self.data += value.encode()
+            self.offsets.append(len(self.data))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StringColumn index out of range")
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode()
+
+    def __iter__(self) -> Iterator[str]:
+        for start, end in zip(self.offsets, self.offsets[1:]):
+            yield self.data[start:end].decode()
+
+    def __repr__(self) -> str:
+        return f"StringColumn({list(self)[:5]}{'...' if len(self) > 5 else ''}, len={len(self)})"
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Antallet af bytes, som teksten og dens offsets fylder.
+        """
+        return len(self.data) + self.offsets.itemsize * len(self.offsets)
+
+def base_type(datatype: str | bytes) -> tuple[str, bool]:
+    """
+    Finder grundtypen af en datatype fra ``DESCRIBE``, f.eks. ``"int"`` fra ``"int unsigned"``.
+
+    :param datatype: Datatypen, som den står i tabellens info.
+        *Påkrævet*.
+    :type datatype: str | bytes
+
+    :return: En tuple bestående af grundtypen med små bogstaver og om typen er unsigned.
+    :rtype: tuple[str, bool]
+    """
+    # Nogle versioner af mysql.connector giver typen som bytes
+    if isinstance(datatype, (bytes, bytearray)):
+        datatype = datatype.decode()
+    datatype = datatype.lower()
+    return datatype.split('(')[0].split()[0], "unsigned" in datatype
+
+def column_array(values: Sequence, datatype: str | bytes) -> object:
+    """
+    Samler værdierne fra én kolonne i en typet array ud fra kolonnens datatype.
+
+    Typen af arrayen afhænger kun af datatypen, så en kolonne har samme type i alle bidder af et resultat,
+    også når nogle af bidderne indeholder NULL. Se ``null_mask()`` for, hvilke værdier der er NULL.
+
+    - Heltal bliver til en heltalsarray med samme størrelse som i MySQL. NULL bliver til ``0``.
+    - DECIMAL, FLOAT og DOUBLE bliver til 64-bit kommatal. NULL bliver til ``nan``.
+    - DATE, DATETIME og TIME bliver til ``datetime64[D]``, ``datetime64[us]`` og ``timedelta64[us]`` med NumPy,
+      hvor NULL er ``NaT``, og ellers til heltal med antal dage hhv. mikrosekunder siden 1970-01-01 (TIME: siden midnat),
+      hvor NULL er ``0``.
+    - Tekst bliver til en ``StringColumn``. NULL bliver til tom tekst.
+    - Andre typer gives som en almindelig liste.
+
+    :param values: Kolonnens værdier.
+        *Påkrævet*.
+    :type values: Sequence
+    :param datatype: Kolonnens datatype, som den står i tabellens info.
+        *Påkrævet*.
+    :type datatype: str | bytes
+
+    :return: Kolonnen som NumPy-array, ``array.array``, ``StringColumn`` eller liste.
+    :rtype: numpy.ndarray | array.array | StringColumn | list
+    """
+    column_encoding = encoding(datatype)
+    if column_encoding == "json":
+        return list(values)
+    # DECIMAL gemmes præcist i en kolonnefil, men regnes der på kolonnen, er kommatal hurtigst
+    if base_type(datatype)[0] in ("decimal", "numeric"):
+        column_encoding = "int:d"
+    column = _decode(column_encoding, _encode(column_encoding, values), len(values))
+    if numpy is not None and column_encoding in ("date", "datetime", "time") and None in values:
+        column[null_mask(values)] = numpy.datetime64("NaT") if column_encoding != "time" else numpy.timedelta64("NaT")
+    return column
+
+def null_mask(values: Sequence) -> object:
+    """
+    Finder de værdier i en kolonne, der er NULL.
+
+    :param values: Kolonnens værdier.
+        *Påkrævet*.
+    :type values: Sequence
+
+    :return: En bool for hver værdi, der er ``True``, hvis værdien er NULL,
+        som NumPy-array, hvis NumPy er installeret, og ellers som liste.
+    :rtype: numpy.ndarray | list[bool]
+    :return: Hvis ingen af værdierne er NULL.
+    :rtype: None
+    """
+    if None not in values:
+        return None
+    return _mask([value is None for value in values])
+
+def _mask(nulls: list[bool]) -> object:
+    return numpy.array(nulls, dtype=bool) if numpy is not None else nulls
+
+class ColumnBatch(dict):
+    """
+    Et resultat vendt til kolonner: en dict med kolonnenavnene som nøgler og kolonnerne som typede arrays.
+
+    NULL-værdierne står i attributten ``nulls``, en dict med en maske for hver kolonne
+    (``None``, hvis kolonnen ikke har NULL). Se ``null_mask()``.
+    """
+
+    def __init__(self, columns: dict[str, object], nulls: dict[str, object]) -> None:
+        """
+        Konstruktøren af kolonnerne.
+        """
+        super().__init__(columns)
+        self.nulls = nulls
+
+def to_columns(rows: list[tuple], columns: list[tuple[str, str]]) -> ColumnBatch:
+    """
+    Vender et resultat fra rækker til kolonner.
+
+    :param rows: Rækkerne, som de er læst fra databasen.
+        *Påkrævet*.
+    :type rows: list[tuple]
+    :param columns: Navnet og datatypen for hver kolonne i rækkerne, i samme rækkefølge.
+        *Påkrævet*.
+    :type columns: list[tuple[str, str]]
+
+    :return: En dict med kolonnenavnene som nøgler og kolonnerne som typede arrays (se ``column_array()``)
+        og NULL-værdierne i attributten ``nulls``.
+    :rtype: ColumnBatch
+    """
+    values = list(zip(*rows)) if rows else [() for _ in columns]
+    return ColumnBatch(
+        {name: column_array(column, datatype) for (name, datatype), column in zip(columns, values)},
+        {name: null_mask(column) for (name, _), column in zip(columns, values)}
+    )
+
+class ColumnWriter:
+    """
+    Skriver et resultat til en komprimeret, binær kolonnefil, en bid (row group) ad gangen.
+
+    Filen starter med ``MAGIC``, formatets version og en JSON-header med hver kolonnes navn, datatype og kodning.
+    Kodningen vælges én gang ud fra kolonnens datatype (se ``encoding()``), så en kolonne har samme type i alle bidder:
+
+    - Heltal gemmes som little-endian heltal med samme størrelse som i MySQL, og FLOAT/DOUBLE som 64-bit kommatal.
+    - DECIMAL gemmes præcist som et 64-bit heltal ganget med 10^scale, eller som tekst, hvis den har over 18 cifre.
+    - DATE, DATETIME/TIMESTAMP og TIME gemmes som 64-bit heltal med antal dage hhv. mikrosekunder siden 1970-01-01 (TIME: siden midnat).
+    - Tekst gemmes som en ``StringColumn`` og alt andet som JSON.
+
+    Bidderne består af antallet af rækker og hver kolonne for sig, komprimeret med zlib.
+    Har kolonnen NULL i bidden, står der først et bitmap med én bit pr. række (1 = ikke NULL).
+    Filen kan læses igen med ``read_column_file()``.
+
+    :param file: Den binære fil, der skrives til.
+        *Påkrævet*.
+    :type file: BinaryIO
+    :param columns: Navnet og datatypen for hver kolonne i rækkerne, i samme rækkefølge.
+        *Påkrævet*.
+    :type columns: list[tuple[str, str]]
+    :param level: zlib's komprimeringsniveau fra 0 (ingen) til 9 (mest).
+        *Upåkrævet*. Standardværdi: ``6``
+    :type level: int
+    """
+
+    def __init__(self, file: BinaryIO, columns: list[tuple[str, str]], level: int = 6) -> None:
+        """
+        Konstruktøren af skriveren. Skriver filens header.
+        """
+        self.file = file
+        self.columns = [(name, datatype.decode() if isinstance(datatype, (bytes, bytearray)) else datatype) for name, datatype in columns]
+        self.encodings = [encoding(datatype) for _, datatype in self.columns]
+        self.level = level
+        self.rows = 0
+        header = json.dumps({
+            "columns": [[name, datatype, column_encoding] for (name, datatype), column_encoding in zip(self.columns, self.encodings)],
+            "compression": "zlib"
+        }).encode()
+        self.bytes = self._write(MAGIC + struct.pack("<BI", VERSION, len(header)) + header)
+
+    def _write(self, data: bytes) -> int:
+        self.file.write(data)
+        return len(data)
+
+    def write(self, rows: list[tuple]) -> int:
+        """
+        Skriver en bid af rækker som én row group.
+
+        :param rows: Rækkerne, som de er læst fra databasen.
+            *Påkrævet*.
+        :type rows: list[tuple]
+
+        :return: Antallet af bytes, der blev skrevet.
+        :rtype: int
+        """
+        written = self._write(struct.pack("<I", len(rows)))
+        values = list(zip(*rows)) if rows else [() for _ in self.columns]
+        for column_encoding, column in zip(self.encodings, values):
+            payload = _validity(column) + _encode(column_encoding, column)
+            compressed = zlib.compress(payload, self.level)
+            written += self._write(struct.pack("<Q", len(compressed)) + compressed)
+        self.rows += len(rows)
+        self.bytes += written
+        return written
+
+def encoding(datatype: str | bytes) -> str:
+    """
+    Vælger, hvordan en kolonne med den angivne datatype gemmes i en kolonnefil. Se ``ColumnWriter``.
+
+    :param datatype: Kolonnens datatype, som den står i tabellens info, f.eks. ``"decimal(10,5)"``.
+        *Påkrævet*.
+    :type datatype: str | bytes
+
+    :return: Kodningen, f.eks. ``"int:b"`` (typekoden til array.array), ``"decimal:5"`` (scale), ``"date"`` eller ``"str"``.
+    :rtype: str
+    """
+    kind, unsigned = base_type(datatype)
+    if isinstance(datatype, (bytes, bytearray)):
+        datatype = datatype.decode()
+    if kind in INTEGER_CODES:
+        return f"int:{INTEGER_CODES[kind][unsigned][0]}"
+    if kind in ("decimal", "numeric"):
+        precision, _, scale = datatype.partition('(')[2].partition(')')[0].partition(',')
+        precision, scale = int(precision or 10), int(scale or 0)
+        return f"decimal:{scale}" if precision <= DECIMAL_INT_DIGITS else "str"
+    if kind in FLOAT_TYPES:
+        return "int:d"
+    if kind == "date":
+        return "date"
+    if kind in ("datetime", "timestamp"):
+        return "datetime"
+    if kind == "time":
+        return "time"
+    if kind in STRING_TYPES:
+        return "str"
+    return "json"
+
+def _validity(column: Sequence) -> bytes:
+    """
+    Danner bitmappet over, hvilke værdier der ikke er NULL, med et flag foran (``0`` = ingen NULL, ``1`` = bitmap følger).
+    """
+    if None not in column:
+        return b"\x00"
+    bitmap = bytearray((len(column) + 7) // 8)
+    for index, value in enumerate(column):
+        if value is not None:
+            bitmap[index // 8] |= 1 << (index % 8)
+    return b"\x01" + bytes(bitmap)
+
+def _encode(column_encoding: str, column: Sequence) -> bytes:
+    """
+    Laver en kolonnes værdier om til bytes med den angivne kodning. NULL gemmes som ``0`` eller tom tekst.
+    """
+    kind, _, argument = column_encoding.partition(':')
+    if kind == "int":
+        if argument == 'd':
+            values = array.array('d', (float("nan") if value is None else float(value) for value in column))
+        else:
+            values = array.array(argument, (0 if value is None else int(value) for value in column))
+    elif kind == "decimal":
+        values = array.array('q', (0 if value is None else int(decimal.Decimal(value).scaleb(int(argument))) for value in column))
+    elif kind == "date":
+        values = array.array('q', (0 if value is None else value.toordinal() - EPOCH_ORDINAL for value in column))
+    elif kind == "datetime":
+        values = array.array('q', (0 if value is None else (value.replace(tzinfo=None) - EPOCH) // MICROSECOND for value in column))
+    elif kind == "time":
+        values = array.array('q', (0 if value is None else value // MICROSECOND for value in column))
+    elif kind == "str":
+        strings = StringColumn(['' if value is None else _text(value) for value in column])
+        offsets = _little_endian(strings.offsets)
+        return struct.pack("<Q", len(offsets)) + offsets + bytes(strings.data)
+    else:
+        return json.dumps(list(column), default=_json_value).encode()
+    return _little_endian(values)
+
+def _text(value) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode(errors="replace")
+    return value if isinstance(value, str) else str(value)
+
+def _little_endian(values: array.array) -> bytes:
+    if sys.byteorder == "big":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _json_value(value) -> str:
+    """
+    Laver værdier, som JSON ikke selv kan gemme (f.eks. datoer og DECIMAL), om til tekst.
+    """
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode(errors="replace")
+    return str(value)
+
+def read_column_file(filename: str) -> Iterator[tuple[dict[str, object], dict[str, object]]]:
+    """
+    Læser en kolonnefil fra ``ColumnWriter`` én row group ad gangen.
+
+    Hver kolonne har samme type i alle row groups:
+
+    - Heltal og kommatal bliver til NumPy-arrays, hvis NumPy er installeret, og ellers ``array.array``.
+    - DECIMAL bliver til en liste af ``decimal.Decimal``, så værdierne er præcis de samme som i databasen.
+    - DATE og DATETIME bliver til ``datetime64[D]`` og ``datetime64[us]`` med NumPy og ellers heltal som i filen.
+      TIME bliver til ``timedelta64[us]`` hhv. heltal.
+    - Tekst bliver til en ``StringColumn`` og alt andet til en liste.
+
+    NULL står som ``0``, tom tekst eller ``nan`` i kolonnen og angives i stedet i en maske for hver kolonne (se ``null_mask()``).
+
+    :param filename: Stien til filen.
+        *Påkrævet*.
+    :type filename: str
+
+    :return: En generator, der for hver row group giver en tuple bestående af en dict med kolonnerne
+        og en dict med en maske for hver kolonne, der angiver hvilke værdier der er NULL (``None``, hvis ingen er NULL).
+    :rtype: Iterator[tuple[dict[str, numpy.ndarray | array.array | StringColumn | list], dict[str, numpy.ndarray | list[bool] | None]]]
+
+    :raises ValueError: Hvis filen ikke er en kolonnefil, eller dens version er ukendt.
+    """
+    with open(filename, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{filename}' er ikke en kolonnefil.")
+        version, header_length = struct.unpack("<BI", file.read(5))
+        if version != VERSION:
+            raise ValueError(f"Kolonnefilen '{filename}' har den ukendte version {version}.")
+        header = json.loads(file.read(header_length))
+
+        while count := file.read(4):
+            rows, = struct.unpack("<I", count)
+            group, nulls = {}, {}
+            for name, _, column_encoding in header["columns"]:
+                length, = struct.unpack("<Q", file.read(8))
+                payload = zlib.decompress(file.read(length))
+                if payload[0]:
+                    bitmap = payload[1:1 + (rows + 7) // 8]
+                    nulls[name] = _mask([not bitmap[index // 8] >> (index % 8) & 1 for index in range(rows)])
+                    payload = payload[1 + len(bitmap):]
+                else:
+                    nulls[name] = None
+                    payload = payload[1:]
+                group[name] = _decode(column_encoding, payload, rows)
+            yield group, nulls
+
+def _decode(column_encoding: str, payload: bytes, rows: int) -> object:
+    """
+    Laver bytes fra ``_encode()`` om til en kolonne igen.
+    """
+    kind, _, argument = column_encoding.partition(':')
+    if kind == "json":
+        return json.loads(payload)
+    if kind == "str":
+        length, = struct.unpack("<Q", payload[:8])
+        column = StringColumn(())
+        column.offsets = _array('Q', payload[8:8 + length])
+        column.data = bytearray(payload[8 + length:])
+        return column
+    if kind == "decimal":
+        return [decimal.Decimal(value).scaleb(-int(argument)) for value in _array('q', payload)]
+
+    typecode = argument if kind == "int" else 'q'
+    if numpy is None:
+        return _array(typecode, payload)
+    values = numpy.frombuffer(payload, dtype=ARRAY_DTYPES[typecode], count=rows).copy()
+    units = {"date": "datetime64[D]", "datetime": "datetime64[us]", "time": "timedelta64[us]"}
+    return values.view(units[kind]) if kind in units else values
+
+def _array(typecode: str, payload: bytes) -> array.array:
+    values = array.array(typecode)
+    values.frombytes(payload)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
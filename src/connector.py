@@ -1,5 +1,13 @@
 import mysql.connector
+import mysql.connector.pooling
+import contextlib
 import getpass
+import threading
+import time
+from collections.abc import Iterator
+
+# Antal sekunder, en forbindelse fra puljen må have ligget ubrugt, før den tjekkes med ping, inden den lånes ud
+POOL_PING_AFTER = 30
 
 # TODO: Kan i fremtiden udvides til også at benyttes til andre servere end localhost
 # TODO: Tilføj måde at prøve login igen, hvis forbindelse ikke kunne oprettes pga. forkert logininfo
@@ -18,12 +26,26 @@ class DatabaseConnector:
         Er dette navn tomt, oprettes forbindelsen uden noget specifikt mål.
         *Upåkrævet*. Standardværdi: ``''``
     :type database: str
+    :param local_infile: Bestemmer, om klienten må sende lokale filer til serveren med ``LOAD DATA LOCAL INFILE``.
+        *Upåkrævet*. Standardværdi: ``False``
+    :type local_infile: bool
+    :param pool_size: Antallet af forbindelser til databasen, der holdes klar i en pool.
+        Er den ``0``, bruges én almindelig forbindelse. Med en pool kan objektet deles mellem flere tråde,
+        og antallet af forbindelser til serveren er aldrig større end puljens størrelse.
+        *Upåkrævet*. Standardværdi: ``0``
+    :type pool_size: int
+    :param pool_timeout: Antal sekunder, der højst ventes på en ledig forbindelse fra puljen.
+        *Upåkrævet*. Standardværdi: ``30``
+    :type pool_timeout: float
     """
 
     def __init__(self,
         username: str = '',
         password: str = '',
-        database: str = ''
+        database: str = '',
+        local_infile: bool = False,
+        pool_size: int = 0,
+        pool_timeout: float = 30
     ) -> None:
         """
         Konstruktøren af connector-objektet.
@@ -50,15 +72,33 @@ class DatabaseConnector:
         else:
             self.database = database
 
+        # Skal kendes, inden forbindelserne oprettes
+        self.local_infile = local_infile
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        # Forbindelser, der er reserveret til den enkelte tråd (se ._reserve())
+        self._local = threading.local()
+        # Ledige pladser i puljen, så der kan ventes på en forbindelse uden at spørge puljen igen og igen
+        self._pool_slots = threading.BoundedSemaphore(pool_size) if pool_size else None
+        # Hvornår hver forbindelse i puljen sidst blev givet tilbage (efter forbindelsens id på serveren)
+        self._last_used: dict[int, float] = {}
+        self._pool_created = time.monotonic()
+        # Sættes af .logout(), så lånte forbindelser lukkes i stedet for at blive givet tilbage
+        self._logged_out = False
+
         # Forsøger at oprette forbindelser
         self._first_login(password)
 
-    def _login(self, password: str, db: bool = True) -> mysql.connector.MySQLConnection | bool:
+    def _login(self,
+        password: str,
+        db: bool = True
+    ) -> mysql.connector.MySQLConnection | mysql.connector.pooling.MySQLConnectionPool | bool:
         """
         Opretter forbindelse til en database.
 
         Bruger oplysningerne angivet ved connectorens oprettelse til at logge ind
         og oprette en forbindelse til en database, eller evt. direkte uden specifikt mål.
+        Er ``pool_size`` sat, oprettes i stedet en pool af forbindelser til databasen.
 
         :param password: Adgangskoden til forbindelsen, der ønskes oprettet.
             *Påkrævet*.
@@ -69,13 +109,16 @@ class DatabaseConnector:
 
         :return: Forbindelsen til en database, eller en direkte forbindelse.
         :rtype: mysql.connector.MySQLConnection
+        :return: En pool af forbindelser til databasen, hvis ``pool_size`` er sat.
+        :rtype: mysql.connector.pooling.MySQLConnectionPool
         :return: En forbindelse kunne ikke oprettes.
         :rtype: bool: ``False``
         """
         login_params = {
             "user": self.username,
             "password": password,
-            "host": "localhost"
+            "host": "localhost",
+            "allow_local_infile": self.local_infile
         }
         # Tilføj kun specifik database, hvis den er defineret
         if db:
@@ -83,7 +126,15 @@ class DatabaseConnector:
 
         try:
             # Dict udpakkes og bruges som keyword-parametre i oprettelse af forbindelsen
-            connection = mysql.connector.connect(**login_params)
+            if db and self.pool_size:
+                # Puljen nulstiller sessionen, når en forbindelse gives tilbage
+                connection = mysql.connector.pooling.MySQLConnectionPool(
+                    pool_size=self.pool_size,
+                    pool_reset_session=True,
+                    **login_params
+                )
+            else:
+                connection = mysql.connector.connect(**login_params)
         except Exception as err:
             print("FEJL: Kunne ikke oprette forbindelsen. Følgende fejl opstod:\n    ", err)
             return False
@@ -105,6 +156,129 @@ class DatabaseConnector:
             self.connection = self._login(password, db=True)
             if self.connection:
                 print(f"SUCCES: Forbundet til databasen '{self.database}'.")
+                if self.pooled:
+                    print(f"SUCCES: Oprettede en pool med {self.pool_size} forbindelser til databasen.")
+
+    @property
+    def pooled(self) -> bool:
+        """
+        Om forbindelserne til databasen hentes fra en pool.
+        """
+        return isinstance(getattr(self, "connection", None), mysql.connector.pooling.MySQLConnectionPool)
+
+    @contextlib.contextmanager
+    def _checkout(self, db: bool = True) -> Iterator[mysql.connector.MySQLConnection]:
+        """
+        Låner en forbindelse, så længe with-blokken varer.
+
+        Uden pool er det altid den samme forbindelse. Med pool hentes en ledig forbindelse,
+        som gives tilbage til puljen bagefter. Har tråden reserveret en forbindelse med ``._reserve()``,
+        bruges den i stedet.
+
+        :param db: Bestemmer, om det er en forbindelse til databasen eller den direkte forbindelse.
+            *Upåkrævet*. Standardværdi: ``True``
+        :type db: bool
+
+        :return: Forbindelsen, der kan bruges i with-blokken.
+        :rtype: Iterator[mysql.connector.MySQLConnection]
+        """
+        reserved = getattr(self._local, "connection", None)
+        if not db:
+            yield self.direct_connection
+        elif reserved is not None:
+            yield reserved
+        elif not self.pooled:
+            yield self.connection
+        else:
+            connection = self._get_pooled()
+            try:
+                yield connection
+            finally:
+                self._release(connection)
+                self._return_pooled(connection)
+
+    def _release(self, connection: mysql.connector.MySQLConnection) -> None:
+        """
+        Kaldes, lige inden en forbindelse gives tilbage til puljen.
+
+        Gør intet her, men kan udvides af nedarvede klasser,
+        der gemmer tilstand for den enkelte forbindelse.
+
+        :param connection: Forbindelsen, der gives tilbage.
+            *Påkrævet*.
+        :type connection: mysql.connector.MySQLConnection
+        """
+        pass
+
+    @contextlib.contextmanager
+    def _reserve(self) -> Iterator[mysql.connector.MySQLConnection]:
+        """
+        Reserverer én forbindelse til den nuværende tråd, så længe with-blokken varer.
+
+        Alle queries i blokken køres dermed på samme forbindelse,
+        hvilket er nødvendigt, hvis ændringerne først skal committes til sidst.
+
+        :return: Den reserverede forbindelse.
+        :rtype: Iterator[mysql.connector.MySQLConnection]
+        """
+        # Allerede reserveret (f.eks. i en ydre with-blok)
+        if getattr(self._local, "connection", None) is not None:
+            yield self._local.connection
+            return
+        with self._checkout() as connection:
+            self._local.connection = connection
+            try:
+                yield connection
+            finally:
+                self._local.connection = None
+
+    def _get_pooled(self) -> mysql.connector.pooling.PooledMySQLConnection:
+        """
+        Henter en ledig og fungerende forbindelse fra puljen.
+
+        Er alle forbindelser i brug, ventes der op til ``pool_timeout`` sekunder på, at en bliver ledig.
+        En forbindelse, der har ligget ubrugt i mere end ``POOL_PING_AFTER`` sekunder, tjekkes først med ping.
+        Puljen nulstiller sessionen, når en forbindelse gives tilbage, så den er ren, når den lånes ud igen.
+
+        :return: En forbindelse fra puljen.
+        :rtype: mysql.connector.pooling.PooledMySQLConnection
+
+        :raises mysql.connector.errors.PoolError: Hvis ingen forbindelse bliver ledig inden for ``pool_timeout`` sekunder.
+        """
+        if not self._pool_slots.acquire(timeout=self.pool_timeout):
+            raise mysql.connector.errors.PoolError("Ingen ledig forbindelse i puljen inden for pool_timeout")
+        try:
+            connection = self.connection.get_connection()
+            # Sundhedstjek: genopretter forbindelsen, hvis serveren har lukket den, mens den lå ubrugt
+            idle = time.monotonic() - self._last_used.pop(connection.connection_id, self._pool_created)
+            if idle > POOL_PING_AFTER:
+                try:
+                    connection.ping(reconnect=True, attempts=1)
+                except Exception:
+                    connection.close()
+                    raise
+        except Exception:
+            self._pool_slots.release()
+            raise
+        return connection
+
+    def _return_pooled(self, connection: mysql.connector.pooling.PooledMySQLConnection) -> None:
+        """
+        Giver en lånt forbindelse tilbage til puljen, eller lukker den, hvis objektet er logget ud. Se ``.logout()``.
+
+        :param connection: Forbindelsen, der gives tilbage.
+            *Påkrævet*.
+        :type connection: mysql.connector.pooling.PooledMySQLConnection
+        """
+        try:
+            if self._logged_out:
+                with contextlib.suppress(Exception):
+                    connection.disconnect()
+            else:
+                self._last_used[connection.connection_id] = time.monotonic()
+                connection.close()
+        finally:
+            self._pool_slots.release()
 
     def login(self) -> None:
         """
@@ -114,7 +288,16 @@ class DatabaseConnector:
         # Forbindelserne beholder deres indstillinger, så man kan let genåbne dem igen.
         try:
             self.direct_connection.connect()
-            self.connection.connect()
+            if self.pooled:
+                self._logged_out = False
+                self._last_used.clear()
+                self._pool_created = time.monotonic()
+                # Fylder puljen op igen med nye forbindelser, indtil den er fuld
+                with contextlib.suppress(mysql.connector.errors.PoolError):
+                    for _ in range(self.pool_size):
+                        self.connection.add_connection()
+            else:
+                self.connection.connect()
         except Exception as err:
             print("FEJL: Kunne ikke genoprette forbindelsen. Følgende fejl opstod:\n    ", err)
         else:
@@ -123,8 +306,23 @@ class DatabaseConnector:
     def logout(self) -> None:
         """
         Lukker forbindelserne til database og server.
+
+        Med en pool lukkes de ledige forbindelser med det samme.
+        Forbindelser, som andre tråde har lånt, lukkes, når de gives tilbage, i stedet for at komme tilbage i puljen.
         """
-        self.connection.close()
+        if self.pooled:
+            self._logged_out = True
+            # Lukker de ledige forbindelser i puljen ved at låne dem alle og lukke dem.
+            # De gives ikke tilbage, og .login() fylder puljen op med nye forbindelser igen
+            while True:
+                try:
+                    connection = self.connection.get_connection()
+                except Exception:
+                    break
+                with contextlib.suppress(Exception):
+                    connection.disconnect()
+        else:
+            self.connection.close()
         print(f"SUCCES: Lukkede forbindelsen til databasen '{self.database}'.")
         self.direct_connection.close()
         print("SUCCES: Lukkede forbindelsen til serveren.")
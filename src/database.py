@@ -1,10 +1,55 @@
 import util
+import cache
+import columns
 import connector
+import metrics
+import query
+import sql
 import getpass
-# import datetime
+import collections
+import concurrent.futures
+import contextlib
+import csv
+import datetime
+import itertools
+import json
+import os.path
+import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
 # import decimal
 
-class Database(connector.DatabaseConnector):
+# INSERT-queries, som mysql.connector kan samle til ét query med mange rækker i .executemany()
+INSERT_VALUES = re.compile(r"\s*INSERT\b.*\bVALUES\b", re.IGNORECASE | re.DOTALL)
+
+# Previews venter på input fra den samme terminal, så tråde (f.eks. ved parallel indlæsning) må vise ét ad gangen
+PREVIEW_LOCK = threading.Lock()
+# Aggregeringsfunktionerne, der kan bruges i .aggregate()
+AGGREGATE_FUNCTIONS = ("COUNT", "COUNT DISTINCT", "SUM", "AVG", "MIN", "MAX")
+# Tabellen, hvori .materialize() gemmer definitionen af hver materialiseret tabel, og måderne, de kan genopfriskes på
+MATERIALIZED_TABLE = "_materialized"
+MATERIALIZED_QUERY = f"""CREATE TABLE IF NOT EXISTS `{MATERIALIZED_TABLE}` (
+    `name` VARCHAR(64) NOT NULL PRIMARY KEY,
+    `definition` TEXT NOT NULL,
+    `refreshed_at` DATETIME NOT NULL
+)"""
+REFRESH_MODES = ("full", "incremental")
+# Formaterne, som .export() kan skrive
+EXPORT_FORMATS = ("csv", "columnar")
+# Tabellen, hvori .load(incremental=True) gemmer, hvor langt hver fil er indlæst
+LOAD_STATE_TABLE = "_load_state"
+LOAD_STATE_QUERY = f"""CREATE TABLE IF NOT EXISTS `{LOAD_STATE_TABLE}` (
+    `file` VARCHAR(512) NOT NULL PRIMARY KEY,
+    `table_name` VARCHAR(64) NOT NULL,
+    `byte_offset` BIGINT UNSIGNED NOT NULL,
+    `last_key` VARCHAR(255) NOT NULL,
+    `prefix_hash` CHAR(64) NOT NULL,
+    `row_count` BIGINT UNSIGNED NOT NULL,
+    `loaded_at` DATETIME NOT NULL
+)"""
+
+class Database(connector.DatabaseConnector, sql.SqlBuilder):
     """
     Et objekt, der er forbundet til en MySQL-instans og som regel en database heri,
     og som kan interagere med databasen og tabellerne, som den indeholder.
@@ -25,13 +70,61 @@ class Database(connector.DatabaseConnector):
     :param preview: Bestemmer, om queries skal forhåndsvises inden eksekvering.
         *Upåkrævet*. Standardværdi: ``True``
     :type preview: bool
+    :param local_infile: Bestemmer, om filer må indlæses direkte af serveren med ``LOAD DATA LOCAL INFILE``.
+        *Upåkrævet*. Standardværdi: ``False``
+    :type local_infile: bool
+    :param pool_size: Antallet af forbindelser i en pool, som objektets queries fordeles på.
+        Er den ``0``, bruges én almindelig forbindelse.
+        *Upåkrævet*. Standardværdi: ``0``
+    :type pool_size: int
+    :param pool_timeout: Antal sekunder, der højst ventes på en ledig forbindelse fra puljen.
+        *Upåkrævet*. Standardværdi: ``30``
+    :type pool_timeout: float
+    :param prepared: Bestemmer, om læsninger og indsættelser køres som server-side prepared statements,
+        som gemmes og genbruges for hver forbindelse.
+        Med en pool nulstilles sessionen, når en forbindelse gives tilbage, hvilket også fjerner dens statements.
+        Derfor genbruges de kun inden for ``.transaction()`` og ``._reserve()``, og enkeltstående queries køres almindeligt.
+        *Upåkrævet*. Standardværdi: ``False``
+    :type prepared: bool
+    :param statement_cache_size: Det maksimale antal prepared statements, der gemmes for hver forbindelse.
+        Når grænsen nås, lukkes det mindst nyligt brugte.
+        *Upåkrævet*. Standardværdi: ``32``
+    :type statement_cache_size: int
+    :param result_cache: Det omtrentlige antal bytes, som gemte resultater af ``.read()`` må fylde.
+        Er den ``0``, gemmes resultaterne ikke.
+        *Upåkrævet*. Standardværdi: ``0``
+    :type result_cache: int
+    :param result_ttl: Antal sekunder, et gemt resultat af ``.read()`` må genbruges.
+        *Upåkrævet*. Standardværdi: ``60``
+    :type result_ttl: float
+    :param query_metrics: Bestemmer, om hvert query måles (tid, round trips, rækker og kaldende metode).
+        Målingerne kan ses med ``.metrics_info()`` eller gemmes med ``.metrics.export()``.
+        *Upåkrævet*. Standardværdi: ``False``
+    :type query_metrics: bool
+    :param slow_log: Stien til en fil, som langsomme queries skrives i. Slår også målingerne til.
+        Er den tom, skrives der ikke nogen log.
+        *Upåkrævet*. Standardværdi: ``''``
+    :type slow_log: str
+    :param slow_query_time: Antal sekunder, et query mindst skal tage for at blive skrevet i ``slow_log``.
+        *Upåkrævet*. Standardværdi: ``1.0``
+    :type slow_query_time: float
     """
     def __init__(self,
         username: str = '',
         password: str = '',
         database: str = '',
         init_load: list[str] = [],
-        preview: bool = True
+        preview: bool = True,
+        local_infile: bool = False,
+        pool_size: int = 0,
+        pool_timeout: float = 30,
+        prepared: bool = False,
+        statement_cache_size: int = 32,
+        result_cache: int = 0,
+        result_ttl: float = 60,
+        query_metrics: bool = False,
+        slow_log: str = '',
+        slow_query_time: float = 1.0
     ) -> None:
         """
         Konstruktøren af database-objektet.
@@ -52,11 +145,67 @@ class Database(connector.DatabaseConnector):
         :param preview: Bestemmer, om queries skal forhåndsvises inden eksekvering.
             *Upåkrævet*. Standardværdi: ``True``
         :type preview: bool
+        :param local_infile: Bestemmer, om filer må indlæses direkte af serveren med ``LOAD DATA LOCAL INFILE``.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type local_infile: bool
+        :param pool_size: Antallet af forbindelser i en pool, som objektets queries fordeles på.
+            Er den ``0``, bruges én almindelig forbindelse.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type pool_size: int
+        :param pool_timeout: Antal sekunder, der højst ventes på en ledig forbindelse fra puljen.
+            *Upåkrævet*. Standardværdi: ``30``
+        :type pool_timeout: float
+        :param prepared: Bestemmer, om læsninger og indsættelser køres som server-side prepared statements,
+            som gemmes og genbruges for hver forbindelse.
+            Med en pool nulstilles sessionen, når en forbindelse gives tilbage, hvilket også fjerner dens statements.
+            Derfor genbruges de kun inden for ``.transaction()`` og ``._reserve()``, og enkeltstående queries køres almindeligt.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type prepared: bool
+        :param statement_cache_size: Det maksimale antal prepared statements, der gemmes for hver forbindelse.
+            Når grænsen nås, lukkes det mindst nyligt brugte.
+            *Upåkrævet*. Standardværdi: ``32``
+        :type statement_cache_size: int
+        :param result_cache: Det omtrentlige antal bytes, som gemte resultater af ``.read()`` må fylde.
+            Er den ``0``, gemmes resultaterne ikke.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type result_cache: int
+        :param result_ttl: Antal sekunder, et gemt resultat af ``.read()`` må genbruges.
+            *Upåkrævet*. Standardværdi: ``60``
+        :type result_ttl: float
+        :param query_metrics: Bestemmer, om hvert query måles (tid, round trips, rækker og kaldende metode).
+            Målingerne kan ses med ``.metrics_info()`` eller gemmes med ``.metrics.export()``.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type query_metrics: bool
+        :param slow_log: Stien til en fil, som langsomme queries skrives i. Slår også målingerne til.
+            Er den tom, skrives der ikke nogen log.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type slow_log: str
+        :param slow_query_time: Antal sekunder, et query mindst skal tage for at blive skrevet i ``slow_log``.
+            *Upåkrævet*. Standardværdi: ``1.0``
+        :type slow_query_time: float
         """
         # Konfiguration
         self.preview = preview
+        # Cache over tabellernes opbygning (DESCRIBE) og databasens tabeller (SHOW TABLES, nøglen '')
+        self._schema: dict[str, list[tuple]] = {}
+        # Prepared statements for hver forbindelse, i rækkefølge efter seneste brug (LRU)
+        self.prepared = prepared
+        self.statement_cache_size = statement_cache_size
+        self._statements: dict[int, collections.OrderedDict[str, tuple]] = {}
+        self._statement_hits = 0
+        self._statement_misses = 0
+        # Forbindelserne lånes af flere tråde fra puljen, som deler cachen og dens tællere
+        self._statements_lock = threading.Lock()
+        # Gemte resultater af .read(), som ryddes, når de læste tabeller ændres
+        self._results = cache.ResultCache(result_cache, result_ttl) if result_cache else None
+        # Kompilerede SELECT-queries fra .compile(), gemt efter deres beskrivelse (LRU)
+        self.query_cache_size = 256
+        self._queries: collections.OrderedDict[tuple, query.Query] = collections.OrderedDict()
+        self._queries_lock = threading.Lock()
+        # Målinger af hvert query, hvis de er slået til
+        self.metrics = metrics.QueryMetrics(slow_log, slow_query_time) if query_metrics or slow_log else None
         # Initialiserer connectoren
-        super().__init__(username, password, database)
+        super().__init__(username, password, database, local_infile, pool_size, pool_timeout)
 
         # Hvis forbindelsen ikke kan skabes (f.eks. fordi det angivne databasenavn ikke eksisterer),
         # kan brugeren forsøge at oprette en database med navnet
@@ -68,6 +217,7 @@ class Database(connector.DatabaseConnector):
                 self._first_login(getpass.getpass("Indtast adgangskode igen: "))
 
         # Loader tabeller til databasen fra start, hvis nogen oplyses
+        # (én fil ad gangen; parallel indlæsning kræver et eksplicit kald til .load() med parallel)
         if self.connection and init_load:
             self.load(*init_load)
 
@@ -76,7 +226,11 @@ class Database(connector.DatabaseConnector):
         params: dict[str] | list[dict[str]] = {},
         db: bool = True,
         read: bool = False,
-    ) -> bool | list[tuple]:
+        commit: bool = True,
+        prepared: bool = False,
+        count: bool = False,
+        api: str = ''
+    ) -> bool | int | list[tuple]:
         """
         Eksekverer et SQL-query.
 
@@ -98,42 +252,345 @@ class Database(connector.DatabaseConnector):
             så data kan læses og fetches fra databasen.
             *Upåkrævet*. Standardværdi: ``False``
         :type read: bool
+        :param commit: Bestemmer, om ændringerne committes med det samme.
+            Er den ``False``, skal ``._commit()`` eller ``._rollback()`` kaldes bagefter
+            på samme forbindelse, dvs. inden for en ``._reserve()``-blok, hvis objektet bruger en pool.
+            *Upåkrævet*. Standardværdi: ``True``
+        :type commit: bool
+        :param prepared: Bestemmer, om queriet køres som et prepared statement,
+            der gemmes og genbruges næste gang, samme query køres på forbindelsen.
+            Ignoreres for en forbindelse fra puljen, som ikke er reserveret, da statementet alligevel ikke kan genbruges.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type prepared: bool
+        :param count: Bestemmer, om antallet af berørte rækker returneres i stedet for ``True``.
+            Da antallet kan være ``0``, skal en fejl i så fald tjekkes med ``is False``.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type count: bool
+        :param api: Navnet på den offentlige metode, f.eks. ``"read"``, som målingen af queriet registreres under.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type api: str
 
         :return: Queriet kunne eksekveres, og handlingen blev gennemført problemfrit.
         :rtype: bool: ``True``
+        :return: Antallet af berørte rækker, hvis ``count`` er ``True``.
+        :rtype: int
         :return: Handlingen kunne ikke gennemføres.
         :rtype: bool: ``False``
         :return: Den læste data fra databasen, hvis en READ-operation kunne gennemføres.
         :rtype: list[tuple]
         """
-        connection = self.connection if db else self.direct_connection
+        # Målingerne af queriet (kun hvis de er slået til)
+        started = time.perf_counter() if self.metrics is not None else 0
+        round_trips = rows = 0
+        # En lånt forbindelse fra puljen mister sine statements, når den gives tilbage, så et prepared statement
+        # ville koste en ekstra forberedelse og lukning. Kun en reserveret forbindelse kan genbruge dem
+        if prepared and db and self.pooled and getattr(self._local, "connection", None) is None:
+            prepared = False
+        error = ''
         try:
-            with connection.cursor(buffered=True if read else False) as cursor:
-                # Hvis 'params' er en liste, køres queriet for hver gruppe 'params'
-                if isinstance(params, list):
-                    cursor.executemany(query, params)
-                # Ellers køres queriet kun én gang
+            # Låner en forbindelse (fra puljen, hvis objektet bruger en pool)
+            with self._checkout(db) as connection:
+                if prepared:
+                    result, rows, new = self._execute_prepared(connection, query, params, read)
+                    # Et nyt statement skal først forberedes på serveren
+                    round_trips += (len(params) if isinstance(params, list) else 1) + new
                 else:
-                    cursor.execute(query, params)
-            # Committer evt. ændringer i tabeller eller data
-            connection.commit()
-            # .__exit__() er implementeret for cursoren i mysql.connector,
-            # så denne behøves ikke lukkes manuelt, når with-blokke bruges
-
-            # Hvis i læsetilstand, returneres den læste data
-            if read:
-                return cursor.fetchall()
+                    with connection.cursor(buffered=True if read else False) as cursor:
+                        # Hvis 'params' er en liste, køres queriet for hver gruppe 'params'
+                        if isinstance(params, list):
+                            cursor.executemany(query, params)
+                            # mysql.connector samler INSERT ... VALUES til ét query med mange rækker
+                            round_trips += 1 if INSERT_VALUES.match(query) else len(params)
+                        # Ellers køres queriet kun én gang
+                        else:
+                            cursor.execute(query, params)
+                            round_trips += 1
+                        result = cursor.fetchall() if read else True
+                        rows = len(result) if read else max(cursor.rowcount, 0)
+                # Committer evt. ændringer i tabeller eller data
+                # (i en transaktion committes databaseforbindelsen først, når transaktionen er færdig)
+                if commit and not (db and self._in_transaction()):
+                    connection.commit()
+                    round_trips += 1
+                # .__exit__() er implementeret for cursoren i mysql.connector,
+                # så denne behøves ikke lukkes manuelt, når with-blokke bruges
+
+                # Hvis i læsetilstand, returneres den læste data
+                if read:
+                    return result
+                if count:
+                    return rows
         except Exception as err:
+            error = str(err)
             print(f"FEJL: Kunne ikke udføre handlingen. Følgende fejl opstod:\n    ", err)
+            # Et query, der fejler i en transaktion, får transaktionen (eller savepointet) til at blive rullet tilbage
+            if db and self._in_transaction():
+                self._local.transaction[-1] = True
             return False
         else:
             return True
+        finally:
+            if self.metrics is not None:
+                self.metrics.record(query, api, time.perf_counter() - started, round_trips, rows, error)
+
+    def metrics_info(self) -> dict:
+        """
+        Viser de samlede målinger af objektets queries. Se ``metrics.QueryMetrics.snapshot()``.
+
+        :return: En dict med tællere og histogrammer for hvert fingeraftryk og hver metode.
+            Tom, hvis målingerne ikke er slået til.
+        :rtype: dict
+        """
+        return self.metrics.snapshot() if self.metrics is not None else {}
+
+    def _execute_prepared(self,
+        connection,
+        query: str,
+        params: dict[str] | list[dict[str]],
+        read: bool = False
+    ) -> tuple[bool | list[tuple], int, bool]:
+        """
+        Eksekverer et query som et prepared statement, der genbruges, hvis det allerede er forberedt på forbindelsen.
+
+        :param connection: Forbindelsen, som queriet køres på.
+            *Påkrævet*.
+        :type connection: mysql.connector.MySQLConnection
+        :param query: Queriet, der skal eksekveres.
+            *Påkrævet*.
+        :type query: str
+        :param params: En dict eller liste af dicts med parametrene til queriet.
+            *Påkrævet*.
+        :type params: dict[str] | list[dict[str]]
+        :param read: Bestemmer, om resultatet skal læses og returneres.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type read: bool
+
+        :return: En tuple bestående af den læste data, hvis ``read`` er ``True``, ellers ``True``,
+            antallet af læste eller berørte rækker og om statementet blev forberedt på serveren nu.
+        :rtype: tuple[bool | list[tuple], int, bool]
+        """
+        (cursor, operation, names), new = self._statement(connection, query)
+        try:
+            # Prepared statements tager kun positionelle parametre
+            if isinstance(params, list):
+                cursor.executemany(operation, [tuple(param[name] for name in names) for param in params])
+            else:
+                cursor.execute(operation, tuple(params[name] for name in names))
+            if read:
+                result = cursor.fetchall()
+                return result, len(result), new
+            return True, max(cursor.rowcount, 0), new
+        except Exception:
+            # Et statement, der fejlede, gemmes ikke
+            with self._statements_lock:
+                self._statements.get(self._connection_key(connection), {}).pop(query, None)
+            cursor.close()
+            raise
+
+    def _statement(self, connection, query: str) -> tuple[tuple, bool]:
+        """
+        Henter et prepared statement fra forbindelsens cache eller forbereder et nyt.
+
+        Cursoren gemmes sammen med queriet, omskrevet fra ``%(navn)s`` til ``?``.
+        mysql.connector genbruger kun det forberedte statement, når præcis det samme tekstobjekt køres igen,
+        og derfor gemmes det omskrevne query i stedet for at blive dannet ved hver eksekvering.
+
+        :param connection: Forbindelsen, som statementet hører til.
+            *Påkrævet*.
+        :type connection: mysql.connector.MySQLConnection
+        :param query: Queriet med parametre på formen ``%(navn)s``.
+            *Påkrævet*.
+        :type query: str
+
+        :return: En tuple bestående af en tuple med cursoren, det omskrevne query og parametrenes navne i rækkefølge,
+            og om statementet er nyt.
+        :rtype: tuple[tuple, bool]
+        """
+        with self._statements_lock:
+            statements = self._statements.setdefault(self._connection_key(connection), collections.OrderedDict())
+            if query in statements:
+                self._statement_hits += 1
+                statements.move_to_end(query)
+                return statements[query], False
+
+            self._statement_misses += 1
+            names = re.findall(r"%\((.*?)\)s", query)
+            operation = re.sub(r"%\((.*?)\)s", '?', query)
+            statement = statements[query] = (connection.cursor(prepared=True), operation, names)
+            # Det mindst nyligt brugte statement lukkes, så serveren kan frigive det
+            old_cursor = statements.popitem(last=False)[1][0] if len(statements) > self.statement_cache_size else None
+        if old_cursor is not None:
+            old_cursor.close()
+        return statement, True
+
+    def _connection_key(self, connection) -> int:
+        """
+        Finder en nøgle for den underliggende forbindelse.
+
+        Forbindelser fra en pool er pakket ind i et nyt objekt, hver gang de lånes,
+        så nøglen tages fra den underliggende forbindelse.
+        """
+        return id(getattr(connection, "_cnx", connection))
+
+    def _release(self, connection) -> None:
+        """
+        Glemmer forbindelsens prepared statements, inden den gives tilbage til puljen.
+
+        Puljen nulstiller sessionen, hvilket også fjerner forbindelsens prepared statements på serveren.
+        """
+        with self._statements_lock:
+            statements = self._statements.pop(self._connection_key(connection), {})
+        for cursor, *_ in statements.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    def statement_cache_info(self) -> dict[str, int]:
+        """
+        Viser statistik for cachen af prepared statements.
+
+        :return: En dict med antal hits, misses og gemte statements.
+        :rtype: dict[str, int]
+        """
+        with self._statements_lock:
+            return {
+                "hits": self._statement_hits,
+                "misses": self._statement_misses,
+                "size": sum(len(statements) for statements in self._statements.values())
+            }
+
+    def logout(self) -> None:
+        """
+        Lukker forbindelserne til database og server.
+
+        Forbindelsernes prepared statements lukkes først, da de ikke overlever en ny forbindelse.
+        """
+        with self._statements_lock:
+            connections, self._statements = self._statements, {}
+        for statements in connections.values():
+            for cursor, *_ in statements.values():
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+        super().logout()
+
+    def _commit(self, db: bool = True) -> bool:
+        """
+        Committer ændringer fra queries, der er eksekveret med ``commit=False``.
+
+        I en transaktion (se ``.transaction()``) venter committet på, at transaktionen er færdig.
+
+        :param db: Bestemmer, om det er databaseforbindelsen eller den direkte forbindelse, der committes.
+            *Upåkrævet*. Standardværdi: ``True``
+        :type db: bool
+
+        :return: Om ændringerne blev committet.
+        :rtype: bool
+        """
+        if db and self._in_transaction():
+            return True
+        try:
+            with self._checkout(db) as connection:
+                connection.commit()
+        except Exception as err:
+            print(f"FEJL: Kunne ikke committe ændringerne. Følgende fejl opstod:\n    ", err)
+            return False
+        return True
+
+    def _rollback(self, db: bool = True) -> None:
+        """
+        Ruller ændringer, der endnu ikke er committet, tilbage.
+
+        I en transaktion (se ``.transaction()``) markeres transaktionen i stedet som fejlet,
+        så den rulles tilbage, når den er færdig.
+
+        :param db: Bestemmer, om det er databaseforbindelsen eller den direkte forbindelse, der rulles tilbage.
+            *Upåkrævet*. Standardværdi: ``True``
+        :type db: bool
+        """
+        if db and self._in_transaction():
+            self._local.transaction[-1] = True
+            return
+        try:
+            with self._checkout(db) as connection:
+                connection.rollback()
+        except Exception as err:
+            print(f"FEJL: Kunne ikke rulle ændringerne tilbage. Følgende fejl opstod:\n    ", err)
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Samler alle ændringer i with-blokken i én transaktion, som committes én gang til sidst.
+
+        Alle queries i blokken køres på samme forbindelse, og de enkelte metoder committer ikke selv.
+        Opstår der en exception i blokken, eller fejler et query, rulles alle ændringerne tilbage.
+        Transaktioner kan indlejres i hinanden: En indre transaktion bliver til et ``SAVEPOINT``,
+        så kun den indre bloks ændringer rulles tilbage, hvis den fejler.
+
+        NB! MySQL committer automatisk ved ændringer af tabellernes opbygning (f.eks. ``CREATE TABLE``,
+        ``ALTER TABLE`` og ``DROP TABLE``), så de kan ikke rulles tilbage. Det kan indsatte og ændrede data.
+
+        Eksempel::
+
+            with db.transaction():
+                db.insert(data, "customers")
+                db.insert(more_data, "orders")
+
+        :return: En context manager, der committer eller ruller tilbage, når blokken er færdig.
+        :rtype: Iterator[None]
+        """
+        with self._reserve() as connection:
+            if not hasattr(self._local, "transaction"):
+                self._local.transaction = []
+            # For hvert niveau gemmes, om der er sket en fejl
+            levels: list[bool] = self._local.transaction
+            savepoint = f"savepoint_{len(levels)}" if levels else ''
+            if savepoint:
+                self._execute(f"SAVEPOINT `{savepoint}`", api="transaction")
+            levels.append(False)
+            try:
+                yield
+            except BaseException:
+                levels[-1] = True
+                raise
+            finally:
+                failed = levels.pop()
+                if savepoint:
+                    if failed:
+                        self._execute(f"ROLLBACK TO SAVEPOINT `{savepoint}`", api="transaction")
+                        print(f"FEJL: Ændringerne siden '{savepoint}' blev rullet tilbage.")
+                    else:
+                        self._execute(f"RELEASE SAVEPOINT `{savepoint}`", api="transaction")
+                else:
+                    try:
+                        if failed:
+                            connection.rollback()
+                            print("FEJL: Transaktionen blev rullet tilbage.")
+                        else:
+                            connection.commit()
+                            print("SUCCES: Transaktionen blev committet.")
+                    except Exception as err:
+                        print(f"FEJL: Kunne ikke afslutte transaktionen. Følgende fejl opstod:\n    ", err)
+                    # Andre tråde kan have læst og gemt data, mens ændringerne ikke var committet
+                    self._invalidate_results()
+
+    def _in_transaction(self) -> bool:
+        """
+        Finder ud af, om den nuværende tråd er i gang med en transaktion. Se ``.transaction()``.
+
+        :return: Om tråden er i en transaktion.
+        :rtype: bool
+        """
+        return bool(getattr(self._local, "transaction", None))
 
     def _preview(self, query: str) -> None:
         """
         Viser et preview at queriet, der skal til at køres.
 
         For at fortsætte eksekveringen, skal brugeren trykke på Enter.
+        Kører flere tråde queries samtidig, vises deres previews ét ad gangen.
 
         :param query: Queriet, der skal til at køres.
             *Påkrævet*.
@@ -142,55 +599,40 @@ class Database(connector.DatabaseConnector):
         if self.preview:
             msg = " > " + query
             title = "Forhåndsvisning af forespørgsel:"
-            print('-' * max(len(msg), len(title)))
-            print(title)
-            input(msg)
-            print('-' * max(len(msg), len(title)))
-
-    def _format_column(self, column_name: str) -> str:
-        """
-        Formaterer en reference til en kolonne korrekt med backticks.
-
-        Hvis referencen indeholder et punktum, f.eks. hvis kolonner fra flere tabeller indgår i et query,
-        sættes backticks rundt om hver enkelt del af kolonnenavnet.
-
-        :param column_name: Kolonnenavnet/-referencen, der skal formateres.
-            *Påkrævet*.
-        :type column_name: str
-        :return: Den formaterede kolonnereference.
-        :rtype: str
-        """
-        column_parts = []
-        # Opdeler navn med flere dele
-        split_column = column_name.split('.') if '.' in column_name else [column_name]
-        # Sætter backticks omkring hver enkelt del
-        for column_part in split_column:
-            column_parts.append(f"`{column_part}`")
-        # Returnerede den samlede reference
-        return '.'.join(column_parts)
+            with PREVIEW_LOCK:
+                print('-' * max(len(msg), len(title)))
+                print(title)
+                input(msg)
+                print('-' * max(len(msg), len(title)))
 
     # CREATE-operationer
-    def create_database(self, database_name: str) -> None:
+    def create_database(self, database_name: str) -> bool:
         """
         Opretter en database med det angivne navn.
 
         :param database_name: Navnet på databasen, der ønskes oprettet.
             *Påkrævet*.
         :type database_name: str
+
+        :return: Om databasen blev oprettet.
+        :rtype: bool
         """
         database_query = f"CREATE DATABASE `{database_name}`"
 
         self._preview(database_query)
 
         # Hvis eksekveringen gennemføres, vises besked
-        if self._execute(database_query, db=False):
+        if self._execute(database_query, db=False, api="create_database"):
             print(f"SUCCES: Databasen '{database_name}' blev oprettet.")
+            return True
+        return False
 
     def create(self,
         columns: str,
         table_name: str = "table",
         primary_key: str = '',
-        foreign_key: dict[str] = {}
+        foreign_key: dict[str] = {},
+        types: dict[str] = {}
     ) -> None:
         """
         Opretter en ny tabel ud fra de angivne oplysninger.
@@ -203,40 +645,17 @@ class Database(connector.DatabaseConnector):
         :type primary_key: str, optional
         :param foreign_key: _description_, defaults to {}
         :type foreign_key: dict, optional
+        :param types: Datatypen for hver kolonne, f.eks. fra ``util.infer_types()``.
+            Kolonner, der ikke er med, får en datatype ud fra deres navn.
+            *Upåkrævet*. Standardværdi: ``{}``
+        :type types: dict[str]
         """
-        header = columns.strip('\n').split(',')
-
-        # TODO: Omskriv denne del
-        create_query = f"CREATE TABLE `{table_name}` ("
-        # Gætter datatype ud fra kolonnenavn
-        # Men det vile måske være smartere at gætte ud fra felternes værdi fra første række
-        # For dette gælde kun for de tre datasæt til opgaven
-        # Det kommer an på, om man følger en fast navngivningspraksis for kolonnerne i datasættene
-        for column in header:
-            create_query += f"`{column}` "
-            if column == "id":
-                create_query += "INTEGER NOT NULL"
-            elif "name" in column:
-                create_query += "VARCHAR(80) NOT NULL"
-            elif "email" in column:
-                create_query += "VARCHAR(254) NOT NULL"
-            elif "price" in column:
-                # For dette datasæt er (P=8,D=5) i DECIMAL(P,D)
-                # Men for pengebeløb burde D vel egentlig være 2
-                create_query += "DECIMAL(10,5) NOT NULL"
-            elif "date" in column:
-                create_query += "DATETIME NOT NULL"
-            elif column in ["customer", "product"]:
-                create_query += "INTEGER NOT NULL"
-
-            # if column == primary_key:
-            #     create_query += " PRIMARY KEY"
-            create_query += ", "
-        create_query = create_query[:-2] + ')'
+        create_query = self._create_query(columns, table_name, types)
 
         self._preview(create_query)
 
-        if self._execute(create_query):
+        self._invalidate(table_name)
+        if self._execute(create_query, api="create"):
             print(f"SUCCES: Oprettede tabellen '{table_name}'.")
 
         if primary_key:
@@ -245,19 +664,26 @@ class Database(connector.DatabaseConnector):
         #     self.foreign_key(table_name, foreign_key)
 
     # TODO: Forsøg at matche kolonnenavne fra dataens header med kolonnenavne fra den valgte tabel
-    # TODO: Implementér et system til at skippe eller overwrite, hvis et felt i en række i datasættet
-    # har samme værdi som ditto i tabellen. Hvis altså kolonnen har PRIMARY KEY eller UNIQUE som constraint.
     def insert(self,
-        data: list[str],
+        data: list[str] | Iterable[list[str]],
         table_name: str,
-        header: bool = True
+        header: bool = True,
+        batch_size: int = 1000,
+        commit_every: int = 1,
+        mode: str = "error",
+        update_columns: list[str] = []
     ) -> None:
         """
         Indsætter en eller flere rækker data i en tabel.
 
+        Dataene kan enten være en liste af rækker eller en strøm af batches (f.eks. fra ``util.read_csv_batches()``).
+        Rækkerne sendes til serveren i bidder af ``batch_size`` rækker ad gangen,
+        og ændringerne committes for hver ``commit_every`` bidder, så en stor indsættelse
+        ikke bliver til én kæmpe transaktion. Går en bid galt, rulles kun de ikke-committede bidder tilbage.
+
         :param data: Dataene, der ønskes indsat i tabellen.
             *Påkrævet*.
-        :type data: list[str]
+        :type data: list[str] | Iterable[list[str]]
         :param table_name: Navnet på tabellen, som dataen skal indsættes i.
             *Påkrævet*.
         :type table_name: str
@@ -266,100 +692,777 @@ class Database(connector.DatabaseConnector):
             Hvis ``True`` forsøges dataen desuden at matches med den angivne tabels kolonnenavne.
             *Upåkrævet*. Standardværdi: ``True``
         :type header: bool
+        :param batch_size: Antallet af rækker, der sendes til serveren i hvert INSERT-query.
+            *Upåkrævet*. Standardværdi: ``1000``
+        :type batch_size: int
+        :param commit_every: Antallet af bidder, der indsættes mellem hvert commit.
+            *Upåkrævet*. Standardværdi: ``1``
+        :type commit_every: int
+        :param mode: Bestemmer, hvad der sker med rækker, hvis PRIMARY KEY eller UNIQUE-værdier allerede findes i tabellen.
+            ``"error"`` afbryder indsættelsen med en fejl, ``"ignore"`` springer rækkerne over (``INSERT IGNORE``),
+            og ``"upsert"`` opdaterer de eksisterende rækker (``ON DUPLICATE KEY UPDATE``).
+            Ved ``"upsert"`` skriver serveren kun til rækker, hvor en værdi faktisk er ændret,
+            så en genindlæsning af en næsten uændret fil kun ændrer de ændrede rækker.
+            *Upåkrævet*. Standardværdi: ``"error"``
+        :type mode: str
+        :param update_columns: Kolonnerne, der opdateres ved ``"upsert"``.
+            Er listen tom, opdateres alle kolonner, der ikke er en del af tabellens primary key.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type update_columns: list[str]
 
         :return: Hvis tabellen ikke findes, eller hvis dataene ikke har samme antal kolonner som tabellen.
         :rtype: None
         """
-        # Benyttes ikke endnu, men kan bruges til at bytte rundt på kolonner,
-        # hvis de står i en anden rækkefølge end tabellen, som dataene skal indsættes i
-        if header:
-            columns = data[0].strip('\n').split(',')
-        # Springer over header
-        rows = data[1:] if header else data
-        # Opdeler hver række i felter
-        rows = [row.strip('\n').split(',') for row in rows]
+        mode = mode.lower()
+        if mode not in sql.INSERT_MODES:
+            print(f"FEJL: Ukendt mode '{mode}'. Brug en af {', '.join(sql.INSERT_MODES)}.")
+            return
 
         # Henter info om tabellen
         table_info = self.info(table_name)
         if not table_info:
             return
-        # Tjekker om alle rækker i den inputtede dataliste har samme antal felter, som der er kolonner i den angivne tabel,
-        # dvs. om længden af hver række (list[str]) er den samme som længden af headerinfoen (list[tuple])
-        if not all(len(row) == len(table_info) for row in iter(rows)):
-            print("FEJL: En eller flere rækker data er uforenelig med tabellens format.")
-            return
 
-        # Danner query
-        insert_query = f"INSERT INTO `{table_name}` ("
-        # Kolonnenavne (med backticks, fordi navnene er taget fra tabellen)
-        insert_query += ", ".join([f"`{column[0]}`" for column in table_info]) + ") VALUES ("
-        # Kolonneværdier (med %()s, fordi det er værdier oplyst af brugeren, der skal tjekkes)
-        insert_query += ", ".join([f"%({column[0]})s" for column in table_info]) + ')'
-
-        # Danner dict over parametre til indsættelse af data
-        insert_params = []
-        for row in rows:
-            # Konverterer str til passende datatype
-            # Koverteringen lader til at være spild af tid,
-            # da værdiene også omdannes til de rette typer,
-            # hvis man bare indsætter tekst...
-            # for index, column in enumerate(table_info):
-                # insert_param[column[0]] = row[index]
-                # Kun de to første værdier (navn og type) tages fra kolonneinfoen
-                # column_name, column_type, *_ = column
-                # if "int" in column_type:
-                #     value = int(row[index])
-                # elif "datetime" in column_type:
-                #     value = datetime.datetime.fromisoformat(row[index])
-                # # Dækker char, varchar, text og [adj.]text
-                # elif "char" in column_type or "text" in column_type:
-                #     value = row[index]
-                # elif "float" in column_type:
-                #     value = float(row[index])
-                # elif "decimal" in column_type:
-                #     value = decimal.Decimal(row[index])
-                # insert_param[column_name] = value
-            # Ny, forenklet måde
-            insert_param = {column[0]: row[index] for index, column in enumerate(table_info)}
-            insert_params.append(insert_param)
+        table_columns = [column[0] for column in table_info]
+        for column in update_columns:
+            if column not in table_columns:
+                print(f"FEJL: Kolonnen '{column}' findes ikke i tabellen '{table_name}'.")
+                return
+
+        insert_query = self._insert_query(table_name, table_info, mode, update_columns)
 
         self._preview(insert_query)
 
-        if self._execute(insert_query, insert_params):
-            print(f"SUCCES: Data indsat i tabellen '{table_name}'.")
+        # Et prepared statement kan højst have 65535 parametre
+        if self.prepared:
+            batch_size = min(batch_size, 65535 // len(table_info))
+
+        rows = self._rows(data, header)
+        inserted = 0
+        pending = 0
+        chunks = 0
+        # Antallet af rækker, serveren har ændret. Ved "upsert" tæller en ny række 1, en opdateret 2 og en uændret 0
+        affected = 0
+        pending_affected = 0
+        start = time.perf_counter()
+        # Alle bidder køres på samme forbindelse, så de kan committes samlet
+        with self._reserve():
+            while chunk := list(itertools.islice(rows, max(batch_size, 1))):
+                # Tjekker om alle rækker i bidden har samme antal felter, som der er kolonner i den angivne tabel,
+                # dvs. om længden af hver række (list[str]) er den samme som længden af headerinfoen (list[tuple])
+                if not all(len(row) == len(table_info) for row in iter(chunk)):
+                    print("FEJL: En eller flere rækker data er uforenelig med tabellens format.")
+                    self._rollback()
+                    break
+
+                # Danner dict over parametre til indsættelse af data
+                # (Værdierne indsættes som tekst, og MySQL omdanner dem selv til kolonnernes datatyper)
+                insert_params = [{column[0]: row[index] for index, column in enumerate(table_info)} for row in chunk]
+
+                if self.prepared:
+                    # Hele bidden sendes som ét prepared INSERT med flere rækker,
+                    # så alle bidder af samme størrelse genbruger samme statement
+                    chunk_query, chunk_params = self._multi_insert(table_name, table_info, insert_params, mode, update_columns)
+                    executed = self._execute(chunk_query, chunk_params, commit=False, prepared=True, count=True, api="insert")
+                else:
+                    # executemany() omskriver selv queriet til ét INSERT med flere rækker
+                    executed = self._execute(insert_query, insert_params, commit=False, count=True, api="insert")
+                if executed is False:
+                    self._rollback()
+                    break
+                pending += len(insert_params)
+                pending_affected += executed
+                chunks += 1
+
+                if chunks % max(commit_every, 1) == 0:
+                    if not self._commit():
+                        break
+                    self._invalidate_results(table_name)
+                    inserted += pending
+                    affected += pending_affected
+                    pending = pending_affected = 0
+                    elapsed = time.perf_counter() - start
+                    print(f"    {inserted} rækker indsat i '{table_name}' ({inserted / elapsed if elapsed else 0:.0f} rækker/s)")
+            # Committer de sidste bidder, hvis indsættelsen ikke blev afbrudt
+            else:
+                if pending and self._commit():
+                    self._invalidate_results(table_name)
+                    inserted += pending
+                    affected += pending_affected
+
+        if inserted:
+            elapsed = time.perf_counter() - start
+            if mode == "error":
+                print(f"SUCCES: {inserted} rækker data indsat i tabellen '{table_name}' ", end='')
+            elif mode == "ignore":
+                print(f"SUCCES: {affected} rækker data indsat i tabellen '{table_name}', {inserted - affected} sprunget over, ", end='')
+            else:
+                print(f"SUCCES: {inserted} rækker data indsat eller opdateret i tabellen '{table_name}' ({affected} ændringer) ", end='')
+            print(f"på {elapsed:.2f} s ({inserted / elapsed if elapsed else 0:.0f} rækker/s).")
 
-    def new_table(self, data: list[str], table_name: str = "table", header: str = '') -> None:
+    def new_table(self,
+        data: list[str] | Iterable[list[str]],
+        table_name: str = "table",
+        header: str = '',
+        batch_size: int = 1000,
+        types: dict[str] = {}
+    ) -> None:
         """
         Opretter en ny tabel og indsætter data i den.
 
         Svarer til at bruge ``.create()`` efterfulgt af ``.insert()``.
 
         :param data: Dataene, der danner grundlag for den nye tabel.
+            Kan være en liste af rækker eller en strøm af batches.
             *Påkrævet*.
-        :type data: list[str]
+        :type data: list[str] | Iterable[list[str]]
         :param table_name: Navnet på tabellen, der ønskes oprettet.
             *Påkrævet*. Standardværdi: ``"table"``
         :type table_name: str
         :param header: En kommasepareret tekststreng indeholdende kolonnenavne.
+            Hvis den er tom, bruges den første række i dataene som header.
             *Upåkrævet*. Standardværdi: ``''``
         :type header: str
+        :param batch_size: Antallet af rækker, der sendes til serveren i hvert INSERT-query.
+            *Upåkrævet*. Standardværdi: ``1000``
+        :type batch_size: int
+        :param types: Datatypen for hver kolonne. Er den tom, udledes datatyperne fra den første batch.
+            *Upåkrævet*. Standardværdi: ``{}``
+        :type types: dict[str]
         """
+        batches = self._batches(data)
+        # Kun den første batch skal læses for at finde headeren og udlede datatyperne
+        first_batch = next(batches, [])
         if not header:
-            header, *body = data
-        self.create(header, table_name)
-        self.insert(body, table_name, header=False)
+            if not first_batch:
+                print(f"FEJL: Der er ingen data at oprette tabellen '{table_name}' ud fra.")
+                return
+            header, *first_batch = first_batch
+        if not types and first_batch:
+            types = util.infer_types(self._rows(first_batch), header.strip('\n').split(','))
+        batches = itertools.chain([first_batch], batches)
+        self.create(header, table_name, types=types)
+        self.insert(batches, table_name, header=False, batch_size=batch_size)
+
+    def materialize(self,
+        name: str,
+        table_name: str,
+        *column_name: str,
+        joins: list[dict[str]] = [],
+        where: list[tuple] | dict[str] = [],
+        names: dict[str] = {},
+        key: str = ''
+    ) -> None:
+        """
+        Opretter en materialiseret tabel med resultatet af en læsning, f.eks. et join af flere tabeller.
+
+        Tabellen dannes helt på serveren med ``CREATE TABLE ... AS SELECT``, så rækkerne aldrig sendes gennem klienten.
+        Læsningen angives med de samme argumenter som i ``.read()``, og dens definition gemmes i tabellen ``_materialized``,
+        så tabellen senere kan genopfriskes med ``.refresh_materialized()``.
+        Nøglen (som standard primary key i den første tabel) bliver tabellens primary key og bruges,
+        når kun nye rækker skal tilføjes. Den skal derfor være unik i resultatet.
+
+        Kolonnerne får samme navne som i de oprindelige tabeller. Findes et navn i flere af de valgte kolonner,
+        får kolonnen tabellens navn foran, f.eks. ``customers_name``. Andre navne kan angives med ``names``.
+
+        Eksempel::
+
+            db.materialize(
+                "orders_combined", "orders",
+                "orders.id", "date_time", "customers.name", "email", "products.name", "price",
+                joins=[
+                    {"right": "customers", "on_left": "customer", "on_right": "id"},
+                    {"right": "products", "on_left": "product", "on_right": "id"}
+                ],
+                names={"customers.name": "customer_name", "products.name": "product_name"}
+            )
+
+        :param name: Navnet på den materialiserede tabel.
+            *Påkrævet*.
+        :type name: str
+        :param table_name: Navnet på den tabel, som data skal læses fra.
+            *Påkrævet*.
+        :type table_name: str
+        :param column_name: De valgte kolonner. Er den tom, vælges alle kolonner i tabellerne.
+            *Upåkrævet*.
+        :type column_name: str
+        :param joins: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type joins: list[dict[str]]
+        :param where: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type where: list[tuple] | dict[str]
+        :param names: Nye navne til kolonnerne, f.eks. ``{"customers.name": "customer_name"}``.
+            *Upåkrævet*. Standardværdi: ``{}``
+        :type names: dict[str]
+        :param key: Kolonnen, der identificerer rækkerne, f.eks. ``"orders.id"``.
+            Er den tom, bruges primary key i den første tabel, hvis den har én kolonne og er valgt.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type key: str
+        """
+        if name in [row[0] for row in self.info() or []]:
+            print(f"FEJL: Tabellen '{name}' findes allerede. Brug .refresh_materialized() for at genopfriske den.")
+            return
 
-    def load(self, *tables: str) -> None:
+        definition = {
+            "table_name": table_name,
+            "column_name": list(column_name),
+            "joins": [dict(join) for join in joins],
+            "where": where,
+            "names": dict(names),
+            "key": key
+        }
+        materialized = self._materialized_query(definition)
+        if materialized is None:
+            return
+        select_query, select_params, key_name, _ = materialized
+
+        if not self._create_materialized(name, select_query, select_params, key_name, "materialize"):
+            return
+        self._save_materialized(name, definition, "materialize")
+
+    def refresh_materialized(self, name: str, mode: str = "full") -> None:
+        """
+        Genopfrisker en materialiseret tabel fra ``.materialize()``, så den passer til de tabeller, den er dannet ud fra.
+
+        Med ``"full"`` dannes en ny udgave af hele tabellen på serveren, og den gamle udskiftes med den nye
+        i én ``RENAME TABLE``, så andre klienter aldrig ser en tom eller halvfærdig tabel.
+        Med ``"incremental"`` tilføjes kun rækker med en nøgle, der er større end den største nøgle i tabellen,
+        f.eks. nye ordrer. Ændrede eller slettede rækker kræver en fuld genopfriskning.
+
+        NB! Denne metode skal ikke forveksles med ``.refresh()``, der genindlæser info om en tabel.
+
+        :param name: Navnet på den materialiserede tabel.
+            *Påkrævet*.
+        :type name: str
+        :param mode: Måden, tabellen genopfriskes på, ``"full"`` eller ``"incremental"``.
+            *Upåkrævet*. Standardværdi: ``"full"``
+        :type mode: str
+        """
+        mode = mode.lower()
+        if mode not in REFRESH_MODES:
+            print(f"FEJL: Ukendt mode '{mode}'. Brug en af {', '.join(REFRESH_MODES)}.")
+            return
+
+        definition = None
+        if MATERIALIZED_TABLE in [row[0] for row in self.info() or []]:
+            definition_query = f"SELECT `definition` FROM `{MATERIALIZED_TABLE}` WHERE `name` = %(name)s"
+            found = self._execute(definition_query, {"name": name}, read=True, api="refresh_materialized")
+            if found:
+                definition = json.loads(found[0][0])
+        if definition is None:
+            print(f"FEJL: Tabellen '{name}' er ikke oprettet med .materialize().")
+            return
+        exists = name in [row[0] for row in self.info() or []]
+
+        if mode == "incremental" and exists:
+            materialized = self._materialized_query(definition)
+            if materialized is None:
+                return
+            _, _, key_name, _ = materialized
+            if not key_name:
+                print(f"FEJL: Tabellen '{name}' har ingen nøgle og kan kun genopfriskes med mode=\"full\".")
+                return
+            newest = self._execute(f"SELECT MAX(`{key_name}`) FROM `{name}`", read=True, api="refresh_materialized")
+            if newest is False:
+                return
+            # Kun rækker efter den største nøgle vælges. Er tabellen tom, vælges alle rækker
+            select_query, select_params, _, columns = self._materialized_query(definition, newest[0][0])
+            insert_query = f"INSERT INTO `{name}` (" + ", ".join(f"`{column}`" for column in columns) + ") " + select_query
+
+            self._preview(insert_query)
+
+            inserted = self._execute(insert_query, select_params, count=True, api="refresh_materialized")
+            if inserted is False:
+                return
+            print(f"SUCCES: Tilføjede {inserted} nye rækker til tabellen '{name}'.")
+        else:
+            materialized = self._materialized_query(definition)
+            if materialized is None:
+                return
+            select_query, select_params, key_name, _ = materialized
+            if exists:
+                # Den nye udgave dannes ved siden af den gamle og bytter plads med den i én operation
+                new_name, old_name = f"{name}__new", f"{name}__old"
+                self._execute(f"DROP TABLE IF EXISTS `{new_name}`", api="refresh_materialized")
+                if not self._create_materialized(new_name, select_query, select_params, key_name, "refresh_materialized"):
+                    return
+                rename_query = f"RENAME TABLE `{name}` TO `{old_name}`, `{new_name}` TO `{name}`"
+                self._preview(rename_query)
+                if not self._execute(rename_query, api="refresh_materialized"):
+                    return
+                self._execute(f"DROP TABLE `{old_name}`", api="refresh_materialized")
+                for table in [name, new_name, old_name]:
+                    self._invalidate(table)
+                print(f"SUCCES: Genopfriskede tabellen '{name}'.")
+            elif not self._create_materialized(name, select_query, select_params, key_name, "refresh_materialized"):
+                return
+
+        self._invalidate_results(name)
+        self._save_materialized(name, definition, "refresh_materialized")
+
+    def _materialized_query(self, definition: dict, after=None) -> tuple[str, dict[str], str, list[str]] | None:
+        """
+        Konstruerer SELECT-queriet til en materialiseret tabel ud fra dens definition. Se ``.materialize()``.
+
+        :param definition: Definitionen med argumenterne til ``.materialize()``.
+            *Påkrævet*.
+        :type definition: dict
+        :param after: Hvis den ikke er ``None``, vælges kun rækker med en nøgle, der er større end den.
+            *Upåkrævet*. Standardværdi: ``None``
+        :type after: Any
+
+        :return: En tuple bestående af queriet, dets parametre, navnet på nøglekolonnen i den materialiserede tabel
+            (eller ``''``, hvis der ikke er en nøgle) og navnene på alle dens kolonner.
+        :rtype: tuple[str, dict[str], str, list[str]]
+        :return: Hvis en tabel, kolonne eller et join ikke findes, eller hvis betingelserne er ugyldige.
+        :rtype: None
+        """
+        table_name, joins = definition["table_name"], definition["joins"]
+        tables = [table_name] + [join["right"] for join in joins]
+        table_columns = {table: [column[0] for column in self.info(table) or []] for table in tables}
+
+        def resolve(reference: str) -> tuple[str, str]:
+            # En reference uden punktum hører til den første tabel, hvor navnet findes, som i ._result_columns()
+            table, _, column = reference.rpartition('.')
+            if not table:
+                table = next((search for search in tables if column in table_columns[search]), '')
+            return table, column
+
+        columns = []
+        for reference, _ in self._result_columns(table_name, tuple(definition["column_name"]), joins):
+            table, column = resolve(reference)
+            if column not in table_columns.get(table, []):
+                print(f"FEJL: Kolonnen '{reference}' findes ikke i tabellerne {', '.join(tables)}.")
+                return None
+            columns.append((reference, table, column))
+
+        # Navne, der findes flere gange, får tabellens navn foran
+        counts = collections.Counter(column for _, _, column in columns)
+        output = [
+            definition["names"].get(reference) or (column if counts[column] == 1 else f"{table}_{column}")
+            for reference, table, column in columns
+        ]
+
+        key = definition["key"]
+        if not key:
+            primary_key = [column[0] for column in self.info(table_name) or [] if column[3] == "PRI"]
+            key = f"{table_name}.{primary_key[0]}" if len(primary_key) == 1 else ''
+        key_column = resolve(key) if key else None
+        key_name = next((name for (_, *found), name in zip(columns, output) if tuple(found) == key_column), '')
+        if definition["key"] and not key_name:
+            print(f"FEJL: Nøglen '{key}' er ikke en af de valgte kolonner.")
+            return None
+
+        select_query = "SELECT " + ", ".join(
+            f"{self._format_column(f'{table}.{column}')} AS `{name}`" for (_, table, column), name in zip(columns, output)
+        )
+        select_query += f" FROM `{table_name}`"
+        for join in joins:
+            join_query = self._join(**{"left": table_name, **join})
+            if not join_query:
+                print(f"FEJL: Kunne ikke joine tabellen '{join['right']}'.")
+                return None
+            select_query += join_query
+
+        conditions = [definition["where"]] if isinstance(definition["where"], dict) else list(definition["where"])
+        if after is not None and key_column:
+            conditions.append(('.'.join(key_column), '>', after))
+        select_params = {}
+        if conditions:
+            try:
+                where_query, select_params = self._where(conditions)
+            except (ValueError, TypeError) as err:
+                print(f"FEJL: Betingelserne i 'where' er ugyldige:\n    ", err)
+                return None
+            select_query += where_query
+        return select_query, select_params, key_name, output
+
+    def _create_materialized(self, name: str, select_query: str, select_params: dict[str], key_name: str, api: str) -> bool:
+        """
+        Opretter en tabel med resultatet af et SELECT-query med ``CREATE TABLE ... AS SELECT``. Se ``.materialize()``.
+
+        :return: Om tabellen blev oprettet.
+        :rtype: bool
+        """
+        create_query = f"CREATE TABLE `{name}`"
+        if key_name:
+            create_query += f" (PRIMARY KEY (`{key_name}`))"
+        create_query += " AS " + select_query
+
+        self._preview(create_query)
+
+        self._invalidate(name)
+        created = self._execute(create_query, select_params, count=True, api=api)
+        if created is False:
+            return False
+        print(f"SUCCES: Oprettede tabellen '{name}' med {created} rækker på serveren.")
+        return True
+
+    def _save_materialized(self, name: str, definition: dict, api: str) -> None:
+        """
+        Gemmer definitionen af en materialiseret tabel i tabellen ``_materialized``. Se ``.materialize()``.
+        """
+        if MATERIALIZED_TABLE not in [row[0] for row in self.info() or []]:
+            if not self._execute(MATERIALIZED_QUERY, api=api):
+                return
+            self._invalidate(MATERIALIZED_TABLE)
+        save_query = f"INSERT INTO `{MATERIALIZED_TABLE}` (`name`, `definition`, `refreshed_at`) "
+        save_query += "VALUES (%(name)s, %(definition)s, NOW()) "
+        save_query += "AS `new` ON DUPLICATE KEY UPDATE `definition` = `new`.`definition`, `refreshed_at` = `new`.`refreshed_at`"
+        self._execute(save_query, {"name": name, "definition": json.dumps(definition, default=str)}, api=api)
+
+    def load(self,
+        *tables: str,
+        batch_size: int = 1000,
+        bulk: bool = False,
+        parallel: int = 0,
+        foreign_keys: dict[str, dict[str]] = {},
+        incremental: bool = False
+    ) -> None:
         """
         Indlæser data fra de(n) angivne fil(er) og opretter en tabel i databasen for hver af dem.
 
+        Filerne læses og indsættes løbende i batches, så hukommelsesforbruget ikke vokser med filstørrelsen.
+        Med ``bulk=True`` sendes filerne i stedet direkte til serveren med ``LOAD DATA LOCAL INFILE``,
+        hvilket er langt hurtigere. Hvis serveren eller forbindelsen ikke tillader det,
+        indsættes dataene i stedet på den almindelige måde.
+
+        Tabeller, som andre tabeller refererer til med foreign keys, indlæses altid før de tabeller, der refererer til dem.
+        Med ``parallel`` indlæses uafhængige filer samtidig i hver sin tråd og på hver sin forbindelse fra puljen.
+        Til sidst vises, hvor lang tid hver tabel tog at indlæse.
+
+        Med ``incremental=True`` indlæses kun de rækker, der er kommet til i slutningen af hver fil,
+        siden den sidst blev indlæst. Se ``._load_incremental()``.
+
         :param tables: En eller flere filer, der skal laves en tabel af.
         :type tables: str
+        :param batch_size: Antallet af rækker, der læses og indsættes ad gangen.
+            *Upåkrævet*. Standardværdi: ``1000``
+        :type batch_size: int
+        :param bulk: Bestemmer, om filerne skal indlæses direkte af serveren.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type bulk: bool
+        :param parallel: Det maksimale antal filer, der indlæses samtidig.
+            Kræver, at objektet bruger en pool (``pool_size``). Er den ``0`` eller ``1``, indlæses én fil ad gangen.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type parallel: int
+        :param foreign_keys: Tabellernes foreign keys på samme form som i ``.foreign_key()``,
+            dvs. ``{ tabel: { kolonne: "tabel.kolonne" } }``. Bruges kun til at bestemme rækkefølgen.
+            Er en tabel ikke med, gættes dens afhængigheder ud fra kolonnenavnene i filens header,
+            så f.eks. kolonnen ``customer`` afhænger af tabellen ``customers``.
+            *Upåkrævet*. Standardværdi: ``{}``
+        :type foreign_keys: dict[str, dict[str]]
+        :param incremental: Bestemmer, om kun nye rækker indlæses, og om tabellerne må findes i forvejen.
+            Bruges ikke sammen med ``bulk``.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type incremental: bool
+        """
+        if parallel > 1 and not self.pooled:
+            print("FEJL: Parallel indlæsning kræver en pool af forbindelser (pool_size). Indlæser i stedet én fil ad gangen.")
+            parallel = 0
+        # Andre tråde kan ikke bruge transaktionens forbindelse
+        if parallel > 1 and self._in_transaction():
+            parallel = 0
+
+        timings = {}
+        start = time.perf_counter()
+        for wave in self._load_order(tables, foreign_keys):
+            # Filerne i en bølge afhænger ikke af hinanden og kan indlæses samtidig
+            if parallel > 1 and len(wave) > 1:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=parallel) as executor:
+                    futures = {table: executor.submit(self._load_file, table, batch_size, bulk, incremental) for table in wave}
+                    for table, future in futures.items():
+                        timings[table] = future.result()
+            else:
+                for table in wave:
+                    timings[table] = self._load_file(table, batch_size, bulk, incremental)
+
+        if len(timings) > 1:
+            print(f"SUCCES: Indlæste {len(timings)} filer på {time.perf_counter() - start:.2f} s:")
+            for table, seconds in timings.items():
+                print(f"    {table}: {seconds:.2f} s")
+
+    def _load_file(self, table: str, batch_size: int = 1000, bulk: bool = False, incremental: bool = False) -> float:
+        """
+        Indlæser én fil som en ny tabel. Se ``.load()``.
+
+        :param table: Filen, der skal laves en tabel af.
+            *Påkrævet*.
+        :type table: str
+        :param batch_size: Antallet af rækker, der læses og indsættes ad gangen.
+            *Upåkrævet*. Standardværdi: ``1000``
+        :type batch_size: int
+        :param bulk: Bestemmer, om filen skal indlæses direkte af serveren.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type bulk: bool
+        :param incremental: Bestemmer, om kun nye rækker indlæses. Se ``._load_incremental()``.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type incremental: bool
+
+        :return: Antal sekunder, indlæsningen tog.
+        :rtype: float
+        """
+        if incremental:
+            return self._load_incremental(table, batch_size)
+
+        start = time.perf_counter()
+        table_name = util.get_name(table)
+        header = next(util.read_csv_batches(table, 1), [''])[0]
+        if not header:
+            return time.perf_counter() - start
+
+        # Datatyperne udledes af et udsnit af filen, så den ikke skal læses en ekstra gang først.
+        # Passer en senere batch ikke til dem, udvides de, inden batchen indsættes
+        columns = header.strip('\n').split(',')
+        types = util.infer_types(self._rows(util.sample_csv(table), header=True), columns)
+        self.create(header, table_name, types=types)
+
+        # Med bulk læses filen af serveren. Fejler det, f.eks. fordi en værdi ikke passer til udsnittets datatyper,
+        # rulles indlæsningen tilbage, og rækkerne indsættes i stedet på den almindelige måde
+        if bulk and self._load_infile(table, table_name, header):
+            return time.perf_counter() - start
+        if bulk:
+            print(f"Indsætter i stedet dataene fra '{table}' række for række.")
+        batches = self._widen_batches(util.read_csv_batches(table, batch_size), table_name, columns)
+        self.insert(batches, table_name, header=True, batch_size=batch_size)
+        return time.perf_counter() - start
+
+    def _load_incremental(self, table: str, batch_size: int = 1000) -> float:
+        """
+        Indlæser kun de rækker fra en fil, der er kommet til, siden filen sidst blev indlæst.
+
+        For hver fil gemmes i tabellen ``_load_state``, hvor mange bytes der er indlæst, primary key i den sidste række
+        og en SHA-256 af de indlæste bytes. Ved næste indlæsning tjekkes det, at filen stadig starter med de samme bytes,
+        og i så fald læses kun resten af filen. Er filen ændret før dette sted (eller er den kortere),
+        indlæses hele filen igen. Kun hele linjer indlæses, så en linje, der er ved at blive skrevet, venter til næste gang.
+
+        Rækkerne indsættes med ``mode="upsert"``, så en genindlæsning ikke giver dubletter,
+        og tabellen ryddes ikke først, så den kan indlæses igen, selvom andre tabeller refererer til den.
+        Rækker, der er fjernet fra filen, bliver derfor i tabellen.
+        De nye rækker og den gemte tilstand committes samlet i én transaktion, så de ikke kan komme ud af trit.
+        Passer tabellens datatyper ikke til de nye rækker, udvides de først med ``.modify()``.
+
+        :param table: Filen, der skal indlæses.
+            *Påkrævet*.
+        :type table: str
+        :param batch_size: Antallet af rækker, der læses og indsættes ad gangen.
+            *Upåkrævet*. Standardværdi: ``1000``
+        :type batch_size: int
+
+        :return: Antal sekunder, indlæsningen tog.
+        :rtype: float
+        """
+        start = time.perf_counter()
+        table_name = util.get_name(table)
+        path = os.path.abspath(os.path.join(util.data_dir, table))
+        if not os.path.isfile(path):
+            print(f"FEJL: Filen '{path}' eksisterer ikke.")
+            return time.perf_counter() - start
+
+        tables = [row[0] for row in self.info() or []]
+        if LOAD_STATE_TABLE not in tables:
+            if not self._execute(LOAD_STATE_QUERY, api="load"):
+                return time.perf_counter() - start
+            self._invalidate(LOAD_STATE_TABLE)
+        state_query = f"SELECT `byte_offset`, `prefix_hash`, `row_count` FROM `{LOAD_STATE_TABLE}` WHERE `file` = %(file)s"
+        state = self._execute(state_query, {"file": path}, read=True, api="load")
+        if state is False:
+            return time.perf_counter() - start
+        exists = table_name in tables
+
+        # Starter fra begyndelsen, medmindre filen starter med præcis de bytes, der blev indlæst sidst
+        offset = row_count = 0
+        digest = None
+        if state and exists:
+            saved_offset, saved_hash, saved_rows = state[0]
+            digest = util.file_digest(table, saved_offset)
+            if digest is not None and digest.hexdigest() == saved_hash:
+                offset, row_count = saved_offset, saved_rows
+                if os.path.getsize(path) == offset:
+                    print(f"SUCCES: Der er ingen nye rækker i '{table}'.")
+                    return time.perf_counter() - start
+            else:
+                print(f"Filen '{table}' er ændret siden sidste indlæsning. Indlæser hele filen igen.")
+                digest = None
+
+        if offset:
+            header = ",".join(column[0] for column in self.info(table_name))
+        else:
+            header = next(util.read_csv_batches(table, 1), [''])[0].strip('\n')
+        if not header:
+            return time.perf_counter() - start
+        columns = header.split(',')
+
+        # De nye rækker gennemløbes først én gang (uden at gemme dem), så datatyperne passer til dem
+        scan = util.CsvTail(table, offset)
+        types = util.infer_types(self._rows(scan.batches(batch_size), header=not offset), columns)
+        new_rows = scan.lines - (0 if offset else 1)
+        if new_rows <= 0:
+            print(f"SUCCES: Der er ingen nye rækker i '{table}'.")
+            return time.perf_counter() - start
+
+        if not exists:
+            self.create(header, table_name, types=types)
+        else:
+            self._widen(table_name, types)
+
+        table_info = self.info(table_name)
+        if not table_info:
+            return time.perf_counter() - start
+        primary_key = next((column[0] for column in table_info if column[3] == "PRI"), '')
+
+        save_query = f"INSERT INTO `{LOAD_STATE_TABLE}` "
+        save_query += "(`file`, `table_name`, `byte_offset`, `last_key`, `prefix_hash`, `row_count`, `loaded_at`) "
+        save_query += "VALUES (%(file)s, %(table_name)s, %(byte_offset)s, %(last_key)s, %(prefix_hash)s, %(row_count)s, NOW()) "
+        save_query += "AS `new` ON DUPLICATE KEY UPDATE " + ", ".join(
+            f"`{column}` = `new`.`{column}`"
+            for column in ("table_name", "byte_offset", "last_key", "prefix_hash", "row_count", "loaded_at")
+        )
+
+        tail = util.CsvTail(table, offset, digest)
+        with self.transaction():
+            self.insert(tail.batches(batch_size), table_name, header=not offset, batch_size=batch_size, mode="upsert")
+            last_row = tail.last_line.strip('\n').split(',')
+            last_key = last_row[columns.index(primary_key)] if primary_key in columns[:len(last_row)] else ''
+            self._execute(save_query, {
+                "file": path,
+                "table_name": table_name,
+                "byte_offset": tail.offset,
+                "last_key": last_key,
+                "prefix_hash": tail.digest.hexdigest(),
+                "row_count": row_count + tail.lines - (0 if offset else 1)
+            }, api="load")
+        return time.perf_counter() - start
+
+    def _widen(self, table_name: str, types: dict[str]) -> None:
+        """
+        Udvider en tabels kolonner med ``.modify()``, så de også passer til de angivne datatyper. Se ``util.widen_type()``.
+
+        :param table_name: Navnet på tabellen.
+            *Påkrævet*.
+        :type table_name: str
+        :param types: Datatyperne, som nye værdier kræver, f.eks. fra ``util.infer_types()``.
+            *Påkrævet*.
+        :type types: dict[str]
+        """
+        for column in self.info(table_name) or []:
+            if column[0] in types and (widened := util.widen_type(column[1], types[column[0]])):
+                self.modify(table_name, column[0], widened + (" NOT NULL" if column[2] == "NO" else ''))
+
+    def _widen_batches(self,
+        batches: Iterable[list[str]],
+        table_name: str,
+        columns: list[str],
+        header: bool = True
+    ) -> Iterator[list[str]]:
+        """
+        Giver batches videre til ``.insert()`` og udvider først tabellens kolonner, hvis en batch ikke passer til dem.
+
+        Bruges, når tabellens datatyper er udledt af et udsnit af filen (se ``util.sample_csv()``).
+        NB! Udvidelsen er en ændring af tabellens opbygning, som MySQL committer automatisk.
+
+        :param batches: Batches af rækker, f.eks. fra ``util.read_csv_batches()``.
+            *Påkrævet*.
+        :type batches: Iterable[list[str]]
+        :param table_name: Navnet på tabellen, som rækkerne indsættes i.
+            *Påkrævet*.
+        :type table_name: str
+        :param columns: Kolonnernes navne i samme rækkefølge som felterne.
+            *Påkrævet*.
+        :type columns: list[str]
+        :param header: Angiver, om den første række i den første batch er en header.
+            *Upåkrævet*. Standardværdi: ``True``
+        :type header: bool
+
+        :return: En generator, der giver de samme batches.
+        :rtype: Iterator[list[str]]
+        """
+        for index, batch in enumerate(batches):
+            rows = batch[1:] if header and index == 0 else batch
+            if rows:
+                self._widen(table_name, util.infer_types(self._rows(rows), columns))
+            yield batch
+
+    def load_state(self, table_name: str = '') -> list[tuple] | None:
+        """
+        Henter den gemte tilstand for filer, der er indlæst med ``.load(incremental=True)``.
+
+        :param table_name: Navnet på tabellen, hvis tilstand efterspørges.
+            Hvis navnet er tomt, hentes tilstanden for alle filer.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type table_name: str
+
+        :return: En række for hver fil med stien til filen, tabellens navn, antal indlæste bytes,
+            primary key i den sidste indlæste række, SHA-256 af de indlæste bytes, antal rækker og tidspunktet.
+        :rtype: list[tuple]
+        :return: Hvis der ikke er indlæst nogen filer, eller hvis READ-operationen ikke kunne gennemføres.
+        :rtype: None
+        """
+        if LOAD_STATE_TABLE not in [row[0] for row in self.info() or []]:
+            return None
+        state_query = f"SELECT * FROM `{LOAD_STATE_TABLE}`"
+        state_params = {}
+        if table_name:
+            state_query += " WHERE `table_name` = %(table_name)s"
+            state_params["table_name"] = table_name
+        state_query += " ORDER BY `file`"
+
+        self._preview(state_query)
+
+        state = self._execute(state_query, state_params, read=True, api="load_state")
+        return state if state is not False else None
+
+    def _load_infile(self, filename: str, table_name: str, header: str, data_dir: str = util.data_dir) -> bool:
+        """
+        Indlæser en *.csv*-fil direkte i en tabel med ``LOAD DATA LOCAL INFILE``.
+
+        Filens kolonner matches med tabellens kolonner ud fra headeren.
+        Kolonner i filen, som ikke findes i tabellen, springes over.
+
+        :param filename: Filnavnet på filen, der skal indlæses.
+            *Påkrævet*.
+        :type filename: str
+        :param table_name: Navnet på tabellen, som dataene skal indsættes i.
+            *Påkrævet*.
+        :type table_name: str
+        :param header: Filens header, dvs. en kommasepareret tekststreng med kolonnenavne.
+            *Påkrævet*.
+        :type header: str
+        :param data_dir: Mappen/kataloget, hvori .csv-filen er placeret.
+            *Upåkrævet*. Standardværdi: ``util.data_dir``
+        :type data_dir: str
+
+        :return: Om filen blev indlæst af serveren.
+        :rtype: bool
         """
-        for table in tables:
-            raw_data = util.read_csv(table)
-            table_name = util.get_name(table)
-            self.new_table(raw_data, table_name)
+        # Klienten afviser selv LOAD DATA LOCAL, hvis det ikke er slået til ved login
+        if not self.local_infile:
+            print("FEJL: LOAD DATA LOCAL INFILE er ikke slået til for forbindelsen.")
+            return False
+
+        table_info = self.info(table_name)
+        if not table_info:
+            return False
+        table_columns = [column[0] for column in table_info]
+
+        # Filens kolonner i filens rækkefølge. Ukendte kolonner læses ind i en brugervariabel og kasseres
+        file_columns = []
+        for column in header.strip('\n').split(','):
+            file_columns.append(f"`{column}`" if column in table_columns else "@skip")
+
+        infile_query = f"LOAD DATA LOCAL INFILE %(path)s INTO TABLE `{table_name}` "
+        infile_query += "CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' IGNORE 1 LINES "
+        infile_query += '(' + ", ".join(file_columns) + ')'
+        infile_params = {"path": os.path.abspath(os.path.join(data_dir, filename))}
+
+        self._preview(infile_query)
+
+        if self._execute(infile_query, infile_params, api="load"):
+            self._invalidate_results(table_name)
+            print(f"SUCCES: Serveren indlæste filen '{filename}' direkte i tabellen '{table_name}'.")
+            return True
+        return False
 
     # READ-operationer
     # TODO: Tilføj en måde, hvorpå foreign keys kan bruges til at joine eller læse data fra andre tabeller
@@ -367,11 +1470,13 @@ class Database(connector.DatabaseConnector):
         table_name: str,
         *column_name: str,
         joins: list[dict[str]] = [],
+        where: list[tuple] | dict[str] = [],
         order: int | str = 0,
         direction: str = 'a',
         limit: int = 0,
-        offset: int = 0
-    ) -> list[tuple] | None:
+        offset: int = 0,
+        as_columns: bool = False
+    ) -> list[tuple] | dict[str] | None:
         """
         Læser data fra en tabel.
 
@@ -390,6 +1495,19 @@ class Database(connector.DatabaseConnector):
             }`` i brug, men parameteren ``"left"`` kan også oplyses om nødvendigt.
             *Upåkrævet*. Standardværdi: ``[]``
         :type joins: list[dict[str]]
+        :param where: Betingelserne, som rækkerne skal opfylde. Filtreringen sker på serveren,
+            så kun de valgte rækker sendes over netværket, og indekser på kolonnerne kan bruges.
+            En betingelse er en tuple på formen ``(kolonne, operator, værdi)``, hvor operatoren kan være
+            ``'='``, ``"!="``, ``'<'``, ``"<="``, ``'>'``, ``">="``, ``"LIKE"`` eller ``"NOT LIKE"``,
+            ``"BETWEEN"`` eller ``"NOT BETWEEN"`` med værdien ``(fra, til)``,
+            ``"IN"`` eller ``"NOT IN"`` med en liste af værdier,
+            eller ``"IS NULL"`` eller ``"IS NOT NULL"`` uden værdi, f.eks. ``("email", "IS NULL")``.
+            Betingelserne i en liste skal alle være opfyldt. Grupper kan dannes med
+            ``{"and": [...]}`` og ``{"or": [...]}``, som også kan indeholde andre grupper, f.eks.
+            ``[("price", '>', 100), {"or": [("name", "LIKE", "L%"), ("id", "IN", [1, 2, 3])]}]``.
+            Værdierne indsættes altid som parametre.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type where: list[tuple] | dict[str]
         :param order: Kolonnen, som resultatet ordnes efter.
             Enten *int*, der vælger indekset af kolonnen blandt de valgte kolonner,
             eller *str*, der vælger ud fra navnet på kolonnen.
@@ -408,110 +1526,858 @@ class Database(connector.DatabaseConnector):
             Når værdien er ``0``, læses alle resultater.
             *Upåkrævet*. Standardværdi: ``0``
         :type offset: int
+        :param as_columns: Bestemmer, om resultatet gives som kolonner i stedet for rækker.
+            Hver kolonne bliver en typet array ud fra kolonnens datatype i tabellens info,
+            så der kan regnes direkte på hele kolonnen. Se ``columns.column_array()``.
+            NULL-værdierne står i resultatets attribut ``nulls``. Se ``columns.to_columns()``.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type as_columns: bool
 
         :return: En liste med rækker indeholdende data fra de(n) valgte kolonne(r).
         :rtype: list[tuple]
+        :return: Hvis ``as_columns`` er sat, en dict med kolonnenavnene som nøgler og kolonnerne som værdier.
+        :rtype: dict[str, numpy.ndarray | array.array | columns.StringColumn | list]
         :return: Hvis READ-operationen ikke kunne gennemføres.
         :rtype: None
         """
-        select_params = {}
-
-        select_query = "SELECT "
-        # Hvis antallet af kolonner angivet er > 0,
-        # vælges kun de angivne kolonner
-        if column_name:
-            columns = []
-            for column in column_name:
-                columns.append(self._format_column(column))
-            select_query += ", ".join(columns)
-        # Eller vælges alle kolonner
-        else:
-            select_query += '*'
-        select_query += f" FROM `{table_name}`"
-
-        # Tilføjer join(s)
-        if joins:
-            for join in joins:
-                select_query += self._join(left=table_name, **join)
+        compiled = self.compile(
+            table_name, *column_name,
+            joins=joins, where=where, order=order, direction=direction, limit=limit, offset=offset
+        )
+        if compiled is None:
+            return
+        return self._read_query(compiled, self._bind(compiled, limit, offset, where), as_columns, "read")
 
-        # TODO: Tilføj WHERE (og medhørende keywords, såsom AND, OR, LIKE, IN osv.?s)
+    def compile(self,
+        table_name: str,
+        *column_name: str,
+        joins: list[dict[str]] = [],
+        where: list[tuple] | dict[str] = [],
+        order: int | str = 0,
+        direction: str = 'a',
+        limit: int = 0,
+        offset: int = 0
+    ) -> query.Query | None:
+        """
+        Kompilerer en læsning til et query-objekt, som kan køres igen og igen med ``.execute()``.
 
-        # Tilføjer sorteringsretning
-        # quickfix: (sættes nu altid på queriet, da joins sorteres efter nyligst joinede tabel?)
-        select_query += self._sort(column_name, order, direction)
+        Tager de samme argumenter som ``.read()``. Queriet dannes og valideres (inkl. opslag i ``.info()``)
+        kun første gang. Derefter gives det gemte objekt for samme tabel, kolonner, joins, betingelser og sortering,
+        og for om der bruges limit og offset. Værdierne af ``limit`` og ``offset`` og betingelsernes værdier
+        er parametre, som kan skiftes ud ved hver kørsel, f.eks. ``query.execute(limit=10, offset=20)``.
+        Betingelsernes værdier hedder ``where_0``, ``where_1`` osv. i den rækkefølge, de står i ``where``.
+        De gemte queries fjernes, når en af deres tabellers opbygning ændres.
 
-        # Tilføjer limit og offset
-        if limit or offset:
-            limit_query, limit_params = self._limit(limit, offset)
-            select_query += limit_query
-            select_params.update(limit_params)
+        :param table_name: Navnet på den tabel, som data skal læses fra.
+            *Påkrævet*.
+        :type table_name: str
+        :param column_name: Navnet eller navnene på den kolonne eller de kolonner, som data skal læses fra.
+            *Upåkrævet*.
+        :type column_name: str
+        :param joins: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type joins: list[dict[str]]
+        :param where: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type where: list[tuple] | dict[str]
+        :param order: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type order: int | str
+        :param direction: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``'a'``
+        :type direction: str
+        :param limit: Standardværdien for queriets limit. Er den ``0``, har queriet ingen limit.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type limit: int
+        :param offset: Standardværdien for queriets offset. Er den ``0``, har queriet intet offset.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type offset: int
+
+        :return: Det kompilerede query.
+        :rtype: query.Query
+        :return: Hvis betingelserne ikke er gyldige.
+        :rtype: None
+        """
+        has_limit = isinstance(limit, int) and limit > 0
+        has_offset = isinstance(offset, int) and offset > 0
+        try:
+            where_spec, _ = self._where_spec(where)
+        except (ValueError, TypeError) as err:
+            print(f"FEJL: Betingelserne i 'where' er ugyldige:\n    ", err)
+            return None
+        spec = (
+            table_name,
+            column_name,
+            tuple(tuple(sorted(join.items())) for join in joins),
+            where_spec,
+            order,
+            direction.lower(),
+            has_limit,
+            has_offset
+        )
+        compiled = self._cached_query(spec)
+        if compiled is not None:
+            return compiled
+
+        select_query, select_params = self._select(table_name, column_name, joins, order, direction, limit, offset, where)
+        # Kolonnen, der sorteres efter, som i ._sort()
+        if isinstance(order, int) and 0 <= order < len(column_name):
+            order_column = column_name[order]
+        else:
+            order_column = order if isinstance(order, str) and (order in column_name or not column_name) else ''
+        compiled = query.Query(self, table_name, column_name, joins, select_query, select_params, order_column)
+        self._store_query(spec, compiled)
+        return compiled
+
+    def _cached_query(self, spec: tuple) -> query.Query | None:
+        """
+        Henter et kompileret query fra cachen.
+
+        :param spec: Beskrivelsen af queriet, som det er gemt under.
+            *Påkrævet*.
+        :type spec: tuple
+
+        :return: Det gemte query, eller ``None``, hvis det ikke er gemt.
+        :rtype: query.Query | None
+        """
+        with self._queries_lock:
+            compiled = self._queries.get(spec)
+            if compiled is not None:
+                self._queries.move_to_end(spec)
+            return compiled
+
+    def _store_query(self, spec: tuple, compiled: query.Query) -> None:
+        """
+        Gemmer et kompileret query i cachen og fjerner det mindst nyligt brugte, hvis cachen er fuld.
+
+        :param spec: Beskrivelsen af queriet, som det gemmes under.
+            *Påkrævet*.
+        :type spec: tuple
+        :param compiled: Queriet.
+            *Påkrævet*.
+        :type compiled: query.Query
+        """
+        with self._queries_lock:
+            self._queries[spec] = compiled
+            if len(self._queries) > self.query_cache_size:
+                self._queries.popitem(last=False)
+
+    def _bind(self,
+        compiled: query.Query,
+        limit: int = 0,
+        offset: int = 0,
+        where: list[tuple] | dict[str] = [],
+        having: list[tuple] | dict[str] = []
+    ) -> dict[str]:
+        """
+        Danner parametrene til et kompileret query ud fra ``limit``, ``offset``, ``where`` og ``having``,
+        som i ``.read()`` og ``.aggregate()``.
+
+        :return: Queriets parametre.
+        :rtype: dict[str]
+        """
+        values = {"limit": limit, "offset": offset}
+        for prefix, conditions in [("where", where), ("having", having)]:
+            _, condition_values = self._where_spec(conditions)
+            values.update((f"{prefix}_{index}", value) for index, value in enumerate(condition_values))
+        return compiled.bind(**{name: values[name] for name in compiled.params if name in values})
+
+    def _read_query(self,
+        compiled: query.Query,
+        select_params: dict[str],
+        as_columns: bool = False,
+        api: str = "read"
+    ) -> list[tuple] | dict[str] | None:
+        """
+        Kører et kompileret query og bruger cachen af resultater, hvis den er slået til. Se ``.read()``.
+
+        :param compiled: Queriet, der skal køres.
+            *Påkrævet*.
+        :type compiled: query.Query
+        :param select_params: Parametrene til queriet.
+            *Påkrævet*.
+        :type select_params: dict[str]
+        :param as_columns: Bestemmer, om resultatet gives som kolonner i stedet for rækker.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type as_columns: bool
+        :param api: Navnet på metoden, som målingen af queriet registreres under.
+            *Upåkrævet*. Standardværdi: ``"read"``
+        :type api: str
+
+        :return: Resultatet, som i ``.read()``.
+        :rtype: list[tuple] | dict[str] | None
+        """
+        select_query = compiled.sql
+        table_name = compiled.table_name
+        # Tælleren deles med andre tråde og .advise_indexes()
+        with self._queries_lock:
+            compiled.uses += 1
+
+        # Genbruger resultatet, hvis præcis samme query er læst for nylig.
+        # I en transaktion bruges cachen ikke, da resultatet kan indeholde ændringer, der ikke er committet
+        cache_key = (select_query, tuple(sorted(select_params.items())))
+        use_cache = self._results is not None and not self._in_transaction()
+        if use_cache:
+            result = self._results.get(cache_key)
+            if result is not None:
+                print(f"SUCCES: Dataene blev læst fra '{table_name}' (fra cachen).")
+                return columns.to_columns(result, compiled.result_columns) if as_columns else result
 
         self._preview(select_query)
 
-        result = self._execute(select_query, select_params, read=True)
+        result = self._execute(select_query, select_params, read=True, prepared=self.prepared, api=api)
         if result:
             print(f"SUCCES: Dataene blev læst fra '{table_name}' problemfrit.")
-            return result
+            if use_cache:
+                self._results.put(cache_key, result, compiled.tables)
+            return columns.to_columns(result, compiled.result_columns) if as_columns else result
 
-    def _sort(self, column_name: str | tuple[str], order: int | str = 0, direction: str = 'a') -> str:
+    def aggregate(self,
+        table_name: str,
+        *group_by: str,
+        aggregates: dict[str, tuple[str, str]] = {},
+        joins: list[dict[str]] = [],
+        where: list[tuple] | dict[str] = [],
+        having: list[tuple] | dict[str] = [],
+        order: int | str = 0,
+        direction: str = 'a',
+        limit: int = 0,
+        offset: int = 0,
+        as_columns: bool = False
+    ) -> list[tuple] | dict[str] | None:
         """
-        Konstruerer ORDER BY- og ASC/DESC-delen af et query.
+        Grupperer og aggregerer data på serveren, så kun resultatet for hver gruppe sendes tilbage.
 
-        :param column_name: Navnet på kolonne(r)n(e), der er valgt og kan sorteres efter.
-        :type column_name: str | tuple[str]
-        :param order: Kolonnen, som resultatet ordnes efter.
-            Enten *int*, der vælger indekset af kolonnen blandt de valgte kolonner,
-            eller *str*, der vælger ud fra navnet på kolonnen.
+        Resultatet har én række for hver gruppe med gruppens kolonner efterfulgt af aggregeringerne.
+        F.eks. giver omsætningen og antallet af ordrer for hver kunde::
+
+            db.aggregate(
+                "orders", "customers.name",
+                aggregates={ "revenue": ("sum", "products.price"), "orders": ("count", '*') },
+                joins=[customer_join, product_join],
+                order="revenue", direction='d', limit=10
+            )
+
+        :param table_name: Navnet på den tabel, som data skal læses fra.
+            *Påkrævet*.
+        :type table_name: str
+        :param group_by: Kolonnen eller kolonnerne, der grupperes efter.
+            Angives ingen, aggregeres hele tabellen til én række.
+            *Upåkrævet*.
+        :type group_by: str
+        :param aggregates: Aggregeringerne, med deres navn i resultatet som nøgle og ``(funktion, kolonne)`` som værdi.
+            Funktionen kan være ``"count"``, ``"count distinct"``, ``"sum"``, ``"avg"``, ``"min"`` eller ``"max"``.
+            Kolonnen kan være ``'*'`` for ``"count"``.
+            *Upåkrævet*. Standardværdi: ``{}``
+        :type aggregates: dict[str, tuple[str, str]]
+        :param joins: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type joins: list[dict[str]]
+        :param where: Betingelser for rækkerne, inden de grupperes. Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type where: list[tuple] | dict[str]
+        :param having: Betingelser for grupperne, efter at de er aggregeret, på samme form som ``where``.
+            Kolonnerne er aggregeringernes navne eller kolonnerne i ``group_by``, f.eks. ``[("orders", '>', 5)]``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type having: list[tuple] | dict[str]
+        :param order: Kolonnen, som resultatet ordnes efter, blandt kolonnerne i ``group_by`` og aggregeringernes navne.
+            Enten *int*, der vælger indekset af kolonnen, eller *str*, der vælger ud fra navnet.
             *Upåkrævet*. Standardværdi: ``0``
-        :type order: int | str, optional
-        :param direction:  Angiver hvilken retning, resultatet skal ordnes i.
-            ``'a'``, ``"asc"`` eller ``"ascending"`` er opadgående rækkefølge, mens
-            ``'d'``, ``"desc"`` eller ``"descending"`` er nedadgående rækkefølge.
+        :type order: int | str
+        :param direction: Se ``.read()``.
             *Upåkrævet*. Standardværdi: ``'a'``
-        :type direction: str, optional
+        :type direction: str
+        :param limit: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type limit: int
+        :param offset: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type offset: int
+        :param as_columns: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type as_columns: bool
 
-        :return: ORDER BY-delen af et query.
-        :rtype: str
+        :return: En liste med en række for hver gruppe.
+        :rtype: list[tuple]
+        :return: Hvis ``as_columns`` er sat, en dict med kolonnenavnene som nøgler og kolonnerne som værdier.
+        :rtype: dict[str, numpy.ndarray | array.array | columns.StringColumn | list]
+        :return: Hvis READ-operationen ikke kunne gennemføres.
+        :rtype: None
         """
-        query = ""
-        # Formaterer nu kolonnenavne i tilfælde af database.tabel.kolonne-format
-        if isinstance(order, int) and order >= 0 and order < len(column_name):
-            query += f" ORDER BY {self._format_column(column_name[order])}"
-        elif isinstance(order, str) and order in column_name:
-            query += f" ORDER BY {self._format_column(order)}]"
-        if "ORDER BY" in query:
-            if direction.lower() in ['a', "asc", "ascending"]:
-                query += " ASC"
-            elif direction.lower() in ['d', "desc", "descending"]:
-                query += " DESC"
+        if not group_by and not aggregates:
+            print("FEJL: Der skal angives mindst én kolonne at gruppere efter eller én aggregering.")
+            return
+        try:
+            functions = tuple((alias, *self._aggregate_function(*aggregate)) for alias, aggregate in aggregates.items())
+            where_spec, _ = self._where_spec(where)
+            having_spec, _ = self._where_spec(having)
+        except (ValueError, TypeError) as err:
+            print(f"FEJL: Aggregeringen er ugyldig:\n    ", err)
+            return
 
-        return query
+        spec = (
+            "aggregate",
+            table_name,
+            group_by,
+            functions,
+            tuple(tuple(sorted(join.items())) for join in joins),
+            where_spec,
+            having_spec,
+            order,
+            direction.lower(),
+            isinstance(limit, int) and limit > 0,
+            isinstance(offset, int) and offset > 0
+        )
+        compiled = self._cached_query(spec)
+        if compiled is None:
+            compiled = self._aggregate_query(table_name, group_by, functions, joins, where, having, order, direction, limit, offset)
+            self._store_query(spec, compiled)
+
+        return self._read_query(compiled, self._bind(compiled, limit, offset, where, having), as_columns, "aggregate")
+
+    def _aggregate_function(self, function: str, column: str) -> tuple[str, str]:
+        """
+        Tjekker en aggregering fra ``.aggregate()``.
+
+        :return: En tuple bestående af funktionen med store bogstaver og kolonnen.
+        :rtype: tuple[str, str]
 
-    def _limit(self, limit: int, offset: int = 0) -> tuple[str, dict[str]]:
+        :raises ValueError: Hvis funktionen er ukendt, eller ``'*'`` bruges med en anden funktion end COUNT.
         """
-        Konstruerer LIMIT- og OFFSET-delen af et query.
+        function = ' '.join(function.upper().split())
+        if function not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Ukendt funktion '{function}'. Brug en af {', '.join(AGGREGATE_FUNCTIONS)}.")
+        if column == '*' and function != "COUNT":
+            raise ValueError(f"'*' kan kun bruges med COUNT, ikke {function}.")
+        return function, column
+
+    def _aggregate_query(self,
+        table_name: str,
+        group_by: tuple[str],
+        functions: tuple[tuple[str, str, str]],
+        joins: list[dict[str]] = [],
+        where: list[tuple] | dict[str] = [],
+        having: list[tuple] | dict[str] = [],
+        order: int | str = 0,
+        direction: str = 'a',
+        limit: int = 0,
+        offset: int = 0
+    ) -> query.Query:
+        """
+        Konstruerer et kompileret query med GROUP BY ud fra argumenterne til ``.aggregate()``.
+
+        :param functions: Aggregeringerne som tuples på formen ``(navn, funktion, kolonne)``.
+            *Påkrævet*.
+        :type functions: tuple[tuple[str, str, str]]
+
+        :return: Det kompilerede query.
+        :rtype: query.Query
+        """
+        select_params = {}
+        columns = [self._format_column(column) for column in group_by]
+        for alias, function, column in functions:
+            column_reference = '*' if column == '*' else self._format_column(column)
+            if function == "COUNT DISTINCT":
+                columns.append(f"COUNT(DISTINCT {column_reference}) AS `{alias}`")
+            else:
+                columns.append(f"{function}({column_reference}) AS `{alias}`")
+
+        select_query = f"SELECT {', '.join(columns)} FROM `{table_name}`"
+        for join in joins:
+            select_query += self._join(left=table_name, **join)
+        if where:
+            where_query, where_params = self._where(where)
+            select_query += where_query
+            select_params.update(where_params)
+        if group_by:
+            select_query += " GROUP BY " + ", ".join(self._format_column(column) for column in group_by)
+        if having:
+            having_query, having_params = self._where(having, "HAVING", "having")
+            select_query += having_query
+            select_params.update(having_params)
+        # Der kan sorteres efter både grupperingens kolonner og aggregeringernes navne
+        result_names = tuple(group_by) + tuple(alias for alias, *_ in functions)
+        select_query += self._sort(result_names, order, direction)
+        if limit or offset:
+            limit_query, limit_params = self._limit(limit, offset)
+            select_query += limit_query
+            select_params.update(limit_params)
+
+        # Datatyperne af resultatets kolonner, så det også kan gives som kolonner
+        result_columns = self._result_columns(table_name, group_by, joins) if group_by else []
+        for alias, function, column in functions:
+            if function in ["COUNT", "COUNT DISTINCT"]:
+                datatype = "bigint"
+            elif function in ["SUM", "AVG"]:
+                datatype = "double"
+            else:
+                datatype = self._result_columns(table_name, (column,), joins)[0][1]
+            result_columns.append((alias, datatype))
+
+        return query.Query(self, table_name, group_by, joins, select_query, select_params, result_columns=result_columns)
+
+    def _result_columns(self,
+        table_name: str,
+        column_name: tuple[str],
+        joins: list[dict[str]] = []
+    ) -> list[tuple[str, str]]:
+        """
+        Finder navnet og datatypen for hver kolonne i resultatet af et SELECT-query fra ``._select()``.
+
+        Datatyperne slås op i tabellernes info. Ved ``SELECT *`` kommer den første tabels kolonner først
+        og derefter kolonnerne fra hver joinet tabel. Findes et kolonnenavn i flere af tabellerne,
+        får kolonnen navnet ``tabel.kolonne``.
+
+        :param table_name: Navnet på queriets første tabel.
+            *Påkrævet*.
+        :type table_name: str
+        :param column_name: De valgte kolonner, som i ``.read()``.
+            *Påkrævet*.
+        :type column_name: tuple[str]
+        :param joins: Queriets joins, som i ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type joins: list[dict[str]]
+
+        :return: En liste med en tuple bestående af navn og datatype for hver kolonne.
+            Kolonner, hvis datatype ikke kan findes, får typen ``''`` og gives derfor som en liste.
+        :rtype: list[tuple[str, str]]
+        """
+        tables = [table_name] + [join["right"] for join in joins]
+        table_columns = {table: [column[:2] for column in self.info(table) or []] for table in tables}
+
+        if not column_name:
+            names = collections.Counter(column[0] for table in tables for column in table_columns[table])
+            return [
+                (f"{table}.{name}" if names[name] > 1 else name, datatype)
+                for table in tables for name, datatype in table_columns[table]
+            ]
+
+        result_columns = []
+        for column in column_name:
+            # En reference med punktum slås op i den angivne tabel, ellers i den første tabel, hvor navnet findes
+            table, _, name = column.rpartition('.')
+            search = [table] if table else tables
+            datatype = next((
+                found_type for search_table in search
+                for found_name, found_type in table_columns.get(search_table, [])
+                if found_name == name
+            ), '')
+            result_columns.append((column, datatype))
+        return result_columns
+
+    def _invalidate_results(self, table_name: str = '') -> None:
+        """
+        Fjerner gemte resultater, der afhænger af en tabel, efter at tabellens data er blevet ændret.
+
+        :param table_name: Navnet på tabellen, der er ændret.
+            Hvis navnet er tomt, ryddes alle gemte resultater.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type table_name: str
+        """
+        if self._results is not None:
+            self._results.invalidate(table_name)
+
+    def result_cache_info(self) -> dict[str, int]:
+        """
+        Viser statistik for cachen af resultater fra ``.read()``.
+
+        :return: En dict med antal hits, misses, fjernede resultater, gemte resultater og brugte bytes.
+            Tom, hvis cachen ikke er slået til.
+        :rtype: dict[str, int]
+        """
+        return self._results.info() if self._results is not None else {}
+
+    def iter_read(self,
+        table_name: str,
+        *column_name: str,
+        joins: list[dict[str]] = [],
+        where: list[tuple] | dict[str] = [],
+        order: int | str = 0,
+        direction: str = 'a',
+        limit: int = 0,
+        offset: int = 0,
+        batch_size: int = 1000,
+        batches: bool = False,
+        as_columns: bool = False
+    ) -> Iterator[tuple] | Iterator[list[tuple]] | Iterator[dict[str]]:
+        """
+        Læser data fra en tabel løbende, i stedet for at hente hele resultatet på én gang.
 
-        :param limit: Begrænser antal læste rækker til et bestemt antal.
+        Tager de samme argumenter som ``.read()``, men bruger en unbuffered cursor
+        og henter ``batch_size`` rækker fra serveren ad gangen, så hukommelsesforbruget er konstant.
+        Uden pool er forbindelsen optaget, indtil generatoren er løbet igennem eller lukket,
+        så andre queries kan ikke køres på objektet imens.
+
+        :param table_name: Navnet på den tabel, som data skal læses fra.
+            *Påkrævet*.
+        :type table_name: str
+        :param column_name: Navnet eller navnene på den kolonne eller de kolonner, som data skal læses fra.
+            *Upåkrævet*.
+        :type column_name: str
+        :param joins: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type joins: list[dict[str]]
+        :param where: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type where: list[tuple] | dict[str]
+        :param order: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type order: int | str
+        :param direction: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``'a'``
+        :type direction: str
+        :param limit: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``0``
         :type limit: int
-        :param offset: Bestemmer, hvor mange rækker, der springes over,
-            inden læsning påbegyndes.
+        :param offset: Se ``.read()``.
             *Upåkrævet*. Standardværdi: ``0``
         :type offset: int
+        :param batch_size: Antallet af rækker, der hentes fra serveren ad gangen.
+            *Upåkrævet*. Standardværdi: ``1000``
+        :type batch_size: int
+        :param batches: Bestemmer, om der gives hele batches (lister af rækker) i stedet for enkelte rækker.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type batches: bool
+        :param as_columns: Bestemmer, om hver batch gives som kolonner i stedet for rækker. Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type as_columns: bool
+
+        :return: En generator, der giver én række (eller én batch af rækker) ad gangen.
+        :rtype: Iterator[tuple] | Iterator[list[tuple]]
+        :return: Hvis ``as_columns`` er sat, en generator, der giver én batch som en dict af kolonner ad gangen.
+        :rtype: Iterator[dict[str, numpy.ndarray | array.array | columns.StringColumn | list]]
+        """
+        # Queriet dannes (inkl. opslag i .info()), inden forbindelsen optages af den unbuffered cursor
+        compiled = self.compile(
+            table_name, *column_name,
+            joins=joins, where=where, order=order, direction=direction, limit=limit, offset=offset
+        )
+        if compiled is None:
+            return
+        select_query, select_params = compiled.sql, self._bind(compiled, limit, offset, where)
+        # Tælleren deles med andre tråde og .advise_indexes()
+        with self._queries_lock:
+            compiled.uses += 1
+        result_columns = compiled.result_columns if as_columns else []
+
+        self._preview(select_query)
+
+        count = 0
+        stream = self._stream(select_query, select_params, batch_size, "iter_read")
+        try:
+            for batch in stream:
+                count += len(batch)
+                if as_columns:
+                    yield columns.to_columns(batch, result_columns)
+                elif batches:
+                    yield batch
+                else:
+                    yield from batch
+        except Exception as err:
+            print(f"FEJL: Kunne ikke udføre handlingen. Følgende fejl opstod:\n    ", err)
+        else:
+            print(f"SUCCES: {count} rækker blev læst fra '{table_name}' problemfrit.")
+        finally:
+            # Lukker cursoren med det samme, hvis løkken hos kalderen blev afbrudt før tid
+            stream.close()
+
+    def _stream(self, select_query: str, select_params: dict[str], batch_size: int, api: str) -> Iterator[list[tuple]]:
+        """
+        Kører et SELECT-query med en unbuffered cursor og giver resultatet i batches. Se ``.iter_read()``.
+
+        Uden pool er forbindelsen optaget, indtil generatoren er løbet igennem eller lukket.
+
+        :param select_query: Queriet.
+            *Påkrævet*.
+        :type select_query: str
+        :param select_params: Queriets parametre.
+            *Påkrævet*.
+        :type select_params: dict[str]
+        :param batch_size: Antallet af rækker, der hentes fra serveren ad gangen.
+            *Påkrævet*.
+        :type batch_size: int
+        :param api: Navnet på metoden, som målingen af queriet registreres under.
+            *Påkrævet*.
+        :type api: str
+
+        :return: En generator, der giver én batch af rækker ad gangen.
+        :rtype: Iterator[list[tuple]]
+
+        :raises Exception: Hvis queriet fejler, så kalderen selv kan vise fejlen.
+        """
+        count = 0
+        started = time.perf_counter()
+        error = ''
+        try:
+            with self._checkout() as connection:
+                cursor = connection.cursor(buffered=False)
+                try:
+                    cursor.execute(select_query, select_params)
+                    while batch := cursor.fetchmany(batch_size):
+                        count += len(batch)
+                        yield batch
+                finally:
+                    # Resterende rækker skal læses færdigt, før forbindelsen kan bruges igen,
+                    # f.eks. hvis løkken hos kalderen blev afbrudt før tid
+                    connection.consume_results()
+                    cursor.close()
+        except Exception as err:
+            error = str(err)
+            raise
+        finally:
+            # Tiden inkluderer kalderens behandling af rækkerne, da de hentes løbende
+            if self.metrics is not None:
+                round_trips = 1 + count // batch_size
+                self.metrics.record(select_query, api, time.perf_counter() - started, round_trips, count, error)
+
+    def export(self,
+        source: str | query.Query,
+        filename: str,
+        format: str = "csv",
+        where: list[tuple] | dict[str] = [],
+        batch_size: int = 10000,
+        level: int = 6,
+        **params
+    ) -> int | None:
+        """
+        Eksporterer en tabel eller resultatet af et kompileret query til en fil.
+
+        Rækkerne hentes løbende fra serveren med en unbuffered cursor og skrives til filen i batches,
+        så hukommelsesforbruget ikke vokser med tabellens størrelse. Til sidst vises filens størrelse og hastigheden i MB/s.
+
+        - ``"csv"`` skriver en *.csv*-fil med samme opbygning som filerne i ``data``: En header med kolonnernes navne,
+          komma mellem felterne og datoer/tidspunkter på ISO-formen (TIME som ``HH:MM:SS``).
+          Felter med komma, anførselstegn eller linjeskift sættes i anførselstegn, og anførselstegn i dem fordobles,
+          som ``.load()`` (også med ``bulk=True``) forstår. NULL skrives som et tomt felt,
+          ligesom tomme felter i ``data``, og indlæses derfor igen som tom tekst.
+        - ``"columnar"`` skriver en komprimeret, binær kolonnefil med én row group pr. batch.
+          Se ``columns.ColumnWriter``. Filen kan læses igen med ``columns.read_column_file()``.
+
+        Eksempel::
+
+            db.export("orders", "orders_export.csv")
+            db.export(db.compile("orders", "id", "date_time", where=[("customer", '=', 0)]), "orders.cols", "columnar", where_0=23)
+
+        :param source: Navnet på tabellen eller et kompileret query fra ``.compile()``.
+            *Påkrævet*.
+        :type source: str | query.Query
+        :param filename: Stien til filen, der skrives til. En eksisterende fil overskrives.
+            *Påkrævet*.
+        :type filename: str
+        :param format: Filens format, ``"csv"`` eller ``"columnar"``.
+            *Upåkrævet*. Standardværdi: ``"csv"``
+        :type format: str
+        :param where: Betingelserne, som rækkerne i tabellen skal opfylde. Se ``.read()``.
+            Bruges ikke med et kompileret query, hvor betingelserne er en del af queriet.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type where: list[tuple] | dict[str]
+        :param batch_size: Antallet af rækker, der hentes fra serveren og skrives ad gangen.
+            *Upåkrævet*. Standardværdi: ``10000``
+        :type batch_size: int
+        :param level: zlib's komprimeringsniveau for ``"columnar"`` fra 0 (ingen) til 9 (mest).
+            *Upåkrævet*. Standardværdi: ``6``
+        :type level: int
+        :param params: Værdier til et kompileret querys parametre, f.eks. ``limit=10``. Se ``Query.bind()``.
+            *Upåkrævet*.
+        :type params: dict[str]
 
-        :return: En tuple bestående af en tekststreng til queriet,
-            samt en dict med parametre til eksekveringen af queriet.
-        :rtype: tuple[str, dict[str]]
+        :return: Antallet af eksporterede rækker.
+        :rtype: int
+        :return: Hvis formatet er ukendt, queriet ikke kan dannes eller køres, eller filen ikke kan skrives.
+        :rtype: None
         """
-        query = ''
-        params = {}
-        if isinstance(limit, int) and limit > 0:
-            query += " LIMIT %(limit)s"
-            params["limit"] = limit
-        if isinstance(offset, int) and offset > 0:
-            query += " OFFSET %(offset)s"
-            params["offset"] = offset
+        format = format.lower()
+        if format not in EXPORT_FORMATS:
+            print(f"FEJL: Ukendt format '{format}'. Brug en af {', '.join(EXPORT_FORMATS)}.")
+            return None
+
+        if isinstance(source, query.Query):
+            if where:
+                print("FEJL: 'where' kan ikke bruges med et kompileret query. Angiv betingelserne i .compile() i stedet.")
+                return None
+            compiled = source
+            select_params = compiled.bind(**params)
+        else:
+            compiled = self.compile(source, where=where)
+            if compiled is None:
+                return None
+            select_params = self._bind(compiled, where=where)
+        if select_params is None:
+            return None
+        # Kolonnerne slås op, inden forbindelsen optages af den unbuffered cursor
+        result_columns = compiled.result_columns
+        # Tælleren deles med andre tråde og .advise_indexes()
+        with self._queries_lock:
+            compiled.uses += 1
+
+        self._preview(compiled.sql)
+
+        count = 0
+        start = time.perf_counter()
+        stream = self._stream(compiled.sql, select_params, max(batch_size, 1), "export")
+        try:
+            if format == "csv":
+                with open(filename, 'w', encoding="utf-8", newline='') as file:
+                    writer = csv.writer(file, lineterminator='\n')
+                    writer.writerow(name for name, _ in result_columns)
+                    for batch in stream:
+                        writer.writerows([self._csv_value(value) for value in row] for row in batch)
+                        count += len(batch)
+            else:
+                with open(filename, 'wb') as file:
+                    writer = columns.ColumnWriter(file, result_columns, level)
+                    for batch in stream:
+                        writer.write(batch)
+                        count += len(batch)
+        except Exception as err:
+            print(f"FEJL: Kunne ikke eksportere til filen '{filename}'. Følgende fejl opstod:\n    ", err)
+            return None
+        finally:
+            stream.close()
+
+        elapsed = time.perf_counter() - start
+        megabytes = os.path.getsize(filename) / 2**20
+        print(
+            f"SUCCES: Eksporterede {count} rækker fra '{compiled.table_name}' til '{filename}' "
+            f"({megabytes:.2f} MB) på {elapsed:.2f} s ({megabytes / elapsed if elapsed else 0:.1f} MB/s)."
+        )
+        return count
+
+    def _csv_value(self, value) -> str:
+        """
+        Formaterer en værdi fra databasen som et felt i en *.csv*-fil. Se ``.export()``.
 
-        return query, params
+        :param value: Værdien, som den er læst fra databasen.
+            *Påkrævet*.
+        :type value: Any
+
+        :return: Feltet.
+        :rtype: str
+        """
+        if value is None:
+            return ''
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, datetime.timedelta):
+            # TIME læses som timedelta, hvor str() giver f.eks. "1 day, 6:00:00". MySQL's form er HH:MM:SS
+            sign, value = ('-', -value) if value < datetime.timedelta(0) else ('', value)
+            minutes, seconds = divmod(value.days * 86400 + value.seconds, 60)
+            hours, minutes = divmod(minutes, 60)
+            return f"{sign}{hours:02}:{minutes:02}:{seconds:02}" + (f".{value.microseconds:06}" if value.microseconds else '')
+        if isinstance(value, (bytes, bytearray)):
+            return value.decode()
+        return str(value)
+
+    def pages(self,
+        table_name: str,
+        *column_name: str,
+        joins: list[dict[str]] = [],
+        where: list[tuple] | dict[str] = [],
+        order: str = '',
+        direction: str = 'a',
+        page_size: int = 1000
+    ) -> Iterator[list[tuple]]:
+        """
+        Læser en tabel side for side ved at søge videre fra den sidst læste nøgle (keyset pagination).
+
+        I stedet for ``LIMIT ... OFFSET ...``, hvor serveren skal læse og kassere alle rækker op til offsettet,
+        hentes hver side med ``WHERE nøgle > sidste_nøgle ORDER BY nøgle LIMIT page_size``.
+        Det koster derfor det samme at hente en side, uanset hvor langt inde i tabellen den ligger.
+
+        :param table_name: Navnet på den tabel, som data skal læses fra.
+            *Påkrævet*.
+        :type table_name: str
+        :param column_name: Navnet eller navnene på den kolonne eller de kolonner, som data skal læses fra.
+            *Upåkrævet*.
+        :type column_name: str
+        :param joins: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type joins: list[dict[str]]
+        :param where: Se ``.read()``. Kombineres med betingelsen for den sidst læste nøgle.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type where: list[tuple] | dict[str]
+        :param order: Kolonnen i ``table_name``, som der bladres efter.
+            Bør være indekseret og unik, da rækker med samme værdi ellers kan springes over mellem to sider.
+            Er den tom, bruges tabellens primary key.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type order: str
+        :param direction: Angiver hvilken retning, der bladres i.
+            ``'a'``, ``"asc"`` eller ``"ascending"`` er opadgående rækkefølge, mens
+            ``'d'``, ``"desc"`` eller ``"descending"`` er nedadgående rækkefølge.
+            *Upåkrævet*. Standardværdi: ``'a'``
+        :type direction: str
+        :param page_size: Antallet af rækker på hver side.
+            *Upåkrævet*. Standardværdi: ``1000``
+        :type page_size: int
+
+        :return: En generator, der giver én side (en liste af rækker) ad gangen.
+        :rtype: Iterator[list[tuple]]
+        """
+        table_info = self.info(table_name)
+        if not table_info:
+            return
+        table_columns = [column[0] for column in table_info]
+
+        # Finder tabellens primary key, hvis der ikke er angivet en kolonne
+        key = order
+        if not key:
+            primary_keys = [column[0] for column in table_info if column[3] == "PRI"]
+            if len(primary_keys) != 1:
+                print(f"FEJL: Tabellen '{table_name}' har ikke en primary key med én kolonne. Angiv en kolonne med 'order'.")
+                return
+            key = primary_keys[0]
+        if key not in table_columns:
+            print(f"FEJL: Kolonnen '{key}' findes ikke i tabellen '{table_name}'.")
+            return
+        key_reference = self._format_column(f"{table_name}.{key}")
+
+        # Nøglen skal være med i resultatet, så den sidst læste værdi kendes.
+        # Er den ikke valgt, tilføjes den til sidst og fjernes igen fra rækkerne
+        added_key = False
+        if not column_name:
+            # Ved SELECT * kommer den første tabels kolonner først
+            key_index = table_columns.index(key)
+        elif key in column_name or f"{table_name}.{key}" in column_name:
+            key_index = column_name.index(key if key in column_name else f"{table_name}.{key}")
+        else:
+            column_name = (*column_name, f"{table_name}.{key}")
+            key_index = len(column_name) - 1
+            added_key = True
+
+        # Basisqueriet uden sortering (order=-1), limit og offset
+        try:
+            base_query, base_params = self._select(table_name, column_name, joins, order=-1, where=where)
+        except (ValueError, TypeError) as err:
+            print(f"FEJL: Betingelserne i 'where' er ugyldige:\n    ", err)
+            return
+
+        descending = direction.lower() in ['d', "desc", "descending"]
+        seek_query = f" {'AND' if where else 'WHERE'} {key_reference} {'<' if descending else '>'} %(last_key)s"
+        page_query = f" ORDER BY {key_reference} {'DESC' if descending else 'ASC'} LIMIT %(page_size)s"
+
+        last_key = None
+        for page_number in itertools.count():
+            select_query = base_query
+            select_params = {**base_params, "page_size": page_size}
+            # Den første side starter fra begyndelsen, de næste fra den sidst læste nøgle
+            if last_key is not None:
+                select_query += seek_query
+                select_params["last_key"] = last_key
+            select_query += page_query
+
+            # Forhåndsviser kun queriet for den første side og den første fortsættelse
+            if page_number < 2:
+                self._preview(select_query)
+
+            page = self._execute(select_query, select_params, read=True, prepared=self.prepared, api="pages")
+            if not page:
+                return
+            last_key = page[-1][key_index]
+            if added_key:
+                page = [row[:-1] for row in page]
+            yield page
+            if len(page) < page_size:
+                return
 
     # TODO: Lav måske en slags auto-join ud fra foreign keys
     def _join(self,
@@ -557,24 +2423,16 @@ class Database(connector.DatabaseConnector):
         if on_left not in left_columns or on_right not in right_columns:
             return ''
 
-        join_query = ' '
-        if join_type in ['i', "inner"]:
-            join_query += "INNER "
-        elif join_type in ['o', "outer"]:
-            join_query += "OUTER "
-        elif join_type in ['l', "left"]:
-            join_query += "LEFT "
-        elif join_type in ['r', "right"]:
-            join_query += "RIGHT "
-
-        join_query += f"JOIN `{right}` ON `{left}`.`{on_left}` = `{right}`.`{on_right}`"
-
-        return join_query
+        return self._join_clause(left, right, on_left, on_right, join_type)
 
     def info(self, table_name: str = '') -> list[tuple] | None:
         """
         Henter info om databasens eller en tabels opbygning.
 
+        Infoen gemmes i en cache, så den kun hentes fra serveren første gang.
+        Cachen ryddes automatisk, når en tabels opbygning ændres gennem objektet,
+        eller manuelt med ``.refresh()``.
+
         :param table_name: Navnet på tabellen, hvis info efterspørges.
             Hvis navnet er tomt, hentes info om databasen.
             *Påkrævet*. Standardværdi: ``''``
@@ -587,10 +2445,14 @@ class Database(connector.DatabaseConnector):
         :return: Hvis READ-operationen ikke kunne gennemføres.
         :rtype: None
         """
+        # Springer forespørgslen over, hvis infoen allerede er hentet
+        if table_name in self._schema:
+            return self._schema[table_name]
+
         describe_query = ''
         if table_name:
             describe_query = f"DESCRIBE `{table_name}`"
-        elif self.connection.database is not None:
+        elif self.database:
             describe_query = "SHOW TABLES"
 
         if not describe_query:
@@ -598,78 +2460,574 @@ class Database(connector.DatabaseConnector):
 
         self._preview(describe_query)
 
-        table_info = self._execute(describe_query, read=True)
+        table_info = self._execute(describe_query, read=True, api="info")
         if table_info:
             if table_name:
                 print(f"SUCCES: Hentede info om tabellen '{table_name}'.")
             else:
                 print(f"SUCCES: Hentede info om databasen '{self.database}'.")
+            self._schema[table_name] = table_info
             return table_info
 
+    def refresh(self, table_name: str = '') -> list[tuple] | None:
+        """
+        Rydder den gemte info om en tabel (eller om hele databasen) og henter den igen fra serveren.
+
+        Bruges, hvis databasen er blevet ændret udenom objektet, f.eks. af en anden klient.
+
+        :param table_name: Navnet på tabellen, hvis info skal genindlæses.
+            Hvis navnet er tomt, ryddes infoen om alle tabeller, og listen over tabeller genindlæses.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type table_name: str
+
+        :return: Den genindlæste info, som i ``.info()``.
+        :rtype: list[tuple] | None
+        """
+        self._invalidate(table_name)
+        self._invalidate_results(table_name)
+        return self.info(table_name)
+
+    def _invalidate(self, table_name: str = '') -> None:
+        """
+        Fjerner info om en tabel fra cachen, efter at tabellens opbygning er blevet ændret.
+
+        Listen over databasens tabeller fjernes altid også, da tabellen kan være oprettet eller fjernet.
+
+        :param table_name: Navnet på tabellen, der er ændret.
+            Hvis navnet er tomt, ryddes hele cachen.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type table_name: str
+        """
+        # Kompilerede queries kan afhænge af tabellens opbygning, f.eks. i valideringen af joins
+        with self._queries_lock:
+            for spec in [spec for spec, compiled in self._queries.items() if not table_name or table_name in compiled.tables]:
+                del self._queries[spec]
+        if not table_name:
+            self._schema.clear()
+            return
+        self._schema.pop(table_name, None)
+        self._schema.pop('', None)
+
     # UPDATE-operationer
     def update(self,
         table_name: str,
-        where: str,
-        old_value,
-        change: str,
-        new_value
-    ) -> None:
+        changes: dict[str],
+        where: list[tuple] | dict[str] = [],
+        keys: Iterable | None = None,
+        key_column: str = '',
+        batch_size: int = 1000,
+        force: bool = False
+    ) -> int | None:
         """
-        _summary_
+        Opdaterer de rækker i en tabel, der passer til betingelserne i ``where`` og/eller har en af nøglerne i ``keys``.
+
+        Rækkerne opdateres samlet med ét UPDATE-query for hver bid af højst ``batch_size`` rækker,
+        og hver bid committes for sig, så en stor opdatering ikke låser tabellen i lang tid ad gangen.
+        Med ``keys`` opdateres rækkerne i bidder med ``WHERE nøgle IN (...)``.
+        Ellers findes nøglerne til hver bid først med et SELECT, der fortsætter efter den sidste nøgle i den forrige bid,
+        så rækker, der stadig passer til betingelserne efter opdateringen, ikke opdateres igen.
+        Har tabellen ikke en primary key med én kolonne, og er ``key_column`` ikke angivet,
+        opdateres alle rækkerne i stedet med ét query.
+        I en ``.transaction()`` committes der først, når transaktionen er færdig.
+
+        Eksempel::
+
+            db.update("products", {"price": 0}, where=[("name", "LIKE", "Gratis%")])
+            db.update("orders", {"product": 2}, keys=[1, 2, 3])
 
         :param table_name: Tabellen, hvori data skal opdateres.
+            *Påkrævet*.
+        :type table_name: str
+        :param changes: Kolonnerne, der skal ændres, og deres nye værdier.
+            *Påkrævet*.
+        :type changes: dict[str]
+        :param where: Betingelserne, som rækkerne skal opfylde. Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type where: list[tuple] | dict[str]
+        :param keys: Værdierne af ``key_column`` for de rækker, der skal opdateres.
+            Er den ``None``, bruges kun betingelserne i ``where``.
+            *Upåkrævet*. Standardværdi: ``None``
+        :type keys: Iterable | None
+        :param key_column: Kolonnen, som ``keys`` og bidderne bruger. Er den tom, bruges tabellens primary key.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type key_column: str
+        :param batch_size: Det maksimale antal rækker, der opdateres med hvert query.
+            *Upåkrævet*. Standardværdi: ``1000``
+        :type batch_size: int
+        :param force: Bestemmer om bekræftelse springes over, når hverken ``where`` eller ``keys`` er angivet,
+            så alle rækker i tabellen opdateres.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type force: bool
+
+        :return: Antallet af ændrede rækker. Rækker, der allerede havde de nye værdier, tælles ikke med.
+        :rtype: int
+        :return: Hvis tabellen eller en kolonne ikke findes, hvis betingelserne er ugyldige, eller hvis handlingen afbrydes.
+        :rtype: None
+        """
+        table_info = self.info(table_name)
+        if not table_info:
+            return None
+        table_columns = [column[0] for column in table_info]
+        if not changes:
+            print("FEJL: Der er ingen kolonner at ændre.")
+            return None
+        for column in changes:
+            if column not in table_columns:
+                print(f"FEJL: Kolonnen '{column}' findes ikke i tabellen '{table_name}'.")
+                return None
+
+        # Værdierne hedder set_0, set_1 osv., så de ikke kolliderer med betingelsernes parametre
+        set_params = {f"set_{index}": value for index, value in enumerate(changes.values())}
+        update_query = f"UPDATE `{table_name}` SET " + ", ".join(
+            f"`{column}` = %(set_{index})s" for index, column in enumerate(changes)
+        )
+        return self._change_rows(table_name, update_query, set_params, where, keys, key_column, batch_size, force, "opdatere", "update")
+
+    def _change_rows(self,
+        table_name: str,
+        statement: str,
+        params: dict[str],
+        where: list[tuple] | dict[str],
+        keys: Iterable | None,
+        key_column: str,
+        batch_size: int,
+        force: bool,
+        action: str,
+        api: str
+    ) -> int | None:
+        """
+        Kører et UPDATE- eller DELETE-query i bidder af højst ``batch_size`` rækker. Se ``.update()`` og ``.delete()``.
+
+        Ved DELETE gentages queriet med ``LIMIT``, indtil der ikke er flere rækker, der passer til betingelserne,
+        da slettede rækker ikke kan blive fundet igen.
+
+        :param table_name: Tabellen, hvori data skal ændres.
+            *Påkrævet*.
         :type table_name: str
-        :param where: Kolonnen, hvor WHERE tjekkes.
-        :type where: str
-        :param old_value: Værdien, der tjekkes efter i WHERE.
-        :type old_value: Any
-        :param change: Kolonnen, hvor værdien ændres.
-        :type change: str
-        :param new_value: Værdien, der ændres til.
-        :type new_value: Any
-        """
-        # UPDATE TABLE table_name
-        # SET change = new_value
-        # WHERE where = old_value
-        pass
+        :param statement: Queriet uden WHERE-del, f.eks. ``"DELETE FROM `orders`"``.
+            *Påkrævet*.
+        :type statement: str
+        :param params: Parametrene til queriet uden WHERE-del.
+            *Påkrævet*.
+        :type params: dict[str]
+        :param where: Betingelserne, som rækkerne skal opfylde.
+            *Påkrævet*.
+        :type where: list[tuple] | dict[str]
+        :param keys: Nøglerne for de rækker, der skal ændres, eller ``None``.
+            *Påkrævet*.
+        :type keys: Iterable | None
+        :param key_column: Kolonnen med nøglerne, eller en tom tekststreng for tabellens primary key.
+            *Påkrævet*.
+        :type key_column: str
+        :param batch_size: Det maksimale antal rækker, der ændres med hvert query.
+            *Påkrævet*.
+        :type batch_size: int
+        :param force: Bestemmer om bekræftelse springes over, når alle rækker ændres.
+            *Påkrævet*.
+        :type force: bool
+        :param action: Handlingen i bekræftelsen og beskederne, f.eks. ``"slette"``.
+            *Påkrævet*.
+        :type action: str
+        :param api: Navnet på metoden, som målingerne af queries registreres under, f.eks. ``"delete"``.
+            *Påkrævet*.
+        :type api: str
+
+        :return: Antallet af ændrede rækker, som i ``.update()``.
+        :rtype: int | None
+        """
+        table_columns = [column[0] for column in self.info(table_name) or []]
+        if key_column and key_column not in table_columns:
+            print(f"FEJL: Kolonnen '{key_column}' findes ikke i tabellen '{table_name}'.")
+            return None
+        if not key_column:
+            primary_key = [column[0] for column in self.info(table_name) or [] if column[3] == "PRI"]
+            key_column = primary_key[0] if len(primary_key) == 1 else ''
+        if keys is not None and not key_column:
+            print(f"FEJL: Tabellen '{table_name}' har ikke en primary key med én kolonne. Angiv 'key_column'.")
+            return None
+
+        # Betingelserne tjekkes én gang, før der ændres noget. Bidderne lægger deres egen betingelse til
+        conditions = [where] if isinstance(where, dict) else list(where)
+        try:
+            if conditions:
+                self._where(conditions)
+        except (ValueError, TypeError) as err:
+            print(f"FEJL: Betingelserne i 'where' er ugyldige:\n    ", err)
+            return None
+
+        # Det er altid godt at bekræfte, når alle rækker ændres
+        if keys is None and not conditions:
+            confirmation = f"Er du sikker på, at du gerne vil {action} alle rækker i tabellen '{table_name}'? (j/N) "
+            if not force and input(confirmation).lower() not in ['j', 'y']:
+                return None
+
+        def clause(items: list) -> tuple[str, dict[str]]:
+            return self._where(items) if items else ('', {})
+
+        key = f"`{key_column}`"
+        batch_size = max(batch_size, 1)
+        changed = 0
+        chunks = 0
+        start = time.perf_counter()
+
+        def run(query: str, query_params: dict[str]) -> int | bool:
+            nonlocal changed, chunks
+            # Kun det første query vises, da resten kun adskiller sig ved deres værdier
+            if not chunks:
+                self._preview(query)
+            executed = self._execute(query, {**params, **query_params}, count=True, api=api)
+            if executed is not False:
+                changed += executed
+                chunks += 1
+                if chunks > 1:
+                    elapsed = time.perf_counter() - start
+                    print(f"    {changed} rækker ændret i '{table_name}' ({changed / elapsed if elapsed else 0:.0f} rækker/s)")
+            return executed
+
+        # Alle bidder køres på samme forbindelse
+        with self._reserve():
+            if keys is not None:
+                key_iterator = iter(keys)
+                while chunk := list(itertools.islice(key_iterator, batch_size)):
+                    chunk_clause, chunk_params = clause([*conditions, (key_column, "IN", chunk)])
+                    if run(statement + chunk_clause, chunk_params) is False:
+                        break
+            elif statement.startswith("DELETE"):
+                # Slettede rækker passer ikke længere til betingelserne, så samme query gentages, til der ikke er flere
+                where_clause, where_params = clause(conditions)
+                delete_query = statement + where_clause + (f" ORDER BY {key}" if key_column else '') + f" LIMIT {batch_size}"
+                while True:
+                    executed = run(delete_query, where_params)
+                    if executed is False or executed < batch_size:
+                        break
+            elif key_column:
+                last_key = None
+                while True:
+                    select_clause, select_params = clause(conditions if last_key is None else [*conditions, (key_column, '>', last_key)])
+                    select_query = f"SELECT {key} FROM `{table_name}`{select_clause} ORDER BY {key} LIMIT {batch_size}"
+                    found = self._execute(select_query, select_params, read=True, api=api)
+                    if not found:
+                        break
+                    # Rækkerne findes igen ud fra deres nøgler, så bidden ændrer præcis de fundne rækker
+                    chunk = [row[0] for row in found]
+                    chunk_clause, chunk_params = clause([(key_column, "IN", chunk)])
+                    if run(statement + chunk_clause, chunk_params) is False:
+                        break
+                    last_key = chunk[-1]
+                    if len(chunk) < batch_size:
+                        break
+            else:
+                where_clause, where_params = clause(conditions)
+                run(statement + where_clause, where_params)
+
+        self._invalidate_results(table_name)
+        elapsed = time.perf_counter() - start
+        print(f"SUCCES: {changed} rækker data ændret i tabellen '{table_name}' med {chunks} queries på {elapsed:.2f} s.")
+        return changed
 
     def add(self, table_name: str, column_name: str, datatype: str) -> None:
-        # ALTER TABLE table_name ADD colum_name datatype
-        pass
+        """
+        Tilføjer en ny kolonne til en tabel.
+
+        :param table_name: Navnet på tabellen.
+            *Påkrævet*.
+        :type table_name: str
+        :param column_name: Navnet på den nye kolonne.
+            *Påkrævet*.
+        :type column_name: str
+        :param datatype: Kolonnens datatype, f.eks. ``"VARCHAR(80) NOT NULL DEFAULT ''"``.
+            *Påkrævet*.
+        :type datatype: str
+        """
+        add_query = f"ALTER TABLE `{table_name}` ADD COLUMN `{column_name}` {datatype}"
+
+        self._preview(add_query)
+
+        if self._execute(add_query, api="add"):
+            # Cachen ryddes først, når ændringen er gennemført, så en fejl ikke smider gyldige resultater væk
+            self._invalidate(table_name)
+            self._invalidate_results(table_name)
+            print(f"SUCCES: Tilføjede kolonnen '{column_name}' til tabellen '{table_name}'.")
 
     def modify(self, table_name: str, column_name: str, datatype: str) -> None:
-        # ALTER TABLE table_name MODIFY COLUMN column_name datatype
-        pass
+        """
+        Ændrer datatypen for en kolonne i en tabel.
+
+        Serveren omregner kolonnens eksisterende værdier til den nye datatype.
+        NB! Datatypen erstatter hele kolonnens definition, så ``NOT NULL`` skal angives igen, hvis det skal bevares.
+
+        :param table_name: Navnet på tabellen.
+            *Påkrævet*.
+        :type table_name: str
+        :param column_name: Navnet på kolonnen, der skal ændres.
+            *Påkrævet*.
+        :type column_name: str
+        :param datatype: Kolonnens nye datatype, f.eks. ``"SMALLINT NOT NULL"``.
+            *Påkrævet*.
+        :type datatype: str
+        """
+        modify_query = f"ALTER TABLE `{table_name}` MODIFY COLUMN `{column_name}` {datatype}"
+
+        self._preview(modify_query)
+
+        if self._execute(modify_query, api="modify"):
+            self._invalidate(table_name)
+            self._invalidate_results(table_name)
+            print(f"SUCCES: Ændrede datatypen for kolonnen '{column_name}' i tabellen '{table_name}' til {datatype}.")
 
     def primary_key(self, table_name: str, column_name: str) -> None:
         alter_query = f"ALTER TABLE `{table_name}` ADD PRIMARY KEY (`{column_name}`)"
 
         self._preview(alter_query)
-        if self._execute(alter_query):
+        self._invalidate(table_name)
+        if self._execute(alter_query, api="primary_key"):
             print(f"SUCCES: Tilføjede kolonnen '{column_name}' som primary key for tabellen '{table_name}'")
 
     def foreign_key(self, table_name: str, foreign_key: dict[str]) -> None:
         alter_queries = []
         for key in foreign_key:
             split_key = foreign_key[key].split('.')
+            # MySQL kræver, at begge kolonner har samme datatype. Da datatyperne udledes af dataene,
+            # kan f.eks. en TINYINT referere til en SMALLINT, så kolonnen får først den refererede kolonnes type.
+            # Kolonnen beholder sin NULL/NOT NULL, da den kan have tomme værdier
+            column_type = self._column_type(table_name, key)
+            referenced_type = self._column_type(split_key[0], split_key[1])
+            if column_type and referenced_type and column_type != referenced_type:
+                nullable = any(column[0] == key and column[2] == "YES" for column in self.info(table_name) or [])
+                alter_queries.append(f"ALTER TABLE `{table_name}` MODIFY `{key}` {referenced_type}{'' if nullable else ' NOT NULL'}")
             alter_query = f"ALTER TABLE `{table_name}` "
             alter_query += f"ADD FOREIGN KEY (`{key}`) REFERENCES `{split_key[0]}`(`{split_key[1]}`)"
             alter_queries.append(alter_query)
 
-        for query in alter_queries:
-            self._preview(query)
-            if self._execute(query):
+        self._invalidate(table_name)
+        for foreign_key_query in alter_queries:
+            self._preview(foreign_key_query)
+            if self._execute(foreign_key_query, api="foreign_key"):
                 print(f"SUCCES: Tilføjede foreign key til tabellen '{table_name}'.")
 
+    def _column_type(self, table_name: str, column_name: str) -> str:
+        """
+        Finder en kolonnes datatype ud fra tabellens info.
+
+        :param table_name: Navnet på tabellen.
+            *Påkrævet*.
+        :type table_name: str
+        :param column_name: Navnet på kolonnen.
+            *Påkrævet*.
+        :type column_name: str
+
+        :return: Kolonnens datatype, f.eks. ``"tinyint"`` eller ``"varchar(80)"``.
+        :rtype: str
+        :return: Hvis tabellen eller kolonnen ikke findes.
+        :rtype: str: ``''``
+        """
+        for column in self.info(table_name) or []:
+            if column[0] == column_name:
+                # Nogle versioner af mysql.connector giver typen som bytes
+                return column[1].decode() if isinstance(column[1], (bytes, bytearray)) else column[1]
+        return ''
+
+
+    def index(self,
+        table_name: str,
+        *column_name: str | tuple[str, int],
+        unique: bool = False,
+        index_name: str = ''
+    ) -> None:
+        """
+        Opretter et indeks på en eller flere kolonner i en tabel.
+
+        :param table_name: Navnet på tabellen.
+            *Påkrævet*.
+        :type table_name: str
+        :param column_name: Kolonnen eller kolonnerne, der skal indekseres, i rækkefølge.
+            Et indeks på flere kolonner kan bruges til opslag på de første af dem.
+            En kolonne kan gives som ``(kolonne, længde)``, så kun de første tegn indekseres,
+            f.eks. ``("email", 10)``.
+            *Påkrævet*.
+        :type column_name: str | tuple[str, int]
+        :param unique: Bestemmer, om indekset kræver, at værdierne er unikke.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type unique: bool
+        :param index_name: Navnet på indekset. Er det tomt, dannes det ud fra tabellen og kolonnerne.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type index_name: str
+        """
+        if not column_name:
+            print(f"FEJL: Der skal angives mindst én kolonne at indeksere i tabellen '{table_name}'.")
+            return
+
+        columns = []
+        names = []
+        for column in column_name:
+            if isinstance(column, tuple):
+                name, length = column
+                columns.append(f"`{name}`({int(length)})")
+            else:
+                name = column
+                columns.append(f"`{name}`")
+            names.append(name)
+        # MySQL tillader højst 64 tegn i navnet
+        index_name = index_name if index_name else f"idx_{table_name}_{'_'.join(names)}"[:64]
+
+        index_query = f"CREATE {'UNIQUE ' if unique else ''}INDEX `{index_name}` ON `{table_name}` ({', '.join(columns)})"
+
+        self._preview(index_query)
+        # Kolonnernes Key i tabellens info ændres
+        self._invalidate(table_name)
+        if self._execute(index_query, api="index"):
+            print(f"SUCCES: Oprettede indekset '{index_name}' på tabellen '{table_name}'.")
+
+    def indexes(self, table_name: str) -> list[tuple] | None:
+        """
+        Henter info om en tabels indekser.
+
+        :param table_name: Navnet på tabellen.
+            *Påkrævet*.
+        :type table_name: str
+
+        :return: En liste med en række for hver kolonne i hvert indeks, som ``SHOW INDEX`` giver den,
+            dvs. bl.a. tabel, om indekset ikke er unikt, indeksets navn, kolonnens plads i indekset og kolonnens navn.
+        :rtype: list[tuple]
+        :return: Hvis READ-operationen ikke kunne gennemføres.
+        :rtype: None
+        """
+        index_query = f"SHOW INDEX FROM `{table_name}`"
+
+        self._preview(index_query)
+
+        result = self._execute(index_query, read=True, api="indexes")
+        if result is not False:
+            return result
+
+    def advise_indexes(self, min_uses: int = 10, create: bool = False) -> list[dict[str]]:
+        """
+        Finder kolonner, der mangler et indeks, ud fra de queries, der er kørt flest gange med ``.read()``.
+
+        For hvert kompileret query, der er kørt mindst ``min_uses`` gange, køres ``EXPLAIN``.
+        Gennemløber serveren en hel tabel (type ``ALL``), foreslås et indeks på tabellens join-kolonne.
+        Skal serveren sortere resultatet selv (``Using filesort``), foreslås et indeks på sorteringskolonnen,
+        hvis den er i queriets første tabel.
+        Kolonner, der allerede er den første kolonne i et indeks, springes over.
+
+        :param min_uses: Antallet af gange, et query mindst skal være kørt for at blive undersøgt.
+            *Upåkrævet*. Standardværdi: ``10``
+        :type min_uses: int
+        :param create: Bestemmer, om de foreslåede indekser også oprettes.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type create: bool
+
+        :return: En liste med et forslag for hver kolonne, som en dict med tabellen, kolonnen,
+            årsagen (``"join"`` eller ``"sort"``), antal kørsler af queriet og selve queriet.
+        :rtype: list[dict[str]]
+        """
+        with self._queries_lock:
+            hot = sorted((compiled for compiled in self._queries.values() if compiled.uses >= min_uses), key=lambda compiled: -compiled.uses)
+
+        suggestions = {}
+        indexed = {}
+        for compiled in hot:
+            plan = self._execute(f"EXPLAIN {compiled.sql}", compiled.params, read=True, api="advise_indexes")
+            if not plan:
+                continue
+
+            # Kolonnerne, der kan have gavn af et indeks, i hver tabel
+            candidates = []
+            for join in compiled.joins:
+                candidates.append((join["right"], join["on_right"], "join"))
+                candidates.append((join.get("left", compiled.table_name), join["on_left"], "join"))
+            # Rækkerne fra EXPLAIN: id, select_type, table, partitions, type, possible_keys, key, key_len, ref, rows, filtered, Extra
+            # Tabellen, som MySQL læser først, læses altid helt, når der ikke er en WHERE-betingelse,
+            # men de andre tabeller bør slås op med et indeks for hver række.
+            # MySQL kan selv vælge rækkefølgen af tabellerne, så den første tabel er ikke nødvendigvis FROM-tabellen
+            tables = [row[2] for row in plan if row[2] in compiled.tables]
+            driving = tables[0] if tables else ''
+            full_scans = {row[2] for row in plan if row[2] in compiled.tables and row[2] != driving and row[4] == "ALL"}
+            # Et indeks kan kun spare sorteringen, hvis der sorteres efter en kolonne i den tabel, der læses først
+            table, _, column = compiled.order.rpartition('.')
+            if compiled.order and (table or compiled.table_name) == driving:
+                candidates.append((driving, column, "sort"))
+            filesort = any("filesort" in (row[11] or '') for row in plan)
+
+            for table, column, reason in candidates:
+                if (reason == "join" and table not in full_scans) or (reason == "sort" and not filesort):
+                    continue
+                if table not in indexed:
+                    indexed[table] = {row[4] for row in self.indexes(table) or [] if row[3] == 1}
+                if column in indexed[table] or (table, column) in suggestions:
+                    continue
+                suggestions[(table, column)] = {
+                    "table": table,
+                    "column": column,
+                    "reason": reason,
+                    "uses": compiled.uses,
+                    "query": compiled.sql
+                }
+
+        for suggestion in suggestions.values():
+            if create:
+                self.index(suggestion["table"], suggestion["column"])
+            else:
+                print(
+                    f"Forslag: Indeks på '{suggestion['table']}.{suggestion['column']}' ({suggestion['reason']}), "
+                    f"brugt {suggestion['uses']} gange i: {suggestion['query']}"
+                )
+        return list(suggestions.values())
 
     # DELETE-operationer
-    def delete(self, table_name: str, where: str, value: str) -> None:
-        # DELETE FROM table_name WHERE where = value
-        # if not where and not value:
-        #   DELETE FROM table_name
-        # (langsommere end TRUNCATE / self.empty(),
-        # fordi det gemmer til transaktionsloggen og kan rulles tilbage)
-        pass
+    def delete(self,
+        table_name: str,
+        where: list[tuple] | dict[str] = [],
+        keys: Iterable | None = None,
+        key_column: str = '',
+        batch_size: int = 1000,
+        force: bool = False
+    ) -> int | None:
+        """
+        Sletter de rækker i en tabel, der passer til betingelserne i ``where`` og/eller har en af nøglerne i ``keys``.
+
+        Rækkerne slettes i bidder af højst ``batch_size`` rækker, og hver bid committes for sig,
+        så en stor sletning ikke låser tabellen i lang tid ad gangen.
+        Med ``keys`` slettes rækkerne i bidder med ``WHERE nøgle IN (...)``,
+        og ellers gentages ``DELETE ... LIMIT``, indtil der ikke er flere rækker, der passer til betingelserne.
+        Skal alle rækker slettes, er ``.empty()`` hurtigere, men den kan ikke rulles tilbage.
+
+        Eksempel::
+
+            db.delete("orders", where=[("date_time", '<', "2020-01-01")])
+            db.delete("orders", keys=[1, 2, 3])
+
+        :param table_name: Tabellen, hvori data skal slettes.
+            *Påkrævet*.
+        :type table_name: str
+        :param where: Betingelserne, som rækkerne skal opfylde. Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type where: list[tuple] | dict[str]
+        :param keys: Værdierne af ``key_column`` for de rækker, der skal slettes.
+            Er den ``None``, bruges kun betingelserne i ``where``.
+            *Upåkrævet*. Standardværdi: ``None``
+        :type keys: Iterable | None
+        :param key_column: Kolonnen, som ``keys`` og sorteringen af bidderne bruger.
+            Er den tom, bruges tabellens primary key.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type key_column: str
+        :param batch_size: Det maksimale antal rækker, der slettes med hvert query.
+            *Upåkrævet*. Standardværdi: ``1000``
+        :type batch_size: int
+        :param force: Bestemmer om bekræftelse springes over, når hverken ``where`` eller ``keys`` er angivet,
+            så alle rækker i tabellen slettes.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type force: bool
+
+        :return: Antallet af slettede rækker.
+        :rtype: int
+        :return: Hvis tabellen eller en kolonne ikke findes, hvis betingelserne er ugyldige, eller hvis handlingen afbrydes.
+        :rtype: None
+        """
+        if not self.info(table_name):
+            return None
+        delete_query = f"DELETE FROM `{table_name}`"
+        return self._change_rows(table_name, delete_query, {}, where, keys, key_column, batch_size, force, "slette", "delete")
 
     # TODO: DROP kan også bruges på en hel database eller en kolonne:
     # DROP DATABASE database
@@ -693,9 +3051,29 @@ class Database(connector.DatabaseConnector):
         confirmation = f"Er du sikker på, at du gerne vil nulstille databasen '{self.database}'? (j/N) "
         if force or input(confirmation).lower() in ['j', 'y']:
             # Hvis query gennemføres problemfrit, printes positivt resultat
-            if self._execute(drop_query):
+            if self._execute(drop_query, api="drop"):
+                self._invalidate(table_name)
+                self._invalidate_results(table_name)
                 print(f"SUCCES: Tabellen '{table_name}' blev fjernet.")
 
+    def drop_index(self, table_name: str, index_name: str) -> None:
+        """
+        Fjerner et indeks fra en tabel. Dataene i tabellen ændres ikke.
+
+        :param table_name: Navnet på tabellen.
+            *Påkrævet*.
+        :type table_name: str
+        :param index_name: Navnet på indekset, f.eks. fra ``.indexes()``.
+            *Påkrævet*.
+        :type index_name: str
+        """
+        drop_query = f"DROP INDEX `{index_name}` ON `{table_name}`"
+
+        self._preview(drop_query)
+        self._invalidate(table_name)
+        if self._execute(drop_query, api="drop_index"):
+            print(f"SUCCES: Fjernede indekset '{index_name}' fra tabellen '{table_name}'.")
+
     def empty(self, table_name: str, force: bool = False) -> None:
         """
         Rydder en tabel for al data, men fjerner ikke tabellen.
@@ -715,8 +3093,12 @@ class Database(connector.DatabaseConnector):
         confirmation = f"Er du sikker på, at du gerne vil nulstille databasen '{self.database}'? (j/N) "
         if force or input(confirmation).lower() in ['j', 'y']:
             # Hvis query genneføres problemfrit, printes positivt resultat
-            if self._execute(truncate_query):
+            if self._execute(truncate_query, api="empty"):
+                self._invalidate_results(table_name)
                 print(f"SUCCES: Tabellen '{table_name}' blev ryddet for data.")
+                # Filerne skal indlæses forfra næste gang med .load(incremental=True)
+                if self.load_state(table_name):
+                    self._execute(f"DELETE FROM `{LOAD_STATE_TABLE}` WHERE `table_name` = %(table_name)s", {"table_name": table_name}, api="empty")
 
     def reset(self, force: bool = False) -> None:
         """
@@ -735,8 +3117,13 @@ class Database(connector.DatabaseConnector):
         # Det er altid godt at bekræfte ved DELETE-operationer
         confirmation = f"Er du sikker på, at du gerne vil nulstille databasen '{self.database}'? (j/N) "
         if force or input(confirmation).lower() in ['j', 'y']:
-            # Hvis begge queries gennemføres problemfrit, printes positivt resultat
-            if self._execute(drop_query) and self.create_database(self.database):
+            if self._execute(drop_query, api="reset"):
+                # Tabellerne findes ikke længere, heller ikke hvis databasen ikke kan oprettes igen
+                self._invalidate()
+                self._invalidate_results()
+                # Hvis begge queries gennemføres problemfrit, printes positivt resultat
+                if not self.create_database(self.database):
+                    return
                 print(f"Databasen '{self.database}' blev nulstillet.")
                 # Skal logge ind igen for at forny forbindelserne
                 self.login()
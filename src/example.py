@@ -1,5 +1,4 @@
 import database
-import util
 
 def main() -> None:
     # Hvis der vælges ja her, stoppes kørslen af scriptet midlertidigt, hver gang et query køres
@@ -61,20 +60,23 @@ def main() -> None:
     print("Resultat af join:\n", join_example)
 
     ### EKSEMPEL 4 ###
-    # Opretter ny tabel manuelt
-    testdb.create(
-        columns="id,date_time,customer_name,customer_email,product_name,product_price",
-        table_name="orders_combined",
-        primary_key="id"
+    # Samler de tre tabeller i en ny tabel direkte på serveren med joinsene fra eksempel 3,
+    # i stedet for at indlæse det færdige join fra en fil
+    testdb.materialize(
+        "orders_combined", "orders",
+        "orders.id", "date_time", "customers.name", "email", "products.name", "price",
+        joins=[first_join, second_join],
+        names={
+            "customers.name": "customer_name",
+            "email": "customer_email",
+            "products.name": "product_name",
+            "price": "product_price"
+        }
     )
     # Viser info om tabellen
     print(testdb.info("orders_combined"))
-    # Indsætter data fra en fil
-    testdb.insert(
-        data=util.read_csv("orders_combined.csv"),
-        table_name="orders_combined",
-        header=True
-    )
+    # Tilføjer evt. nye ordrer til tabellen (alle ordrer er der allerede, så der tilføjes ingen)
+    testdb.refresh_materialized("orders_combined", mode="incremental")
     # Kopierer queriet fra eksempel 3
     combined_example = testdb.read(
         "orders_combined",
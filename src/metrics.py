@@ -0,0 +1,225 @@
+import bisect
+import collections
+import json
+import re
+import threading
+import time
+from collections.abc import Callable
+
+# Øvre grænser for spandene i histogrammerne, i millisekunder. Den sidste spand tager resten
+BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+FINGERPRINT_PATTERNS = (
+    # Tekststrenge og tal bliver til ?
+    (re.compile(r"'(?:[^'\\]|\\.)*'"), '?'),
+    (re.compile(r'"(?:[^"\\]|\\.)*"'), '?'),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), '?'),
+    # Navngivne og positionelle parametre bliver til ?
+    (re.compile(r"%\(.*?\)s|%s"), '?'),
+    # Lister af værdier, f.eks. IN (?, ?, ?) eller VALUES (?, ?), (?, ?), samles til én
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*"), "(?+)"),
+    (re.compile(r"\s+"), ' ')
+)
+
+def fingerprint(query: str) -> str:
+    """
+    Danner et fingeraftryk af et query, hvor værdier og parametre er erstattet med ``?``,
+    så queries, der kun adskiller sig ved deres værdier, tælles sammen.
+
+    :param query: Queriet.
+        *Påkrævet*.
+    :type query: str
+
+    :return: Queriets fingeraftryk.
+    :rtype: str
+    """
+    for pattern, replacement in FINGERPRINT_PATTERNS:
+        query = pattern.sub(replacement, query)
+    return query.strip()
+
+class QueryMetrics:
+    """
+    Samler målinger af hvert query, som en database eksekverer.
+
+    For hvert query registreres fingeraftryk, tid, antal round trips til serveren,
+    antal berørte eller læste rækker og den metode, f.eks. ``read`` eller ``insert``, som queriet kom fra.
+    Målingerne samles i tællere og histogrammer over svartider for hvert fingeraftryk og hver metode.
+    Queries, der tager længere tid end ``slow_query_time``, skrives desuden i en log.
+
+    :param slow_log: Stien til filen, som langsomme queries skrives i.
+        Er den tom, skrives der ikke nogen log.
+        *Upåkrævet*. Standardværdi: ``''``
+    :type slow_log: str
+    :param slow_query_time: Antal sekunder, et query mindst skal tage for at blive skrevet i loggen.
+        *Upåkrævet*. Standardværdi: ``1.0``
+    :type slow_query_time: float
+    """
+
+    def __init__(self, slow_log: str = '', slow_query_time: float = 1.0) -> None:
+        """
+        Konstruktøren af målingerne.
+        """
+        self.slow_log = slow_log
+        self.slow_query_time = slow_query_time
+        self._callbacks: list[Callable[[dict], None]] = []
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Nulstiller alle tællere og histogrammer.
+        """
+        with self._lock:
+            self._started = time.time()
+            self._queries: dict[str, dict] = collections.defaultdict(self._counters)
+            self._apis: dict[str, dict] = collections.defaultdict(self._counters)
+
+    def _counters(self) -> dict:
+        return {
+            "count": 0,
+            "errors": 0,
+            "seconds": 0.0,
+            "max_seconds": 0.0,
+            "round_trips": 0,
+            "rows": 0,
+            "histogram": [0] * (len(BUCKETS) + 1)
+        }
+
+    def add_callback(self, callback: Callable[[dict], None]) -> None:
+        """
+        Tilføjer en funktion, der kaldes med målingen af hvert query, efter at det er eksekveret.
+
+        Målingen er en dict med nøglerne ``query``, ``fingerprint``, ``api``, ``seconds``,
+        ``round_trips``, ``rows``, ``error`` og ``time``.
+
+        :param callback: Funktionen, der skal kaldes.
+            *Påkrævet*.
+        :type callback: Callable[[dict], None]
+        """
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[dict], None]) -> None:
+        """
+        Fjerner en funktion, der er tilføjet med ``.add_callback()``.
+
+        :param callback: Funktionen, der skal fjernes.
+            *Påkrævet*.
+        :type callback: Callable[[dict], None]
+        """
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def record(self,
+        query: str,
+        api: str,
+        seconds: float,
+        round_trips: int = 1,
+        rows: int = 0,
+        error: str = ''
+    ) -> None:
+        """
+        Registrerer et eksekveret query.
+
+        :param query: Queriet, der er eksekveret.
+            *Påkrævet*.
+        :type query: str
+        :param api: Navnet på metoden, som queriet kom fra.
+            *Påkrævet*.
+        :type api: str
+        :param seconds: Antal sekunder, queriet tog.
+            *Påkrævet*.
+        :type seconds: float
+        :param round_trips: Antal gange, der blev sendt en forespørgsel til serveren.
+            *Upåkrævet*. Standardværdi: ``1``
+        :type round_trips: int
+        :param rows: Antal rækker, der blev læst eller berørt.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type rows: int
+        :param error: Fejlbeskeden, hvis queriet fejlede.
+            *Upåkrævet*. Standardværdi: ``''``
+        :type error: str
+        """
+        measurement = {
+            "query": query,
+            "fingerprint": fingerprint(query),
+            "api": api,
+            "seconds": seconds,
+            "round_trips": round_trips,
+            "rows": rows,
+            "error": error,
+            "time": time.time()
+        }
+        bucket = bisect.bisect_left(BUCKETS, seconds * 1000)
+        with self._lock:
+            for counters in (self._queries[measurement["fingerprint"]], self._apis[api]):
+                counters["count"] += 1
+                counters["errors"] += 1 if error else 0
+                counters["seconds"] += seconds
+                counters["max_seconds"] = max(counters["max_seconds"], seconds)
+                counters["round_trips"] += round_trips
+                counters["rows"] += rows
+                counters["histogram"][bucket] += 1
+
+        if self.slow_log and seconds >= self.slow_query_time:
+            self._log_slow(measurement)
+        for callback in self._callbacks:
+            try:
+                callback(measurement)
+            except Exception as err:
+                print("FEJL: En callback til målingerne fejlede. Følgende fejl opstod:\n    ", err)
+
+    def _log_slow(self, measurement: dict) -> None:
+        """
+        Skriver et langsomt query i loggen.
+
+        :param measurement: Målingen af queriet, som givet til callbacks.
+            *Påkrævet*.
+        :type measurement: dict
+        """
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(measurement["time"]))
+        line = (
+            f"# {timestamp} api={measurement['api']} seconds={measurement['seconds']:.6f} "
+            f"round_trips={measurement['round_trips']} rows={measurement['rows']}"
+            f"{' error=' + measurement['error'] if measurement['error'] else ''}\n"
+            f"{measurement['query'].strip()};\n"
+        )
+        try:
+            with self._lock, open(self.slow_log, 'a', encoding="utf-8") as log:
+                log.write(line)
+        except OSError as err:
+            print(f"FEJL: Kunne ikke skrive i loggen '{self.slow_log}'. Følgende fejl opstod:\n    ", err)
+
+    def snapshot(self) -> dict:
+        """
+        Giver en kopi af de samlede målinger.
+
+        :return: En dict med tidspunktet for målingernes start, grænserne for histogrammernes spande (i ms)
+            og tællerne for hvert fingeraftryk (``queries``) og hver metode (``apis``).
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "started": self._started,
+                "buckets_ms": list(BUCKETS),
+                "queries": {key: {**value, "histogram": list(value["histogram"])} for key, value in self._queries.items()},
+                "apis": {key: {**value, "histogram": list(value["histogram"])} for key, value in self._apis.items()}
+            }
+
+    def export(self, filename: str) -> bool:
+        """
+        Gemmer de samlede målinger i en JSON-fil.
+
+        :param filename: Stien til filen.
+            *Påkrævet*.
+        :type filename: str
+
+        :return: Om filen kunne gemmes.
+        :rtype: bool
+        """
+        try:
+            with open(filename, 'w', encoding="utf-8") as file:
+                json.dump(self.snapshot(), file, ensure_ascii=False, indent=2)
+        except OSError as err:
+            print(f"FEJL: Kunne ikke gemme målingerne i '{filename}'. Følgende fejl opstod:\n    ", err)
+            return False
+        print(f"SUCCES: Gemte målingerne i '{filename}'.")
+        return True
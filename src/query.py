@@ -0,0 +1,113 @@
+class Query:
+    """
+    Et kompileret SELECT-query, som kan køres igen og igen uden at blive dannet på ny.
+
+    Queriet dannes og valideres én gang ud fra en beskrivelse af læsningen (tabel, kolonner, joins,
+    sortering, og om der bruges limit og offset). Selve værdierne, f.eks. ``limit`` og ``offset``,
+    er parametre i queriet og kan derfor skiftes ud ved hver kørsel.
+    Objektet oprettes med ``Database.compile()``, som gemmer det, så samme beskrivelse giver samme objekt.
+
+    :param database: Databasen, som queriet hører til og køres på.
+        *Påkrævet*.
+    :type database: database.Database
+    :param table_name: Navnet på queriets første tabel.
+        *Påkrævet*.
+    :type table_name: str
+    :param column_name: De valgte kolonner. Er den tom, vælges alle kolonner.
+        *Påkrævet*.
+    :type column_name: tuple[str]
+    :param joins: Queriets joins, som i ``Database.read()``.
+        *Påkrævet*.
+    :type joins: list[dict[str]]
+    :param sql: Det færdige query med parametre på formen ``%(navn)s``.
+        *Påkrævet*.
+    :type sql: str
+    :param params: Parametrene og deres standardværdier.
+        *Påkrævet*.
+    :type params: dict[str]
+    :param order: Kolonnen, som resultatet sorteres efter, eller ``''``, hvis det ikke sorteres.
+        *Upåkrævet*. Standardværdi: ``''``
+    :type order: str
+    :param result_columns: Navnet og datatypen for hver kolonne i resultatet, hvis de ikke kan findes
+        ud fra de valgte kolonner, f.eks. ved aggregeringer.
+        *Upåkrævet*. Standardværdi: ``None``
+    :type result_columns: list[tuple[str, str]] | None
+    """
+
+    def __init__(self,
+        database,
+        table_name: str,
+        column_name: tuple[str],
+        joins: list[dict[str]],
+        sql: str,
+        params: dict[str],
+        order: str = '',
+        result_columns: list[tuple[str, str]] | None = None
+    ) -> None:
+        """
+        Konstruktøren af queriet.
+        """
+        self.database = database
+        self.table_name = table_name
+        self.column_name = column_name
+        self.joins = [dict(join) for join in joins]
+        self.sql = sql
+        self.params = dict(params)
+        self.order = order
+        self.tables = database._tables(table_name, joins)
+        # Antallet af gange, queriet er kørt, så de mest brugte queries kan findes (se Database.advise_indexes())
+        self.uses = 0
+        # Navnene og datatyperne af resultatets kolonner slås først op, når de skal bruges
+        self._result_columns = result_columns
+
+    def __repr__(self) -> str:
+        return f"Query({self.sql!r}, {self.params!r})"
+
+    @property
+    def result_columns(self) -> list[tuple[str, str]]:
+        """
+        Navnet og datatypen for hver kolonne i resultatet. Se ``Database._result_columns()``.
+        """
+        if self._result_columns is None:
+            self._result_columns = self.database._result_columns(self.table_name, self.column_name, self.joins)
+        return self._result_columns
+
+    def bind(self, **params) -> dict[str] | None:
+        """
+        Danner parametrene til en kørsel af queriet.
+
+        :param params: Værdier, der skal erstatte standardværdierne, f.eks. ``limit=10``.
+            *Upåkrævet*.
+        :type params: dict[str]
+
+        :return: Alle queriets parametre med de angivne værdier.
+        :rtype: dict[str]
+        :return: Hvis en parameter ikke findes i queriet.
+        :rtype: None
+        """
+        unknown = set(params) - set(self.params)
+        if unknown:
+            print(f"FEJL: Queriet har ikke parametrene {', '.join(sorted(unknown))}. Det har {', '.join(self.params) or 'ingen'}.")
+            return None
+        return {**self.params, **params}
+
+    def execute(self, as_columns: bool = False, **params) -> list[tuple] | dict[str] | None:
+        """
+        Kører queriet med de angivne parametre. Se ``Database.read()``.
+
+        :param as_columns: Bestemmer, om resultatet gives som kolonner i stedet for rækker.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type as_columns: bool
+        :param params: Værdier, der skal erstatte standardværdierne, f.eks. ``limit=10``.
+            *Upåkrævet*.
+        :type params: dict[str]
+
+        :return: Resultatet, som i ``Database.read()``.
+        :rtype: list[tuple] | dict[str] | None
+        """
+        bound = self.bind(**params)
+        if bound is None:
+            return None
+        return self.database._read_query(self, bound, as_columns, "execute")
+
+    __call__ = execute
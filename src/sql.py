@@ -0,0 +1,621 @@
+import csv
+import util
+from collections.abc import Iterable, Iterator
+
+# Måderne, som .insert() kan håndtere rækker med eksisterende PRIMARY KEY- eller UNIQUE-værdier på
+INSERT_MODES = ("error", "ignore", "upsert")
+# Operatorerne, der kan bruges i betingelserne til 'where' i .read()
+COMPARISON_OPERATORS = ('=', "!=", "<>", '<', "<=", '>', ">=", "<=>", "LIKE", "NOT LIKE")
+RANGE_OPERATORS = ("BETWEEN", "NOT BETWEEN")
+LIST_OPERATORS = ("IN", "NOT IN")
+NULL_OPERATORS = ("IS NULL", "IS NOT NULL")
+
+class SqlBuilder:
+    """
+    Konstruktionen af queries og behandlingen af rækker og filer, som ikke taler med serveren.
+
+    Deles af ``database.Database`` og ``async_database.AsyncDatabase``, så de to klasser altid danner de samme queries.
+    Klassen, der arver fra den, skal selv have metoden ``._join()``, da joins tjekkes mod tabellernes info.
+    """
+
+    def _format_column(self, column_name: str) -> str:
+        """
+        Formaterer en reference til en kolonne korrekt med backticks.
+
+        Hvis referencen indeholder et punktum, f.eks. hvis kolonner fra flere tabeller indgår i et query,
+        sættes backticks rundt om hver enkelt del af kolonnenavnet.
+
+        :param column_name: Kolonnenavnet/-referencen, der skal formateres.
+            *Påkrævet*.
+        :type column_name: str
+        :return: Den formaterede kolonnereference.
+        :rtype: str
+        """
+        column_parts = []
+        # Opdeler navn med flere dele
+        split_column = column_name.split('.') if '.' in column_name else [column_name]
+        # Sætter backticks omkring hver enkelt del
+        for column_part in split_column:
+            column_parts.append(f"`{column_part}`")
+        # Returnerede den samlede reference
+        return '.'.join(column_parts)
+
+    def _create_query(self, columns: str, table_name: str = "table", types: dict[str] = {}) -> str:
+        """
+        Konstruerer CREATE TABLE-queriet til ``.create()``.
+
+        :param columns: En kommasepareret tekststreng indeholdende kolonnenavne.
+            *Påkrævet*.
+        :type columns: str
+        :param table_name: Navnet på tabellen, der skal oprettes.
+            *Upåkrævet*. Standardværdi: ``"table"``
+        :type table_name: str
+        :param types: Datatypen for hver kolonne. Se ``.create()``.
+            *Upåkrævet*. Standardværdi: ``{}``
+        :type types: dict[str]
+
+        :return: CREATE TABLE-queriet.
+        :rtype: str
+        """
+        header = columns.strip('\n').split(',')
+
+        # TODO: Omskriv denne del
+        create_query = f"CREATE TABLE `{table_name}` ("
+        # Gætter datatype ud fra kolonnenavn
+        # Men det vile måske være smartere at gætte ud fra felternes værdi fra første række
+        # For dette gælde kun for de tre datasæt til opgaven
+        # Det kommer an på, om man følger en fast navngivningspraksis for kolonnerne i datasættene
+        for column in header:
+            create_query += f"`{column}` "
+            # Datatyper udledt fra dataene har forrang
+            if column in types:
+                create_query += types[column]
+            elif column == "id":
+                create_query += "INTEGER NOT NULL"
+            elif "name" in column:
+                create_query += "VARCHAR(80) NOT NULL"
+            elif "email" in column:
+                create_query += "VARCHAR(254) NOT NULL"
+            elif "price" in column:
+                # For dette datasæt er (P=8,D=5) i DECIMAL(P,D)
+                # Men for pengebeløb burde D vel egentlig være 2
+                create_query += "DECIMAL(10,5) NOT NULL"
+            elif "date" in column:
+                create_query += "DATETIME NOT NULL"
+            elif column in ["customer", "product"]:
+                create_query += "INTEGER NOT NULL"
+            else:
+                create_query += "VARCHAR(255) NOT NULL"
+
+            # if column == primary_key:
+            #     create_query += " PRIMARY KEY"
+            create_query += ", "
+        create_query = create_query[:-2] + ')'
+
+        return create_query
+
+    def _insert_query(self,
+        table_name: str,
+        table_info: list[tuple],
+        mode: str = "error",
+        update_columns: list[str] = []
+    ) -> str:
+        """
+        Konstruerer INSERT-queriet for én række til ``.insert()``.
+
+        :param table_name: Navnet på tabellen, som dataene skal indsættes i.
+            *Påkrævet*.
+        :type table_name: str
+        :param table_info: Tabellens kolonneinfo fra ``.info()``.
+            *Påkrævet*.
+        :type table_info: list[tuple]
+        :param mode: Se ``.insert()``.
+            *Upåkrævet*. Standardværdi: ``"error"``
+        :type mode: str
+        :param update_columns: Se ``.insert()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type update_columns: list[str]
+
+        :return: INSERT-queriet med en parameter for hver kolonne.
+        :rtype: str
+        """
+        # Danner query
+        insert_query = f"INSERT {'IGNORE ' if mode == 'ignore' else ''}INTO `{table_name}` ("
+        # Kolonnenavne (med backticks, fordi navnene er taget fra tabellen)
+        insert_query += ", ".join([f"`{column[0]}`" for column in table_info]) + ") VALUES ("
+        # Kolonneværdier (med %()s, fordi det er værdier oplyst af brugeren, der skal tjekkes)
+        insert_query += ", ".join([f"%({column[0]})s" for column in table_info]) + ')'
+        insert_query += self._upsert_clause(table_info, mode, update_columns)
+        return insert_query
+
+    def _upsert_clause(self, table_info: list[tuple], mode: str = "error", update_columns: list[str] = []) -> str:
+        """
+        Konstruerer ``ON DUPLICATE KEY UPDATE``-delen af et INSERT-query til ``.insert()`` med ``mode="upsert"``.
+
+        De nye værdier hentes gennem aliasset ``new`` for de indsatte rækker (kræver MySQL 8.0.19 eller nyere).
+
+        :param table_info: Tabellens kolonneinfo fra ``.info()``.
+            *Påkrævet*.
+        :type table_info: list[tuple]
+        :param mode: Se ``.insert()``.
+            *Upåkrævet*. Standardværdi: ``"error"``
+        :type mode: str
+        :param update_columns: Se ``.insert()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type update_columns: list[str]
+
+        :return: Delen af queriet, eller ``''``, hvis det ikke er en upsert.
+        :rtype: str
+        """
+        if mode != "upsert":
+            return ''
+        columns = update_columns if update_columns else [column[0] for column in table_info if column[3] != "PRI"]
+        # Har tabellen kun kolonner i sin primary key, er der intet at opdatere, og dubletterne springes over
+        if not columns:
+            columns = [table_info[0][0]]
+        return " AS `new` ON DUPLICATE KEY UPDATE " + ", ".join(f"`{column}` = `new`.`{column}`" for column in columns)
+
+    def _multi_insert(self,
+        table_name: str,
+        table_info: list[tuple],
+        insert_params: list[dict[str]],
+        mode: str = "error",
+        update_columns: list[str] = []
+    ) -> tuple[str, dict[str]]:
+        """
+        Danner ét INSERT-query med plads til alle rækkerne i en bid, samt de tilhørende parametre.
+
+        Parametrene nummereres efter rækken, f.eks. ``%(id_0)s``, ``%(id_1)s`` osv.
+
+        :param table_name: Navnet på tabellen, som dataene skal indsættes i.
+            *Påkrævet*.
+        :type table_name: str
+        :param table_info: Tabellens kolonneinfo fra ``.info()``.
+            *Påkrævet*.
+        :type table_info: list[tuple]
+        :param insert_params: En dict med parametre for hver række.
+            *Påkrævet*.
+        :type insert_params: list[dict[str]]
+        :param mode: Se ``.insert()``.
+            *Upåkrævet*. Standardværdi: ``"error"``
+        :type mode: str
+        :param update_columns: Se ``.insert()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type update_columns: list[str]
+
+        :return: En tuple bestående af queriet og en samlet dict med parametre.
+        :rtype: tuple[str, dict[str]]
+        """
+        insert_query = f"INSERT {'IGNORE ' if mode == 'ignore' else ''}INTO `{table_name}` ("
+        insert_query += ", ".join([f"`{column[0]}`" for column in table_info]) + ") VALUES "
+        values = []
+        params = {}
+        for number, insert_param in enumerate(insert_params):
+            values.append('(' + ", ".join([f"%({column[0]}_{number})s" for column in table_info]) + ')')
+            params.update({f"{name}_{number}": value for name, value in insert_param.items()})
+        insert_query += ", ".join(values)
+        insert_query += self._upsert_clause(table_info, mode, update_columns)
+        return insert_query, params
+
+    def _rows(self, data: list[str] | Iterable[list[str]], header: bool = False) -> Iterator[list[str]]:
+        """
+        Opdeler dataene i rækker af felter, én række ad gangen.
+
+        :param data: Dataene, der skal opdeles. Kan være en liste af rækker eller en strøm af batches.
+            *Påkrævet*.
+        :type data: list[str] | Iterable[list[str]]
+        :param header: Angiver, om den første række er en header, der skal springes over.
+            *Upåkrævet*. Standardværdi: ``False``
+        :type header: bool
+
+        :return: En iterator over rækkerne, hvor hver række er en liste af felter.
+        :rtype: Iterator[list[str]]
+        """
+        for number, batch in enumerate(self._batches(data)):
+            # Benyttes ikke endnu, men kan bruges til at bytte rundt på kolonner,
+            # hvis de står i en anden rækkefølge end tabellen, som dataene skal indsættes i
+            if header and number == 0 and batch:
+                columns = batch[0].strip('\n').split(',')
+                # Springer over header
+                batch = batch[1:]
+            # Felter i anførselstegn (f.eks. fra Database.export()) kan indeholde komma og linjeskift.
+            # Ellers er det hurtigere bare at dele linjerne ved hvert komma
+            if any('"' in row for row in batch):
+                rows = csv.reader(batch)
+            else:
+                rows = (row.strip('\n').split(',') for row in batch)
+            for row in rows:
+                # Tomme linjer springes over
+                if row and row != ['']:
+                    yield row
+
+    def _batches(self, data: list[str] | Iterable[list[str]]) -> Iterator[list[str]]:
+        """
+        Ensretter data til en strøm af batches.
+
+        En almindelig liste af rækker behandles som én enkelt batch,
+        mens alt andet (f.eks. en generator) antages allerede at give batches.
+
+        :param data: Dataene, der skal ensrettes.
+            *Påkrævet*.
+        :type data: list[str] | Iterable[list[str]]
+
+        :return: En iterator over dataenes batches.
+        :rtype: Iterator[list[str]]
+        """
+        if isinstance(data, list) and all(isinstance(row, str) for row in data[:1]):
+            return iter([data])
+        return iter(data)
+
+    def _load_order(self, tables: tuple[str], foreign_keys: dict[str, dict[str]] = {}) -> list[list[str]]:
+        """
+        Inddeler filerne i bølger, så hver fil først indlæses, når de tabeller, den refererer til, er indlæst.
+
+        :param tables: Filerne, der skal indlæses.
+            *Påkrævet*.
+        :type tables: tuple[str]
+        :param foreign_keys: Tabellernes foreign keys. Se ``.load()``.
+            *Upåkrævet*. Standardværdi: ``{}``
+        :type foreign_keys: dict[str, dict[str]]
+
+        :return: En liste af bølger, hvor hver bølge er en liste af filer, der ikke afhænger af hinanden.
+        :rtype: list[list[str]]
+        """
+        names = {util.get_name(table): table for table in tables}
+        dependencies = {}
+        for table_name, table in names.items():
+            if table_name in foreign_keys:
+                referenced = {reference.split('.')[0] for reference in foreign_keys[table_name].values()}
+            else:
+                # Gætter ud fra headeren, ligesom .create() gætter datatyper ud fra kolonnenavne
+                header = next(util.read_csv_batches(table, 1), [''])[0]
+                columns = header.strip('\n').split(',')
+                referenced = {name for name in names for column in columns if name in [column, column + 's']}
+            # Kun tabeller, der indlæses nu, og ikke tabellen selv
+            dependencies[table_name] = (referenced & names.keys()) - {table_name}
+
+        waves = []
+        loaded = set()
+        while len(loaded) < len(names):
+            wave = [name for name in names if name not in loaded and dependencies[name] <= loaded]
+            if not wave:
+                # Cirkulære afhængigheder: resten indlæses samlet til sidst
+                print("FEJL: Tabellernes foreign keys refererer i ring. De resterende filer indlæses i vilkårlig rækkefølge.")
+                wave = [name for name in names if name not in loaded]
+            waves.append([names[name] for name in wave])
+            loaded.update(wave)
+        return waves
+
+    def _tables(self, table_name: str, joins: list[dict[str]] = []) -> set[str]:
+        """
+        Finder alle tabeller, som et query læser fra, inkl. tabellerne i dets joins.
+
+        :param table_name: Navnet på queriets første tabel.
+            *Påkrævet*.
+        :type table_name: str
+        :param joins: Queriets joins, som i ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type joins: list[dict[str]]
+
+        :return: Navnene på tabellerne.
+        :rtype: set[str]
+        """
+        tables = {table_name}
+        for join in joins:
+            tables.add(join["right"])
+            tables.add(join.get("left", table_name))
+        return tables
+
+    def _select(self,
+        table_name: str,
+        column_name: tuple[str],
+        joins: list[dict[str]] = [],
+        order: int | str = 0,
+        direction: str = 'a',
+        limit: int = 0,
+        offset: int = 0,
+        where: list[tuple] | dict[str] = []
+    ) -> tuple[str, dict[str]]:
+        """
+        Konstruerer et SELECT-query ud fra argumenterne til ``.read()``.
+
+        :param table_name: Navnet på den tabel, som data skal læses fra.
+            *Påkrævet*.
+        :type table_name: str
+        :param column_name: Navnene på de kolonner, som data skal læses fra. Er den tom, vælges alle kolonner.
+            *Påkrævet*.
+        :type column_name: tuple[str]
+        :param joins: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type joins: list[dict[str]]
+        :param order: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type order: int | str
+        :param direction: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``'a'``
+        :type direction: str
+        :param limit: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type limit: int
+        :param offset: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type offset: int
+        :param where: Se ``.read()``.
+            *Upåkrævet*. Standardværdi: ``[]``
+        :type where: list[tuple] | dict[str]
+
+        :return: En tuple bestående af queriet og en dict med parametre til eksekveringen af queriet.
+        :rtype: tuple[str, dict[str]]
+        """
+        select_params = {}
+
+        select_query = "SELECT "
+        # Hvis antallet af kolonner angivet er > 0,
+        # vælges kun de angivne kolonner
+        if column_name:
+            columns = []
+            for column in column_name:
+                columns.append(self._format_column(column))
+            select_query += ", ".join(columns)
+        # Eller vælges alle kolonner
+        else:
+            select_query += '*'
+        select_query += f" FROM `{table_name}`"
+
+        # Tilføjer join(s)
+        if joins:
+            for join in joins:
+                select_query += self._join(left=table_name, **join)
+
+        # Tilføjer betingelser
+        if where:
+            where_query, where_params = self._where(where)
+            select_query += where_query
+            select_params.update(where_params)
+
+        # Tilføjer sorteringsretning
+        # quickfix: (sættes nu altid på queriet, da joins sorteres efter nyligst joinede tabel?)
+        select_query += self._sort(column_name, order, direction)
+
+        # Tilføjer limit og offset
+        if limit or offset:
+            limit_query, limit_params = self._limit(limit, offset)
+            select_query += limit_query
+            select_params.update(limit_params)
+
+        return select_query, select_params
+
+    def _where(self,
+        where: list[tuple] | dict[str],
+        keyword: str = "WHERE",
+        prefix: str = "where"
+    ) -> tuple[str, dict[str]]:
+        """
+        Konstruerer WHERE-delen af et query ud fra betingelserne i ``where``. Se ``.read()``.
+
+        Værdierne indsættes som parametrene ``where_0``, ``where_1`` osv.,
+        og kolonnerne sammenlignes direkte, så serveren kan bruge deres indekser.
+
+        :param where: Betingelserne.
+            *Påkrævet*.
+        :type where: list[tuple] | dict[str]
+        :param keyword: Nøgleordet foran betingelserne, f.eks. ``"HAVING"``.
+            *Upåkrævet*. Standardværdi: ``"WHERE"``
+        :type keyword: str
+        :param prefix: Starten af parametrenes navne.
+            *Upåkrævet*. Standardværdi: ``"where"``
+        :type prefix: str
+
+        :return: En tuple bestående af WHERE-delen af queriet og en dict med parametre til eksekveringen af queriet.
+        :rtype: tuple[str, dict[str]]
+
+        :raises ValueError: Hvis en betingelse eller gruppe ikke har en gyldig form.
+        """
+        params = {}
+
+        def parameter(value) -> str:
+            name = f"{prefix}_{len(params)}"
+            params[name] = value
+            return f"%({name})s"
+
+        def condition(item: tuple | dict) -> str:
+            # En gruppe af betingelser
+            if isinstance(item, dict):
+                operator, items = self._where_group(item)
+                parts = [condition(sub_item) for sub_item in items]
+                return parts[0] if len(parts) == 1 else '(' + f" {operator} ".join(parts) + ')'
+
+            column, operator, value = self._where_condition(item)
+            column = self._format_column(column)
+            if operator in COMPARISON_OPERATORS:
+                return f"{column} {operator} {parameter(value)}"
+            if operator in RANGE_OPERATORS:
+                return f"{column} {operator} {parameter(value[0])} AND {parameter(value[1])}"
+            if operator in LIST_OPERATORS:
+                # En tom liste giver ingen (eller alle) rækker, som i Python
+                if not value:
+                    return "FALSE" if operator == "IN" else "TRUE"
+                return f"{column} {operator} (" + ", ".join(parameter(element) for element in value) + ')'
+            return f"{column} {operator}"
+
+        return f" {keyword} {condition({'and': where} if isinstance(where, list) else where)}", params
+
+    def _where_spec(self, where: list[tuple] | dict[str]) -> tuple[tuple, list]:
+        """
+        Deler betingelserne i ``where`` op i deres form og deres værdier.
+
+        Formen afgør queriet og bruges til at finde et kompileret query i ``.compile()``,
+        mens værdierne er parametrene ``where_0``, ``where_1`` osv. i samme rækkefølge som i ``._where()``.
+
+        :param where: Betingelserne. Se ``.read()``.
+            *Påkrævet*.
+        :type where: list[tuple] | dict[str]
+
+        :return: En tuple bestående af betingelsernes form og en liste med deres værdier.
+        :rtype: tuple[tuple, list]
+
+        :raises ValueError: Hvis en betingelse eller gruppe ikke har en gyldig form.
+        """
+        values = []
+
+        def spec(item: tuple | dict) -> tuple:
+            if isinstance(item, dict):
+                operator, items = self._where_group(item)
+                return (operator, tuple(spec(sub_item) for sub_item in items))
+
+            column, operator, value = self._where_condition(item)
+            if operator in COMPARISON_OPERATORS:
+                values.append(value)
+            elif operator in RANGE_OPERATORS:
+                values.extend(value)
+            elif operator in LIST_OPERATORS:
+                values.extend(value)
+                # Antallet af værdier afgør antallet af parametre i queriet
+                return (column, operator, len(value))
+            return (column, operator)
+
+        if not where:
+            return (), values
+        return spec({"and": where} if isinstance(where, list) else where), values
+
+    def _where_group(self, group: dict[str]) -> tuple[str, list]:
+        """
+        Tjekker en gruppe af betingelser, f.eks. ``{"or": [...]}``.
+
+        :return: En tuple bestående af operatoren (``"AND"`` eller ``"OR"``) og gruppens betingelser.
+        :rtype: tuple[str, list]
+
+        :raises ValueError: Hvis gruppen ikke har præcis én nøgle, der er ``"and"`` eller ``"or"``,
+            eller hvis den ikke indeholder nogen betingelser.
+        """
+        if len(group) != 1:
+            raise ValueError(f"En gruppe skal have præcis én nøgle ('and' eller 'or'), ikke {list(group)}.")
+        (operator, items), = group.items()
+        operator = operator.upper()
+        if operator not in ["AND", "OR"]:
+            raise ValueError(f"Ukendt gruppe '{operator}'. Brug 'and' eller 'or'.")
+        if not items:
+            raise ValueError(f"Gruppen '{operator}' indeholder ingen betingelser.")
+        return operator, list(items)
+
+    def _where_condition(self, item: tuple) -> tuple:
+        """
+        Tjekker en enkelt betingelse, f.eks. ``("price", '>', 100)``.
+
+        :return: En tuple bestående af kolonnen, operatoren med store bogstaver og værdien
+            (en tuple for BETWEEN, en liste for IN, ``None`` for IS NULL).
+        :rtype: tuple
+
+        :raises ValueError: Hvis operatoren er ukendt, eller værdien ikke passer til operatoren.
+        """
+        if not isinstance(item, (tuple, list)) or len(item) not in [2, 3]:
+            raise ValueError(f"En betingelse skal have formen (kolonne, operator, værdi), ikke {item!r}.")
+        column, operator, *value = item
+        operator = ' '.join(str(operator).upper().split())
+
+        if operator in NULL_OPERATORS:
+            return column, operator, None
+        if not value:
+            raise ValueError(f"Betingelsen {item!r} mangler en værdi.")
+        value = value[0]
+        if operator in COMPARISON_OPERATORS:
+            return column, operator, value
+        if operator in RANGE_OPERATORS:
+            if not isinstance(value, (tuple, list)) or len(value) != 2:
+                raise ValueError(f"{operator} kræver en værdi på formen (fra, til), ikke {value!r}.")
+            return column, operator, tuple(value)
+        if operator in LIST_OPERATORS:
+            if isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+                raise ValueError(f"{operator} kræver en liste af værdier, ikke {value!r}.")
+            return column, operator, list(value)
+        raise ValueError(f"Ukendt operator '{operator}' i betingelsen {item!r}.")
+
+    def _sort(self, column_name: str | tuple[str], order: int | str = 0, direction: str = 'a') -> str:
+        """
+        Konstruerer ORDER BY- og ASC/DESC-delen af et query.
+
+        :param column_name: Navnet på kolonne(r)n(e), der er valgt og kan sorteres efter.
+            Er ingen kolonner valgt, er alle tabellens kolonner valgt (``SELECT *``).
+        :type column_name: str | tuple[str]
+        :param order: Kolonnen, som resultatet ordnes efter.
+            Enten *int*, der vælger indekset af kolonnen blandt de valgte kolonner,
+            eller *str*, der vælger ud fra navnet på kolonnen. Med ``SELECT *`` kan det være alle tabellens kolonner.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type order: int | str, optional
+        :param direction:  Angiver hvilken retning, resultatet skal ordnes i.
+            ``'a'``, ``"asc"`` eller ``"ascending"`` er opadgående rækkefølge, mens
+            ``'d'``, ``"desc"`` eller ``"descending"`` er nedadgående rækkefølge.
+            *Upåkrævet*. Standardværdi: ``'a'``
+        :type direction: str, optional
+
+        :return: ORDER BY-delen af et query.
+        :rtype: str
+        """
+        query = ""
+        # Formaterer nu kolonnenavne i tilfælde af database.tabel.kolonne-format
+        if isinstance(order, int) and order >= 0 and order < len(column_name):
+            query += f" ORDER BY {self._format_column(column_name[order])}"
+        elif isinstance(order, str) and order and (order in column_name or not column_name):
+            query += f" ORDER BY {self._format_column(order)}"
+        if "ORDER BY" in query:
+            if direction.lower() in ['a', "asc", "ascending"]:
+                query += " ASC"
+            elif direction.lower() in ['d', "desc", "descending"]:
+                query += " DESC"
+
+        return query
+
+    def _limit(self, limit: int, offset: int = 0) -> tuple[str, dict[str]]:
+        """
+        Konstruerer LIMIT- og OFFSET-delen af et query.
+
+        :param limit: Begrænser antal læste rækker til et bestemt antal.
+        :type limit: int
+        :param offset: Bestemmer, hvor mange rækker, der springes over,
+            inden læsning påbegyndes.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type offset: int
+
+        :return: En tuple bestående af en tekststreng til queriet,
+            samt en dict med parametre til eksekveringen af queriet.
+        :rtype: tuple[str, dict[str]]
+        """
+        query = ''
+        params = {}
+        if isinstance(limit, int) and limit > 0:
+            query += " LIMIT %(limit)s"
+            params["limit"] = limit
+        if isinstance(offset, int) and offset > 0:
+            query += " OFFSET %(offset)s"
+            params["offset"] = offset
+
+        return query, params
+
+    def _join_clause(self,
+        left: str,
+        right: str,
+        on_left: str,
+        on_right: str,
+        join_type: str = 'i',
+    ) -> str:
+        """
+        Konstruerer JOIN-delen af et query uden at tjekke, om tabellerne og kolonnerne findes.
+
+        Se ``._join()`` for parametrene.
+
+        :return: JOIN-delen af et query.
+        :rtype: str
+        """
+        join_query = ' '
+        if join_type in ['i', "inner"]:
+            join_query += "INNER "
+        elif join_type in ['o', "outer"]:
+            join_query += "OUTER "
+        elif join_type in ['l', "left"]:
+            join_query += "LEFT "
+        elif join_type in ['r', "right"]:
+            join_query += "RIGHT "
+
+        join_query += f"JOIN `{right}` ON `{left}`.`{on_left}` = `{right}`.`{on_right}`"
+
+        return join_query
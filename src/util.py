@@ -1,4 +1,8 @@
+import datetime
+import hashlib
 import os.path
+import re
+from collections.abc import Iterable, Iterator
 
 # Ændr dette, hvis projektet skal laves om til et modul, der kan importeres
 data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
@@ -30,6 +34,428 @@ def read_csv(filename: str, data_dir: str = data_dir) -> list[str]:
         print(f"SUCCES: Indlæste filen '{filename}'.")
         return raw_data
 
+def read_csv_batches(filename: str, batch_size: int = 1000, data_dir: str = data_dir) -> Iterator[list[str]]:
+    """
+    Indlæser en *.csv*-fil løbende og giver rækkerne i portioner (batches) af en fast størrelse.
+
+    I modsætning til ``read_csv()`` holdes kun én batch i hukommelsen ad gangen,
+    så store filer kan indlæses uden at hele filen skal læses først.
+    Headeren (hvis filen har en) er den første række i den første batch.
+    En batch slutter aldrig midt i et felt i anførselstegn, der strækker sig over flere linjer.
+
+    :param filename: Filnavnet på filen, der skal indlæses.
+        *Påkrævet*.
+    :type filename: str
+    :param batch_size: Det maksimale antal rækker i hver batch.
+        *Upåkrævet*. Standardværdi: ``1000``
+    :type batch_size: int
+    :param data_dir: Mappen/kataloget, hvori .csv-filen er placeret.
+        *Upåkrævet*. Standardværdi: ``data_dir``
+    :type data_dir: str
+
+    :return: En generator, der giver hver batch som en liste af tekststrenge.
+    :rtype: Iterator[list[str]]
+    """
+    data_file = os.path.join(data_dir, filename)
+    try:
+        with open(data_file, 'r', encoding="utf-8") as file:
+            batch = []
+            quoted = False
+            # Filobjektet læses linje for linje, så hele filen aldrig er i hukommelsen
+            for line in file:
+                batch.append(line)
+                # Et ulige antal anførselstegn åbner eller lukker et felt, der fortsætter på næste linje
+                if line.count('"') % 2:
+                    quoted = not quoted
+                if len(batch) >= batch_size and not quoted:
+                    yield batch
+                    batch = []
+            # Sidste, evt. ufuldstændige batch
+            if batch:
+                yield batch
+    except FileNotFoundError:
+        print(f"FEJL: Filen '{data_file}' eksisterer ikke.")
+    except Exception as err:
+        print(f"FEJL: Kunne ikke læse filen '{filename}'. Følgende fejl opstod:\n    ", err)
+    else:
+        print(f"SUCCES: Indlæste filen '{filename}'.")
+
+# Det største antal rækker, som sample_csv() læser som standard
+SAMPLE_SIZE = 10000
+
+def sample_csv(filename: str, sample_size: int = SAMPLE_SIZE, data_dir: str = data_dir) -> list[str]:
+    """
+    Indlæser et udsnit af en *.csv*-fil, som datatyperne kan udledes fra uden at læse hele filen.
+
+    Udsnittet består af headeren, de første ``sample_size // 2`` rækker og de sidste ``sample_size // 2`` rækker,
+    så både de første og de nyeste værdier (f.eks. de største id'er i en fil, der kun tilføjes til) er med.
+    Starten og slutningen af filen læses direkte, så kun udsnittet læses, uanset hvor stor filen er.
+    Er filen mindre end udsnittet, gives hele filen.
+
+    :param filename: Filnavnet på filen, der skal indlæses.
+        *Påkrævet*.
+    :type filename: str
+    :param sample_size: Det største antal rækker (uden headeren) i udsnittet.
+        *Upåkrævet*. Standardværdi: ``SAMPLE_SIZE``
+    :type sample_size: int
+    :param data_dir: Mappen/kataloget, hvori .csv-filen er placeret.
+        *Upåkrævet*. Standardværdi: ``data_dir``
+    :type data_dir: str
+
+    :return: Headeren efterfulgt af rækkerne i udsnittet, hver som en tekststreng.
+    :rtype: list[str]
+    """
+    data_file = os.path.join(data_dir, filename)
+    head_size = max(sample_size // 2, 1)
+    tail_size = max(sample_size - head_size, 0)
+    try:
+        with open(data_file, 'rb') as file:
+            lines = []
+            for raw_line in file:
+                lines.append(raw_line)
+                # Headeren og den første halvdel af udsnittet
+                if len(lines) > head_size:
+                    break
+            else:
+                return [line.decode("utf-8") for line in lines]
+
+            head_end = file.tell()
+            size = os.fstat(file.fileno()).st_size
+            # Læser bagfra i stadig større bidder, indtil der er nok hele linjer efter starten
+            average = max(head_end // len(lines), 1)
+            tail = []
+            while tail_size:
+                start = max(size - average * (tail_size + 1) * 2, head_end)
+                file.seek(start)
+                tail = file.read(size - start).splitlines(keepends=True)
+                # Den første linje er ufuldstændig, medmindre læsningen startede lige efter starten af udsnittet
+                if start > head_end:
+                    tail = tail[1:]
+                if len(tail) >= tail_size or start == head_end:
+                    break
+                average *= 2
+            lines += tail[-tail_size:] if tail_size else []
+    except FileNotFoundError:
+        print(f"FEJL: Filen '{data_file}' eksisterer ikke.")
+        return []
+    except Exception as err:
+        print(f"FEJL: Kunne ikke læse filen '{filename}'. Følgende fejl opstod:\n    ", err)
+        return []
+    return [line.decode("utf-8") for line in lines]
+
+class CsvTail:
+    """
+    Indlæser de hele linjer i en *.csv*-fil, der står efter en given byteposition, i batches.
+
+    Bruges til at indlæse de rækker, der er tilføjet i slutningen af en fil, siden den sidst blev indlæst.
+    Undervejs opdateres positionen efter den sidste hele linje (``offset``), den sidste linje (``last_line``),
+    antallet af læste linjer (``lines``) og en SHA-256 af filen til og med den sidste linje (``digest``),
+    så næste indlæsning kan starte samme sted og tjekke, at filen ikke er ændret før dette sted.
+    En sidste linje uden linjeskift springes over, da den kan være ved at blive skrevet.
+
+    :param filename: Filnavnet på filen, der skal indlæses.
+        *Påkrævet*.
+    :type filename: str
+    :param offset: Bytepositionen i filen, der læses fra. Skal være starten af en linje.
+        *Upåkrævet*. Standardværdi: ``0``
+    :type offset: int
+    :param digest: SHA-256 af filens første ``offset`` bytes (se ``file_digest()``), som de læste linjer lægges til.
+        Er den ``None``, startes en ny.
+        *Upåkrævet*. Standardværdi: ``None``
+    :type digest: hashlib._Hash | None
+    :param data_dir: Mappen/kataloget, hvori .csv-filen er placeret.
+        *Upåkrævet*. Standardværdi: ``data_dir``
+    :type data_dir: str
+    """
+
+    def __init__(self, filename: str, offset: int = 0, digest=None, data_dir: str = data_dir) -> None:
+        """
+        Konstruktøren af læseren.
+        """
+        self.filename = filename
+        self.path = os.path.join(data_dir, filename)
+        self.offset = offset
+        self.digest = digest if digest is not None else hashlib.sha256()
+        self.lines = 0
+        self.last_line = ''
+
+    def batches(self, batch_size: int = 1000) -> Iterator[list[str]]:
+        """
+        Giver de nye linjer i portioner (batches) af en fast størrelse, som i ``read_csv_batches()``.
+
+        :param batch_size: Det maksimale antal rækker i hver batch.
+            *Upåkrævet*. Standardværdi: ``1000``
+        :type batch_size: int
+
+        :return: En generator, der giver hver batch som en liste af tekststrenge.
+        :rtype: Iterator[list[str]]
+        """
+        try:
+            # Filen læses binært, så positionen kan angives i bytes
+            with open(self.path, 'rb') as file:
+                file.seek(self.offset)
+                batch = []
+                for raw_line in file:
+                    if not raw_line.endswith(b'\n'):
+                        break
+                    self.offset += len(raw_line)
+                    self.digest.update(raw_line)
+                    self.lines += 1
+                    self.last_line = raw_line.decode("utf-8").rstrip('\r\n') + '\n'
+                    batch.append(self.last_line)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+                if batch:
+                    yield batch
+        except FileNotFoundError:
+            print(f"FEJL: Filen '{self.path}' eksisterer ikke.")
+        except Exception as err:
+            print(f"FEJL: Kunne ikke læse filen '{self.filename}'. Følgende fejl opstod:\n    ", err)
+        else:
+            print(f"SUCCES: Indlæste {self.lines} nye linjer fra filen '{self.filename}'.")
+
+def file_digest(filename: str, length: int, data_dir: str = data_dir):
+    """
+    Beregner en SHA-256 af de første ``length`` bytes i en fil.
+
+    Filen læses i bidder på 1 MiB, så hele filen aldrig er i hukommelsen.
+
+    :param filename: Filnavnet på filen.
+        *Påkrævet*.
+    :type filename: str
+    :param length: Antallet af bytes fra starten af filen, der skal indgå.
+        *Påkrævet*.
+    :type length: int
+    :param data_dir: Mappen/kataloget, hvori filen er placeret.
+        *Upåkrævet*. Standardværdi: ``data_dir``
+    :type data_dir: str
+
+    :return: Hashobjektet, som flere bytes kan lægges til med ``.update()``.
+    :rtype: hashlib._Hash
+    :return: Hvis filen ikke findes eller er kortere end ``length``.
+    :rtype: None
+    """
+    digest = hashlib.sha256()
+    remaining = length
+    try:
+        with open(os.path.join(data_dir, filename), 'rb') as file:
+            while remaining > 0:
+                chunk = file.read(min(remaining, 2**20))
+                if not chunk:
+                    return None
+                digest.update(chunk)
+                remaining -= len(chunk)
+    except OSError:
+        return None
+    return digest
+
+# Heltalstyper fra den mindste til den største, med deres mindste og største værdi
+INTEGER_TYPES = [
+    ("TINYINT", -2**7, 2**7 - 1),
+    ("SMALLINT", -2**15, 2**15 - 1),
+    ("MEDIUMINT", -2**23, 2**23 - 1),
+    ("INT", -2**31, 2**31 - 1),
+    ("BIGINT", -2**63, 2**63 - 1)
+]
+INTEGER_PATTERN = re.compile(r"[+-]?(\d+)")
+DECIMAL_PATTERN = re.compile(r"[+-]?(\d*)\.(\d+)")
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+FRACTION_PATTERN = re.compile(r"[T ]\d{2}:\d{2}:\d{2}\.(\d+)")
+
+def infer_types(rows: Iterable[list[str]], header: list[str]) -> dict[str, str]:
+    """
+    Finder den mindste MySQL-datatype, som alle værdierne i hver kolonne kan være i.
+
+    Heltal bliver til den mindste af ``TINYINT``, ``SMALLINT``, ``MEDIUMINT``, ``INT`` og ``BIGINT``,
+    kommatal til ``DECIMAL`` med præcis det antal cifre, der er brug for,
+    og datoer/tidspunkter til ``DATE`` eller ``DATETIME``. Alt andet bliver til ``VARCHAR``
+    med den længste observerede længde. Tidspunkter med tidszone (f.eks. ``+01:00``) bliver også til ``DATETIME``,
+    da MySQL selv omregner dem til sessionens tidszone, når de indsættes.
+
+    Kolonner med tomme felter bliver altid til ``VARCHAR``, da tomme felter indsættes som tom tekst.
+    Typerne passer kun til de rækker, der er set, så rækkerne bør være hele filen eller et repræsentativt udsnit.
+
+    :param rows: Rækkerne, hvor hver række er en liste af felter.
+        *Påkrævet*.
+    :type rows: Iterable[list[str]]
+    :param header: Kolonnernes navne i samme rækkefølge som felterne.
+        *Påkrævet*.
+    :type header: list[str]
+
+    :return: En dict med den fundne datatype for hver kolonne.
+    :rtype: dict[str, str]
+    """
+    columns = [{
+        "integer": True, "minimum": 0, "maximum": 0,
+        "decimal": True, "digits": 0, "scale": 0,
+        "datetime": True, "time": False, "fraction": 0,
+        "length": 0, "empty": False, "count": 0
+    } for _ in header]
+
+    for row in rows:
+        for column, value in zip(columns, row):
+            column["length"] = max(column["length"], len(value))
+            if not value:
+                column["empty"] = True
+                continue
+            column["count"] += 1
+
+            # Hver mulig type tjekkes for sig mod alle værdier, så rækkefølgen af rækkerne ikke har betydning
+            integer = INTEGER_PATTERN.fullmatch(value)
+            if column["integer"]:
+                if integer:
+                    number = int(value)
+                    column["minimum"] = min(column["minimum"], number)
+                    column["maximum"] = max(column["maximum"], number)
+                else:
+                    column["integer"] = False
+            if column["decimal"]:
+                # Heltal passer også i en DECIMAL (uden decimaler)
+                if match := integer or DECIMAL_PATTERN.fullmatch(value):
+                    column["digits"] = max(column["digits"], len(match.group(1)))
+                    if match is not integer:
+                        column["scale"] = max(column["scale"], len(match.group(2)))
+                else:
+                    column["decimal"] = False
+            if column["datetime"]:
+                if DATE_PATTERN.match(value) and _is_datetime(value):
+                    column["time"] = column["time"] or len(value) > 10
+                    if fraction := FRACTION_PATTERN.search(value):
+                        column["fraction"] = max(column["fraction"], min(len(fraction.group(1)), 6))
+                else:
+                    column["datetime"] = False
+
+    types = {}
+    for name, column in zip(header, columns):
+        types[name] = _column_type(column)
+    return types
+
+def _is_datetime(value: str) -> bool:
+    """
+    Tjekker, om en værdi er en gyldig dato eller et gyldigt tidspunkt på ISO-formen.
+    """
+    try:
+        datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+def _column_type(column: dict) -> str:
+    """
+    Vælger datatypen for en kolonne ud fra statistikken, som ``infer_types()`` har samlet.
+
+    :param column: Statistikken for kolonnen.
+        *Påkrævet*.
+    :type column: dict
+
+    :return: Kolonnens datatype, inkl. ``NOT NULL``.
+    :rtype: str
+    """
+    if column["empty"] or not column["count"]:
+        datatype = f"VARCHAR({max(column['length'], 1)})" if column["length"] <= 16383 else "TEXT"
+    elif column["integer"]:
+        for integer_type, minimum, maximum in INTEGER_TYPES:
+            if minimum <= column["minimum"] and column["maximum"] <= maximum:
+                datatype = integer_type
+                break
+        else:
+            datatype = f"DECIMAL({min(column['digits'], 65)},0)"
+    elif column["decimal"]:
+        precision = max(column["digits"] + column["scale"], 1)
+        # DECIMAL kan højst have 65 cifre, heraf 30 decimaler
+        datatype = f"DECIMAL({precision},{column['scale']})" if precision <= 65 and column["scale"] <= 30 else "DOUBLE"
+    elif column["datetime"]:
+        if not column["time"]:
+            datatype = "DATE"
+        else:
+            datatype = f"DATETIME({column['fraction']})" if column["fraction"] else "DATETIME"
+    else:
+        datatype = f"VARCHAR({column['length']})" if column["length"] <= 16383 else "TEXT"
+    return datatype + " NOT NULL"
+
+# Det største antal cifre i hver heltalstype og længden af de andre typer, når de skrives som tekst
+INTEGER_DIGITS = {"TINYINT": 3, "SMALLINT": 5, "MEDIUMINT": 7, "INT": 10, "BIGINT": 19}
+FLOAT_KINDS = ("DOUBLE", "FLOAT", "REAL")
+TEXT_LENGTHS = {"DATE": 10, "DATETIME": 32, "DOUBLE": 24, "FLOAT": 24, "REAL": 24}
+TYPE_PATTERN = re.compile(r"(\w+)(?:\((\d+)(?:,\s*(\d+))?\))?")
+
+def _parse_type(datatype: str | bytes) -> tuple[str, int, int]:
+    """
+    Deler en datatype op i navn, størrelse og antal decimaler, f.eks. ``("DECIMAL", 8, 5)`` fra ``"decimal(8,5)"``.
+
+    :param datatype: Datatypen, enten fra ``DESCRIBE`` eller fra ``infer_types()``.
+        *Påkrævet*.
+    :type datatype: str | bytes
+
+    :return: En tuple bestående af typens navn med store bogstaver, dens størrelse og dens antal decimaler.
+        Størrelsen og decimalerne er ``0``, hvis typen ikke har dem.
+    :rtype: tuple[str, int, int]
+    """
+    # Nogle versioner af mysql.connector giver typen som bytes
+    if isinstance(datatype, (bytes, bytearray)):
+        datatype = datatype.decode()
+    name, size, scale = TYPE_PATTERN.match(datatype.strip().upper()).groups()
+    return name, int(size or 0), int(scale or 0)
+
+def widen_type(current: str | bytes, new: str | bytes) -> str:
+    """
+    Finder den mindste datatype, som både en kolonnes nuværende værdier og nye værdier kan være i.
+
+    Bruges, når der indlæses flere rækker i en eksisterende tabel, hvis datatyper er udledt af de tidligere rækker.
+    Heltal udvides til en større heltalstype, heltal og kommatal til en ``DECIMAL`` med plads til begge,
+    tal og ``DOUBLE``/``FLOAT`` til ``DOUBLE``, ``DATE`` og ``DATETIME`` til ``DATETIME``, og alt andet til ``VARCHAR`` eller ``TEXT``.
+
+    :param current: Kolonnens nuværende datatype, f.eks. fra ``DESCRIBE``.
+        *Påkrævet*.
+    :type current: str | bytes
+    :param new: Datatypen, som de nye værdier kræver, f.eks. fra ``infer_types()``.
+        *Påkrævet*.
+    :type new: str | bytes
+
+    :return: Den udvidede datatype (uden ``NOT NULL``).
+    :rtype: str
+    :return: Hvis den nuværende datatype allerede passer til de nye værdier.
+    :rtype: str: ``''``
+    """
+    current_type, new_type = _parse_type(current), _parse_type(new)
+    if current_type == new_type or current_type[0] == "TEXT":
+        return ''
+    (kind, size, scale), (new_kind, new_size, new_scale) = current_type, new_type
+
+    if kind in INTEGER_DIGITS and new_kind in INTEGER_DIGITS:
+        return new_kind if INTEGER_DIGITS[new_kind] > INTEGER_DIGITS[kind] else ''
+
+    numeric = (*INTEGER_DIGITS, "DECIMAL")
+    if (kind in FLOAT_KINDS or new_kind in FLOAT_KINDS) and {kind, new_kind} <= {*numeric, *FLOAT_KINDS}:
+        return '' if kind == "DOUBLE" else "DOUBLE"
+    if kind in numeric and new_kind in numeric:
+        # Antallet af cifre før kommaet og antallet af decimaler skal hver især være store nok
+        digits = max(INTEGER_DIGITS.get(kind, size - scale), INTEGER_DIGITS.get(new_kind, new_size - new_scale))
+        scale = max(scale, new_scale)
+        if digits + scale > 65 or scale > 30:
+            return "DOUBLE"
+        return '' if current_type == ("DECIMAL", digits + scale, scale) else f"DECIMAL({digits + scale},{scale})"
+
+    if kind in ("DATE", "DATETIME") and new_kind in ("DATE", "DATETIME"):
+        if kind == "DATETIME" and size >= new_size:
+            return ''
+        fraction = max(size, new_size)
+        return f"DATETIME({fraction})" if fraction else "DATETIME"
+
+    # Alt andet gemmes som tekst, der er lang nok til både de nuværende og de nye værdier
+    def text_length(kind: str, size: int) -> int:
+        if kind in INTEGER_DIGITS:
+            return INTEGER_DIGITS[kind] + 1
+        if kind == "DECIMAL":
+            return size + 2
+        return TEXT_LENGTHS.get(kind, size)
+
+    length = max(text_length(kind, size), text_length(new_kind, new_size), 1)
+    if length > 16383 or new_kind == "TEXT":
+        return "TEXT"
+    return f"VARCHAR({length})" if (kind, size) != ("VARCHAR", length) else ''
+
 def get_name(path: str) -> str:
     """
     Finder navnet på en tabel ud fra navnet på den angivne fil.
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modulerne ligger fladt i src og importeres som f.eks. "import util"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,37 @@
+import array
+import datetime
+
+import pytest
+
+import columns
+
+COLUMNS = [("id", "int"), ("price", "decimal(10,2)"), ("name", "varchar(20)"), ("date_time", "datetime")]
+ROWS = [(1, 2.5, "a", datetime.datetime(2020, 1, 2, 3, 4, 5)), (2, 3.0, "b", datetime.datetime(2021, 1, 1))]
+ROWS_WITH_NULL = [(3, None, None, None), (None, 1.25, "c", datetime.datetime(2022, 6, 1))]
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columns, "numpy", None)
+    return request.param
+
+def test_column_types_do_not_depend_on_null(backend):
+    batches = [columns.to_columns(rows, COLUMNS) for rows in (ROWS, ROWS_WITH_NULL)]
+    for name, _ in COLUMNS:
+        first, second = (batch[name] for batch in batches)
+        assert type(first) is type(second)
+        if backend == "numpy" and name != "name":
+            assert first.dtype == second.dtype
+        if isinstance(first, array.array):
+            assert first.typecode == second.typecode
+    assert isinstance(batches[1]["name"], columns.StringColumn)
+
+def test_nulls_are_in_the_mask(backend):
+    batch = columns.to_columns(ROWS_WITH_NULL, COLUMNS)
+    assert batch.nulls["id"] is not None and list(batch.nulls["id"]) == [False, True]
+    assert list(batch.nulls["name"]) == [True, False]
+    assert list(batch["id"]) == [3, 0]
+    assert list(batch["name"]) == ['', 'c']
+    assert columns.to_columns(ROWS, COLUMNS).nulls["id"] is None
@@ -0,0 +1,18 @@
+import csv
+
+import sql
+import util
+
+def test_rows_read_quoted_fields_from_export(tmp_path):
+    rows = [["1", "plain"], ["2", 'comma, "quote"'], ["3", "two\nlines"], ["4", ""]]
+    with open(tmp_path / "export.csv", 'w', encoding="utf-8", newline='') as file:
+        writer = csv.writer(file, lineterminator='\n')
+        writer.writerow(["id", "text"])
+        writer.writerows(rows)
+
+    # Batches på to linjer, så feltet med linjeskift ligger på tværs af en batchgrænse
+    batches = util.read_csv_batches("export.csv", 2, data_dir=str(tmp_path))
+    assert list(sql.SqlBuilder()._rows(batches, header=True)) == rows
+
+def test_rows_split_unquoted_lines():
+    assert list(sql.SqlBuilder()._rows(["id,name\n", "1,a\n", "\n", "2,b\n"], header=True)) == [["1", "a"], ["2", "b"]]
@@ -0,0 +1,15 @@
+import pytest
+
+import util
+
+@pytest.mark.parametrize("values, expected", [
+    (['5', "2020-01-01"], "VARCHAR(10) NOT NULL"),
+    (["1.5", "2020-01-01"], "VARCHAR(10) NOT NULL"),
+    (["1.5", '3'], "DECIMAL(2,1) NOT NULL"),
+    (["12", "-300"], "SMALLINT NOT NULL"),
+    (["2020-01-01", "2020-01-01 10:00:00"], "DATETIME NOT NULL")
+])
+def test_infer_types_is_order_independent(values, expected):
+    rows = [[value] for value in values]
+    assert util.infer_types(rows, ['c']) == {'c': expected}
+    assert util.infer_types(rows[::-1], ['c']) == {'c': expected}